@@ -0,0 +1,241 @@
+# Algorithms/AnytimeAStar.py
+import heapq
+from time import perf_counter
+from Maze.MazeGrid import END_POINTS, WALL, VISITED, PATH
+from .Movement import current_movement
+from .SearchCore import collect_steps, reconstruct_path
+
+INFINITY            = float("inf")
+# Expansions between two checks of the time budget.
+BUDGET_CHECK_INTERVAL = 256
+
+
+class Settings:
+    initial_weight = 2.0
+    weight_step = 0.5
+    time_budget = 1.0
+
+def set_initial_weight(weight: float):
+    Settings.initial_weight = weight
+
+def set_time_budget(seconds: float):
+    Settings.time_budget = seconds
+
+
+def path_change_snapshot(cells, previous_path, final_path, num_columns):
+    """
+    Build the snapshot that replaces the previous path with an improved one:
+    the new path cells are marked PATH and the cells only the previous path
+    used go back to VISITED. Start and end cells are skipped.
+    """
+    kept = set(final_path)
+    snapshot = [
+        (index // num_columns, index % num_columns, PATH)
+        for index in final_path
+        if cells[index] not in END_POINTS
+    ]
+    snapshot.extend(
+        (index // num_columns, index % num_columns, VISITED)
+        for index in previous_path
+        if index not in kept and cells[index] not in END_POINTS
+    )
+    return snapshot
+
+
+def iter_ara_star_steps(maze, start, end, snapshot_interval=1, stats=None):
+    """
+    Anytime Repairing A* (ARA*, Likhachev, Gordon & Thrun).
+
+    The first search runs A* with the heuristic inflated by
+    Settings.initial_weight, which finds a path fast but may be up to that
+    factor longer than the shortest one. The weight is then lowered by
+    Settings.weight_step and the search continues from where it stopped:
+    cells keep their costs, and cells that got cheaper after they were
+    expanded are remembered and reopened, so every iteration only repairs
+    what the lower weight changes. Every improved path is emitted as an
+    extra path snapshot. The search stops once a path is provably the
+    shortest one or when it has searched for Settings.time_budget seconds;
+    the first path is always searched to the end. Steps and the heuristic
+    follow the current Movement.
+
+    Args:
+        maze (MazeGrid): The maze grid.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        snapshot_interval (int, optional): Number of expanded cells per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the search counters, summed over
+            all iterations, and the "search" and "path" phase times. Defaults to None.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time. A batch
+        with PATH entries replaces the path shown by the previous one.
+
+    Returns:
+        list: The best path found (empty if none), as the StopIteration value.
+    """
+    cells               = maze.cells
+    num_rows            = maze.rows
+    num_columns         = maze.cols
+    start_index         = start[0] * num_columns + start[1]
+    end_index           = end[0] * num_columns + end[1]
+    end_x, end_y        = end
+    movement            = current_movement()
+    moves               = movement.moves(maze.costs)
+    allows              = movement.allows
+    heuristic           = movement.heuristic()
+    weight              = max(1.0, Settings.initial_weight)
+    time_budget         = Settings.time_budget
+    g_costs             = {start_index: 0}
+    parent_cells        = {start_index: None}
+    open_heap           = [(weight * heuristic(abs(start[0] - end_x), abs(start[1] - end_y)), start_index, 0)]
+    closed              = set()
+    inconsistent        = set()
+    expanded_cells      = bytearray(len(maze))
+    pending_snapshot    = []
+    final_path          = []
+    step_count          = 0
+    pushes              = 1
+    pops                = 0
+    duplicate_pops      = 0
+    peak_frontier       = 1
+    search_time         = 0.0
+    resumed             = perf_counter()
+
+    try:
+        while True:
+            # improve the path with the current weight
+            out_of_time = False
+            while open_heap:
+                key, index, cost = open_heap[0]
+                if cost != g_costs[index] or index in closed:
+                    heapq.heappop(open_heap)
+                    pops += 1
+                    duplicate_pops += 1
+                    continue
+                # no open cell can lead to a cheaper end under this weight
+                if g_costs.get(end_index, INFINITY) <= key:
+                    break
+
+                heapq.heappop(open_heap)
+                pops += 1
+                closed.add(index)
+                x, y = divmod(index, num_columns)
+
+                if not expanded_cells[index]:
+                    expanded_cells[index] = 1
+                    if cells[index] not in END_POINTS:
+                        pending_snapshot.append((x, y, VISITED))
+                step_count += 1
+
+                if step_count % snapshot_interval == 0 and pending_snapshot:
+                    search_time += perf_counter() - resumed
+                    yield pending_snapshot
+                    resumed = perf_counter()
+                    pending_snapshot = []
+
+                # once there is a path, later iterations may run out of time
+                if final_path and step_count % BUDGET_CHECK_INTERVAL == 0:
+                    if search_time + perf_counter() - resumed >= time_budget:
+                        out_of_time = True
+                        break
+
+                for direction_x, direction_y, step_costs in moves:
+                    neighbour_x = x + direction_x
+                    neighbour_y = y + direction_y
+                    if not (0 <= neighbour_x < num_rows and 0 <= neighbour_y < num_columns):
+                        continue
+                    neighbour_index = neighbour_x * num_columns + neighbour_y
+                    if cells[neighbour_index] == WALL:
+                        continue
+                    if direction_x and direction_y and not allows(cells, x, y, direction_x, direction_y, num_columns):
+                        continue
+
+                    new_cost = cost + step_costs[neighbour_index]
+                    if new_cost >= g_costs.get(neighbour_index, INFINITY):
+                        continue
+                    g_costs[neighbour_index] = new_cost
+                    parent_cells[neighbour_index] = index
+                    if neighbour_index in closed:
+                        # reopened in the next iteration instead of this one
+                        inconsistent.add(neighbour_index)
+                    else:
+                        h_cost = heuristic(abs(neighbour_x - end_x), abs(neighbour_y - end_y))
+                        heapq.heappush(open_heap, (new_cost + weight * h_cost, neighbour_index, new_cost))
+                        pushes += 1
+
+                if len(open_heap) > peak_frontier:
+                    peak_frontier = len(open_heap)
+
+            if out_of_time or end_index not in g_costs:
+                break
+
+            # publish the path of this iteration if it improved
+            path_started = perf_counter()
+            improved_path = reconstruct_path(parent_cells, start_index, end_index)
+            path_snapshot = []
+            if improved_path != final_path:
+                path_snapshot = path_change_snapshot(cells, final_path, improved_path, num_columns)
+                final_path = improved_path
+            path_time = perf_counter() - path_started
+            # keep the path time out of the search time
+            resumed += path_time
+            if stats is not None:
+                stats.add_phase_time("path", path_time)
+            if path_snapshot:
+                if pending_snapshot:
+                    search_time += perf_counter() - resumed
+                    yield pending_snapshot
+                    resumed = perf_counter()
+                    pending_snapshot = []
+                search_time += perf_counter() - resumed
+                yield path_snapshot
+                resumed = perf_counter()
+
+            # the path is at most end cost / (lowest f of any open cell) times the shortest
+            open_cells = {
+                index for _, index, cost in open_heap
+                if cost == g_costs[index] and index not in closed
+            }
+            open_cells |= inconsistent
+            lowest_f = min(
+                (g_costs[index] + heuristic(abs(index // num_columns - end_x), abs(index % num_columns - end_y))
+                 for index in open_cells),
+                default=INFINITY
+            )
+            bound = min(weight, g_costs[end_index] / lowest_f) if lowest_f else weight
+            if weight <= 1.0 or bound <= 1.0:
+                break
+            if search_time + perf_counter() - resumed >= time_budget:
+                break
+
+            # lower the weight and reopen the inconsistent cells
+            weight = max(1.0, weight - Settings.weight_step)
+            open_heap = [
+                (g_costs[index] + weight * heuristic(abs(index // num_columns - end_x), abs(index % num_columns - end_y)),
+                 index, g_costs[index])
+                for index in open_cells
+            ]
+            heapq.heapify(open_heap)
+            pushes += len(inconsistent)
+            inconsistent = set()
+            closed = set()
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = duplicate_pops
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = expanded_cells.count(1)
+            stats.add_phase_time("search", search_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def ara_star_steps(maze, start, end, snapshot_interval=1, stats=None):
+    return collect_steps(iter_ara_star_steps(maze, start, end, snapshot_interval, stats))
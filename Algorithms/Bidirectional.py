@@ -0,0 +1,264 @@
+# Algorithms/Bidirectional.py
+from time import perf_counter
+from Maze.MazeGrid import END_POINTS, WALL, VISITED
+from .Frontiers import FifoFrontier, HeapFrontier
+from .Movement import Movement, current_movement
+from .SearchCore import SearchPolicy, UnorderedPolicy, final_path_snapshot, collect_steps
+from .AStar import Settings
+
+
+class AveragePotentialPolicy(SearchPolicy):
+    """
+    A* policy for bidirectional search. Each side is keyed by half the
+    difference between the distance to its target and the distance to its
+    source. The backward keys are then the negation of the forward ones, so
+    both searches work on the same consistent reduced costs and the classic
+    bidirectional Dijkstra stopping rule stays valid. The distances are the
+    heuristic of the Movement, Manhattan or octile.
+    """
+    def __init__(self, source, target, weight=1.0, movement=None):
+        self.source_x, self.source_y = source
+        self.target_x, self.target_y = target
+        self.weight = weight
+        self.heuristic = (movement or Movement()).heuristic(self.weighted)
+
+    def priority(self, cost, x, y):
+        to_target = self.heuristic(abs(x - self.target_x), abs(y - self.target_y))
+        from_source = self.heuristic(abs(x - self.source_x), abs(y - self.source_y))
+        return cost + (to_target - from_source) * self.weight / 2
+
+
+class _SearchSide:
+    """
+    State of one of the two searches: its frontier, the policy keying it,
+    the best known (cost, parent) label of every reached cell and the set of
+    settled cells.
+    """
+    def __init__(self, source_index, frontier, policy):
+        self.source = source_index
+        self.frontier = frontier
+        self.policy = policy
+        self.labels = {source_index: (0, None)}
+        self.closed = set()
+        self.last_key = 0
+        self.last_cost = 0
+
+    def chain(self, index):
+        """
+        Follows the labels from index back to the source of this side.
+        """
+        cells = []
+        while index is not None:
+            cells.append(index)
+            index = self.labels[index][1]
+        return cells
+
+
+def iter_bidirectional_steps(grid, start, end, sides, meet_bound, snapshot_interval=1, stats=None, movement=None):
+    """
+    Searches from start and end at the same time until the two frontiers
+    meet. Each step expands the side with the smaller frontier, which keeps
+    the two wavefronts balanced.
+
+    Whenever a side reaches a cell that the other side has already labelled,
+    the combined cost is a candidate for the best path. The search stops once
+    `meet_bound` of the last expansions shows that no remaining entry can
+    beat the best candidate.
+
+    Args:
+        grid (MazeGrid): The maze grid.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        sides (tuple[_SearchSide, _SearchSide]): The forward and backward search.
+        meet_bound (Callable[[_SearchSide, _SearchSide], float]): Lower bound for
+            any path not found yet.
+        snapshot_interval (int, optional): Number of visited cells per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the counters of both searches
+            combined and the "search" and "path" phase times. Defaults to None.
+        movement (Movement | None, optional): The steps both searches may take.
+            Defaults to None, which moves in 4 directions.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time, in
+        which the visited cells of both wavefronts are interleaved.
+
+    Returns:
+        list: The found path (empty if none), as the StopIteration value.
+    """
+    original            = grid.cells[:]
+    pending_snapshot    = []
+    step_count          = 0
+    num_rows            = grid.rows
+    num_columns         = grid.cols
+    movement            = movement or Movement()
+    moves               = movement.moves(grid.costs if sides[0].policy.weighted else None)
+    allows              = movement.allows
+    best_cost           = float("inf")
+    meeting             = None  # (side, cell on that side, cell on the other side)
+    pushes              = 2
+    pops                = 0
+    duplicate_pops      = 0
+    peak_frontier       = 2
+    search_time         = 0.0
+    resumed             = perf_counter()
+
+    for side in sides:
+        x, y = divmod(side.source, num_columns)
+        side.frontier.push((side.policy.priority(0, x, y), side.source, 0, None))
+
+    if sides[0].source == sides[1].source:
+        return [start]
+
+    try:
+        while True:
+            # expand the side with the smaller frontier (Pohl's cardinality rule)
+            turn = 0 if len(sides[0].frontier) <= len(sides[1].frontier) else 1
+            side, other = sides[turn], sides[1 - turn]
+
+            try:
+                key, index, cost, parent = side.frontier.pop()
+            except IndexError:
+                # one side ran dry, so start and end are not connected
+                break
+            pops += 1
+
+            if index in side.closed:
+                duplicate_pops += 1
+                continue
+            side.closed.add(index)
+            side.labels[index] = (cost, parent)
+            side.last_key, side.last_cost = key, cost
+
+            # no remaining entry can improve on the best meeting
+            if meeting and meet_bound(sides[0], sides[1]) >= best_cost:
+                break
+
+            x, y = divmod(index, num_columns)
+
+            # mark as visited
+            if original[index] not in END_POINTS:
+                original[index] = VISITED
+                pending_snapshot.append((x, y, VISITED))
+            step_count += 1
+
+            # take snapshot at intervals
+            if step_count % snapshot_interval == 0 and pending_snapshot:
+                search_time += perf_counter() - resumed
+                yield pending_snapshot
+                resumed = perf_counter()
+                pending_snapshot = []
+
+            # explore neighbours
+            for direction_x, direction_y, step_costs in moves:
+                neighbour_x = x + direction_x
+                neighbour_y = y + direction_y
+
+                out_of_bounds = (
+                    neighbour_x < 0 or neighbour_x >= num_rows or
+                    neighbour_y < 0 or neighbour_y >= num_columns
+                )
+                if out_of_bounds:
+                    continue
+                neighbour_index = neighbour_x * num_columns + neighbour_y
+                if original[neighbour_index] == WALL:
+                    continue
+                if neighbour_index in side.closed:
+                    continue
+                if direction_x and direction_y and not allows(original, x, y, direction_x, direction_y, num_columns):
+                    continue
+
+                # the backward side walks edges in reverse, so it pays for the cell it leaves
+                if not step_costs:
+                    new_cost = cost + 1
+                elif turn == 0:
+                    new_cost = cost + step_costs[neighbour_index]
+                else:
+                    new_cost = cost + step_costs[index]
+
+                # the two wavefronts touch here
+                other_label = other.labels.get(neighbour_index)
+                if other_label is not None and new_cost + other_label[0] < best_cost:
+                    best_cost = new_cost + other_label[0]
+                    meeting = (turn, index, neighbour_index)
+
+                label = side.labels.get(neighbour_index)
+                if label is not None and label[0] <= new_cost:
+                    continue
+                side.labels[neighbour_index] = (new_cost, index)
+                side.frontier.push((
+                    side.policy.priority(new_cost, neighbour_x, neighbour_y),
+                    neighbour_index, new_cost, index
+                ))
+                pushes += 1
+
+            if pushes - pops > peak_frontier:
+                peak_frontier = pushes - pops
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = duplicate_pops
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = len(sides[0].closed) + len(sides[1].closed)
+            stats.add_phase_time("search", search_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    if meeting is None:
+        return []
+
+    # join the two half paths at the meeting edge
+    resumed = perf_counter()
+    meeting_side, near_cell, far_cell = meeting
+    near_half = sides[meeting_side].chain(near_cell)
+    far_half = sides[1 - meeting_side].chain(far_cell)
+    near_half.reverse()
+    final_path = near_half + far_half
+    if meeting_side == 1:
+        final_path.reverse()
+
+    path_snapshot = final_path_snapshot(original, final_path, num_columns)
+    if stats is not None:
+        stats.add_phase_time("path", perf_counter() - resumed)
+    if path_snapshot:
+        yield path_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def iter_bidirectional_bfs_steps(maze, start, end, snapshot_interval=1, stats=None):
+    movement = current_movement()
+    start_index = maze.index(*start)
+    end_index = maze.index(*end)
+    sides = (
+        _SearchSide(start_index, FifoFrontier(), UnorderedPolicy()),
+        _SearchSide(end_index, FifoFrontier(), UnorderedPolicy()),
+    )
+    # every cell cheaper than the last expanded one has been expanded on both sides
+    meet_bound = lambda forward, backward: forward.last_cost + backward.last_cost
+    return iter_bidirectional_steps(maze, start, end, sides, meet_bound, snapshot_interval, stats, movement)
+
+
+def iter_bidirectional_a_star_steps(maze, start, end, snapshot_interval=1, stats=None):
+    movement = current_movement()
+    start_index = maze.index(*start)
+    end_index = maze.index(*end)
+    sides = (
+        _SearchSide(start_index, HeapFrontier(), AveragePotentialPolicy(start, end, Settings.heuristic_weight, movement)),
+        _SearchSide(end_index, HeapFrontier(), AveragePotentialPolicy(end, start, Settings.heuristic_weight, movement)),
+    )
+    # the keys are distances on the reduced costs, which only grow on each side
+    meet_bound = lambda forward, backward: forward.last_key + backward.last_key
+    return iter_bidirectional_steps(maze, start, end, sides, meet_bound, snapshot_interval, stats, movement)
+
+
+def bidirectional_bfs_steps(maze, start, end, snapshot_interval=1, stats=None):
+    return collect_steps(iter_bidirectional_bfs_steps(maze, start, end, snapshot_interval, stats))
+
+
+def bidirectional_a_star_steps(maze, start, end, snapshot_interval=1, stats=None):
+    return collect_steps(iter_bidirectional_a_star_steps(maze, start, end, snapshot_interval, stats))
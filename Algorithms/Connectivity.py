@@ -0,0 +1,210 @@
+# Algorithms/Connectivity.py
+from array import array
+from collections import deque
+import numpy as np
+from Maze.MazeGrid import WALL
+from .Movement import Movement
+
+# Label of a wall cell, which belongs to no component.
+NO_COMPONENT        = -1
+
+
+class ConnectivityIndex:
+    """
+    The connected components of the open cells of a maze, kept up to date
+    while walls are drawn and removed.
+
+    Every open cell holds a component label, and the labels are joined in a
+    union-find forest: two cells are connected when their labels have the
+    same root, which takes near-constant time to check. The first labelling
+    is done with NumPy for the whole grid at once.
+
+    Removing a wall only ever merges the components around the cell, which
+    is one union per neighbour. Adding a wall can split its component, which
+    union-find cannot undo, so the split is found with a breadth-first
+    search from every open neighbour of the new wall, one cell per
+    search in turn. Searches that meet are merged, and the search stops as
+    soon as a single one is still running. A search that ran out of cells
+    on its own was cut off, and only its cells get a new label. The work is
+    proportional to the smaller sides of the split, not to the component.
+
+    With 8-connectivity diagonal steps join cells as well. A wall that
+    blocks a diagonal step is a side neighbour of both of its cells, so the
+    same searches also find the splits of corners that closed.
+    """
+    def __init__(self, grid, movement=None):
+        """
+        Args:
+            grid (MazeGrid): The maze grid. Edited cells must be reported to update_cells().
+            movement (Movement | None, optional): The steps that join cells. Defaults to
+                None, which moves in 4 directions.
+        """
+        self.grid = grid
+        self.movement = movement or Movement()
+        num_rows = grid.rows
+        num_columns = grid.cols
+        open_cells = np.frombuffer(grid.cells, dtype=np.uint8) != WALL
+
+        # hook every pair of open neighbours to the lower label and compress until nothing changes
+        labels = np.arange(len(grid), dtype=np.int64)
+        indices = labels.reshape(num_rows, num_columns)
+        open_grid = open_cells.reshape(num_rows, num_columns)
+        pairs = [
+            (indices[:-1, :][open_grid[:-1, :] & open_grid[1:, :]], indices[1:, :][open_grid[:-1, :] & open_grid[1:, :]]),
+            (indices[:, :-1][open_grid[:, :-1] & open_grid[:, 1:]], indices[:, 1:][open_grid[:, :-1] & open_grid[:, 1:]]),
+        ]
+        if self.movement.diagonal:
+            # the two diagonals of every 2x2 block, each with the other two cells beside it
+            open_sides = open_grid[:-1, 1:].astype(np.int8) + open_grid[1:, :-1]
+            joined = open_grid[:-1, :-1] & open_grid[1:, 1:] & (open_sides >= self.movement.open_sides)
+            pairs.append((indices[:-1, :-1][joined], indices[1:, 1:][joined]))
+            open_sides = open_grid[:-1, :-1].astype(np.int8) + open_grid[1:, 1:]
+            joined = open_grid[:-1, 1:] & open_grid[1:, :-1] & (open_sides >= self.movement.open_sides)
+            pairs.append((indices[:-1, 1:][joined], indices[1:, :-1][joined]))
+        first_cells = np.concatenate([first for first, _ in pairs])
+        second_cells = np.concatenate([second for _, second in pairs])
+        while True:
+            first_labels = labels[first_cells]
+            second_labels = labels[second_cells]
+            differs = first_labels != second_labels
+            if not differs.any():
+                break
+            np.minimum.at(
+                labels,
+                np.maximum(first_labels, second_labels)[differs],
+                np.minimum(first_labels, second_labels)[differs]
+            )
+            while True:
+                compressed = labels[labels]
+                if np.array_equal(compressed, labels):
+                    break
+                labels = compressed
+
+        labels[~open_cells] = NO_COMPONENT
+        self.labels = array("i", labels.astype(np.int32).tobytes())
+        # every label is a root of its own until components merge; new labels are appended
+        self.parents = array("i", np.arange(len(grid), dtype=np.int32).tobytes())
+
+    def _new_label(self):
+        # a cell index may still be the label of other cells, so edits never reuse one
+        label = len(self.parents)
+        self.parents.append(label)
+        return label
+
+    def find(self, label):
+        parents = self.parents
+        root = label
+        while parents[root] != root:
+            root = parents[root]
+        # path compression
+        while parents[label] != root:
+            parents[label], label = root, parents[label]
+        return root
+
+    def component_of(self, cell):
+        """
+        Returns the component of a cell, or NO_COMPONENT for a wall.
+        """
+        label = self.labels[self.grid.index(*cell)]
+        return NO_COMPONENT if label == NO_COMPONENT else self.find(label)
+
+    def connected(self, start, end):
+        """
+        Returns whether a path exists between two cells.
+        """
+        component = self.component_of(start)
+        return component != NO_COMPONENT and component == self.component_of(end)
+
+    def any_connected(self, sources, goals):
+        """
+        Returns whether a path exists from any of the sources to any of the goals.
+        """
+        components = {self.component_of(source) for source in sources}
+        components.discard(NO_COMPONENT)
+        return any(self.component_of(goal) in components for goal in goals)
+
+    def _open_neighbours(self, index):
+        for neighbour_index, _ in self.movement.neighbours(self.grid, index):
+            yield neighbour_index
+
+    def update_cells(self, changed_cells):
+        """
+        Brings the components up to date with edited cells. Cells whose
+        wall state did not change, such as repainted terrain, are skipped.
+
+        Args:
+            changed_cells (list[tuple[int, int]]): The edited cells.
+        """
+        cells = self.grid.cells
+        for cell in changed_cells:
+            index = self.grid.index(*cell)
+            is_open = cells[index] != WALL
+            was_open = self.labels[index] != NO_COMPONENT
+            if is_open and not was_open:
+                self._open_cell(index)
+            elif was_open and not is_open:
+                self._close_cell(index)
+
+    def _open_cell(self, index):
+        """
+        Gives an opened cell a label of its own and merges it with the
+        components of its open neighbours.
+        """
+        root = self.labels[index] = self._new_label()
+        for neighbour in self._open_neighbours(index):
+            neighbour_root = self.find(self.labels[neighbour])
+            if neighbour_root != root:
+                self.parents[neighbour_root] = root
+
+    def _close_cell(self, index):
+        """
+        Removes a cell that became a wall and splits off the parts of its
+        component that it was the only link between.
+        """
+        labels = self.labels
+        labels[index] = NO_COMPONENT
+        starts = list(self._open_neighbours(index))
+        if len(starts) <= 1:
+            return
+
+        # one search per neighbour; a search that reaches the cells of another takes it over
+        owners = {start: search for search, start in enumerate(starts)}
+        merged_into = list(range(len(starts)))
+        queues = {search: deque([start]) for search, start in enumerate(starts)}
+        members = {search: [start] for search, start in enumerate(starts)}
+
+        def merged_search(search):
+            while merged_into[search] != search:
+                search = merged_into[search]
+            return search
+
+        while len(queues) > 1:
+            for search in list(queues):
+                if search not in queues:
+                    continue
+                queue = queues[search]
+                if not queue:
+                    # cut off: the cells of this search form a new component
+                    del queues[search]
+                    new_label = self._new_label()
+                    for member in members.pop(search):
+                        labels[member] = new_label
+                    if len(queues) <= 1:
+                        break
+                    continue
+
+                current = queue.popleft()
+                for neighbour in self._open_neighbours(current):
+                    owner = owners.get(neighbour)
+                    if owner is None:
+                        owners[neighbour] = search
+                        members[search].append(neighbour)
+                        queue.append(neighbour)
+                        continue
+                    owner = merged_search(owner)
+                    if owner != search:
+                        merged_into[owner] = search
+                        queue.extend(queues.pop(owner))
+                        members[search].extend(members.pop(owner))
+                if len(queues) <= 1:
+                    break
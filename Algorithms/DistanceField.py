@@ -0,0 +1,149 @@
+# Algorithms/DistanceField.py
+import numpy as np
+from Maze.MazeGrid import WALL, MIN_TERRAIN_COST
+from .Frontiers import BucketFrontier
+from .Movement import Movement
+from .WavefrontBFS import bfs_distance_field
+
+
+def goal_distance_field(grid, goal, movement=None):
+    """
+    Computes the cost of the cheapest path from every cell to the goal.
+
+    On 4-connected grids without terrain this is the vectorised BFS
+    distance. Otherwise a reverse Dijkstra sweep on a bucket queue runs
+    from the goal: stepping backwards from u to v means the forward path
+    v -> u pays the cost of entering u, scaled for the step between them.
+
+    Args:
+        grid (MazeGrid): The maze grid.
+        goal (tuple[int, int]): The cell the distances lead to.
+        movement (Movement | None, optional): The steps paths may take. Defaults to
+            None, which moves in 4 directions.
+
+    Returns:
+        np.ndarray: A flat int32 array of path costs, -1 for walls and cells
+        that cannot reach the goal.
+    """
+    movement = movement or Movement()
+    if not movement.diagonal and grid.costs.count(MIN_TERRAIN_COST) == len(grid):
+        return bfs_distance_field(grid, goal).ravel()
+
+    cells = grid.cells
+    num_rows = grid.rows
+    num_columns = grid.cols
+    moves = movement.moves(grid.costs)
+    allows = movement.allows
+    distance = [-1] * len(grid)
+    frontier = BucketFrontier(movement.max_step_cost)
+
+    # enqueue (cost, index)
+    frontier.push((0, grid.index(*goal)))
+    while True:
+        try:
+            cost, index = frontier.pop()
+        except IndexError:
+            break
+        if distance[index] >= 0:
+            continue
+        distance[index] = cost
+
+        x, y = divmod(index, num_columns)
+        for direction_x, direction_y, step_costs in moves:
+            neighbour_x = x + direction_x
+            neighbour_y = y + direction_y
+            if not (0 <= neighbour_x < num_rows and 0 <= neighbour_y < num_columns):
+                continue
+            neighbour_index = neighbour_x * num_columns + neighbour_y
+            if cells[neighbour_index] == WALL or distance[neighbour_index] >= 0:
+                continue
+            if direction_x and direction_y and not allows(cells, x, y, direction_x, direction_y, num_columns):
+                continue
+            frontier.push((cost + step_costs[index], neighbour_index))
+
+    return np.array(distance, dtype=np.int32)
+
+
+def path_to_goal(distance, grid, start, movement=None):
+    """
+    Follows the distance field downhill from start to the goal. Each step
+    moves to a neighbour whose distance plus the cost of entering it equals
+    the current distance, so the walk costs O(path length).
+
+    Args:
+        distance (np.ndarray): Flat field from goal_distance_field.
+        grid (MazeGrid): The maze grid the field was computed on.
+        start (tuple[int, int]): The cell to start from.
+        movement (Movement | None, optional): The Movement the field was computed
+            with. Defaults to None, which moves in 4 directions.
+
+    Returns:
+        list[tuple[int, int]]: The path from start to the goal (inclusive), or
+        an empty list if the goal cannot be reached from start or the field no
+        longer matches the grid.
+    """
+    movement = movement or Movement()
+    step_costs = grid.costs
+    index = grid.index(*start)
+    if distance[index] < 0:
+        return []
+
+    final_path = [start]
+    remaining = int(distance[index])
+    while remaining:
+        for neighbour_index, step_scale in movement.neighbours(grid, index):
+            neighbour_distance = distance[neighbour_index]
+            if neighbour_distance >= 0 and neighbour_distance + step_costs[neighbour_index] * step_scale == remaining:
+                index = neighbour_index
+                remaining = int(neighbour_distance)
+                final_path.append(grid.position(neighbour_index))
+                break
+        else:
+            # a stale field, from before an edit, can have no step downhill
+            return []
+
+    return final_path
+
+
+def distance_table(grid, sources, goals, movement=None):
+    """
+    Computes the cost of the cheapest path from every source to every goal.
+
+    Instead of one search per pair, one distance field sweep (vectorised BFS
+    without terrain, Dijkstra on a bucket queue with it) runs per goal, or per
+    source when there are fewer sources. A field from a source holds the cost
+    of reaching the source, and the cost the other way round differs only in
+    the end cells paid for: d(s -> g) = d(g -> s) - cost(s) + cost(g). With
+    8-connectivity that only holds if the first and last steps are of the
+    same kind, so the sweeps always run per goal.
+
+    Args:
+        grid (MazeGrid): The maze grid.
+        sources (list[tuple[int, int]]): The start cells.
+        goals (list[tuple[int, int]]): The end cells.
+        movement (Movement | None, optional): The steps paths may take. Defaults to
+            None, which moves in 4 directions.
+
+    Returns:
+        list[list[int | None]]: One row per source with the cost to each goal,
+        None where the goal cannot be reached.
+    """
+    movement = movement or Movement()
+    step_costs = grid.costs
+    table = [[None] * len(goals) for _ in sources]
+    if len(goals) <= len(sources) or movement.diagonal:
+        for column, goal in enumerate(goals):
+            distance = goal_distance_field(grid, goal, movement)
+            for row, source in enumerate(sources):
+                cost = int(distance[grid.index(*source)])
+                table[row][column] = cost if cost >= 0 else None
+    else:
+        for row, source in enumerate(sources):
+            distance = goal_distance_field(grid, source, movement)
+            source_cost = step_costs[grid.index(*source)]
+            for column, goal in enumerate(goals):
+                goal_index = grid.index(*goal)
+                cost = int(distance[goal_index])
+                if cost >= 0:
+                    table[row][column] = cost - source_cost + step_costs[goal_index]
+    return table
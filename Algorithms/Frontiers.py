@@ -0,0 +1,99 @@
+# Algorithms/Frontiers.py
+"""
+Frontier strategies for the search engine in SearchCore.
+
+Every frontier stores (key, index, cost, parent) tuples and exposes two
+callables, `push(item)` and `pop()`. `pop` raises IndexError when the
+frontier is empty, which is how the engine detects the end of the search.
+The callables are bound directly to the underlying container methods, so no
+Python level wrapper runs on the hot path and no thread locks are taken
+(unlike queue.Queue and queue.PriorityQueue).
+"""
+import heapq
+from collections import deque
+from functools import partial
+
+
+class FifoFrontier:
+    """
+    First in, first out frontier backed by a deque. Ignores the key.
+    Used by breadth-first search.
+    """
+    def __init__(self):
+        self.items = deque()
+        self.push = self.items.append
+        self.pop = self.items.popleft
+
+    def __len__(self):
+        return len(self.items)
+
+
+class StackFrontier:
+    """
+    Last in, first out frontier backed by a plain list. Ignores the key.
+    Used by depth-first search.
+    """
+    def __init__(self):
+        self.items = []
+        self.push = self.items.append
+        self.pop = self.items.pop
+
+    def __len__(self):
+        return len(self.items)
+
+
+class HeapFrontier:
+    """
+    Lowest key first frontier backed by heapq. Ties are broken by the cell
+    index. Used by Dijkstra and A*.
+    """
+    def __init__(self):
+        self.items = []
+        self.push = partial(heapq.heappush, self.items)
+        self.pop = partial(heapq.heappop, self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class BucketFrontier:
+    """
+    Dial's bucket queue for small non-negative integer keys.
+
+    Works when keys never drop below the last popped key and a push is never
+    more than `max_step` above it, which holds for Dijkstra with integer step
+    costs of at most `max_step`. The buckets form a ring of max_step + 1
+    deques indexed by key modulo the ring size, so push and pop are O(1)
+    instead of the O(log n) of a binary heap. Entries with the same key come
+    out in insertion order.
+    """
+    def __init__(self, max_step: int):
+        self.buckets = [deque() for _ in range(max_step + 1)]
+        buckets = self.buckets
+        ring_size = len(buckets)
+        current = 0
+        size = 0
+
+        # closures over local state keep attribute lookups off the hot path
+        def push(item):
+            nonlocal size
+            buckets[item[0] % ring_size].append(item)
+            size += 1
+
+        def pop():
+            nonlocal current, size
+            if not size:
+                raise IndexError("pop from an empty frontier")
+            bucket = buckets[current % ring_size]
+            while not bucket:
+                current += 1
+                bucket = buckets[current % ring_size]
+            size -= 1
+            return bucket.popleft()
+
+        self.push = push
+        self.pop = pop
+        self._size = lambda: size
+
+    def __len__(self):
+        return self._size()
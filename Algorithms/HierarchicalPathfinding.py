@@ -0,0 +1,413 @@
+# Algorithms/HierarchicalPathfinding.py
+import heapq
+from time import perf_counter
+from Maze.MazeGrid import END_POINTS, WALL, VISITED
+from .Movement import Movement, current_movement
+from .SearchCore import collect_steps, final_path_snapshot
+
+CLUSTER_SIZE        = 16
+# Entrances longer than this get a transition at both ends instead of one in the middle.
+WIDE_ENTRANCE       = 6
+INFINITY            = float("inf")
+
+
+class AbstractGraph:
+    """
+    The abstraction HPA* (Botea, Müller & Schaeffer) searches instead of the grid.
+
+    The grid is split into square clusters. Where two neighbouring clusters
+    share a run of open cells along their border, the run is an entrance
+    and the cells on both sides of it become nodes, joined by an edge that
+    costs one step. Inside a cluster every pair of nodes is joined by an
+    edge that costs the shortest path between them that stays inside the
+    cluster.
+
+    Clusters are built the first time a search reaches them and are kept
+    until invalidate_cells() drops them, so repeated queries on a mostly
+    static maze only pay for the clusters that were edited. Like the other
+    solvers, entering a cell costs its terrain cost.
+
+    With 8-connectivity the searches inside a cluster take diagonal steps,
+    but entrances are still crossed with straight steps. A diagonal step
+    across a border always has an open cell beside it, so the straight
+    crossings keep every reachable cell reachable.
+    """
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE, movement=None):
+        """
+        Args:
+            grid (MazeGrid): The maze grid. Edits to it must be reported with invalidate_cells().
+            cluster_size (int, optional): Side length of a cluster in cells. Defaults to CLUSTER_SIZE.
+            movement (Movement | None, optional): The steps paths may take. Defaults to
+                None, which moves in 4 directions.
+        """
+        self.grid = grid
+        self.movement = movement or Movement()
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        # (cluster, neighbour) with cluster < neighbour -> [(cell in cluster, cell in neighbour)]
+        self.border_transitions = {}
+        # cluster -> {node: [(node, cost), ...]}
+        self.cluster_edges = {}
+        self.build_time = 0.0
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.grid.cols)
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def _bounds(self, cluster):
+        """
+        Returns the first and one past the last row and column of a cluster.
+        """
+        size = self.cluster_size
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        first_row, first_col = cluster_row * size, cluster_col * size
+        return (first_row, min(first_row + size, self.grid.rows),
+                first_col, min(first_col + size, self.grid.cols))
+
+    def _neighbour_clusters(self, cluster):
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        if cluster_row > 0:
+            yield cluster - self.cluster_cols
+        if cluster_row < self.cluster_rows - 1:
+            yield cluster + self.cluster_cols
+        if cluster_col > 0:
+            yield cluster - 1
+        if cluster_col < self.cluster_cols - 1:
+            yield cluster + 1
+
+    def _transitions(self, cluster, neighbour):
+        """
+        Returns the transitions on the border between a cluster and the
+        neighbour below or to the right of it, finding them on first use.
+        """
+        transitions = self.border_transitions.get((cluster, neighbour))
+        if transitions is not None:
+            return transitions
+
+        cells = self.grid.cells
+        num_columns = self.grid.cols
+        first_row, last_row, first_col, last_col = self._bounds(cluster)
+        # with a single column of clusters, cluster + 1 is the one below
+        cluster_row = cluster // self.cluster_cols
+        if neighbour // self.cluster_cols == cluster_row:
+            # vertical border: pairs side by side
+            pairs = [
+                (row * num_columns + last_col - 1, row * num_columns + last_col)
+                for row in range(first_row, last_row)
+            ]
+        else:
+            # horizontal border: pairs one above the other
+            pairs = [
+                ((last_row - 1) * num_columns + col, last_row * num_columns + col)
+                for col in range(first_col, last_col)
+            ]
+
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and cells[pair[0]] != WALL and cells[pair[1]] != WALL:
+                run.append(pair)
+                continue
+            if len(run) > WIDE_ENTRANCE:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self.border_transitions[(cluster, neighbour)] = transitions
+        return transitions
+
+    def cluster_nodes(self, cluster):
+        """
+        Returns the edges of every node of a cluster, building the cluster
+        on first use.
+
+        Returns:
+            dict[int, list[tuple[int, int]]]: Maps each node (flat cell index) to its
+            (neighbour node, cost) edges.
+        """
+        edges = self.cluster_edges.get(cluster)
+        if edges is not None:
+            return edges
+
+        started = perf_counter()
+        costs = self.grid.costs
+        inter_edges = {}
+        for neighbour in self._neighbour_clusters(cluster):
+            for first, second in self._transitions(min(cluster, neighbour), max(cluster, neighbour)):
+                node, partner = (first, second) if cluster < neighbour else (second, first)
+                inter_edges.setdefault(node, []).append((partner, costs[partner] * self.movement.straight_cost))
+
+        nodes = list(inter_edges)
+        edges = {node: list(node_edges) for node, node_edges in inter_edges.items()}
+        if self.movement.diagonal:
+            # the first and last steps of a path scale differently, so every direction is searched
+            for node in nodes:
+                distances, _ = self.local_search(node, cluster, nodes)
+                edges[node].extend((other, distances[other]) for other in nodes if other != node and other in distances)
+        else:
+            # a path run backwards enters the same cells except the last one and enters the
+            # first one instead, so each search also gives the costs in the other direction
+            for position, node in enumerate(nodes[:-1]):
+                later_nodes = nodes[position + 1:]
+                distances, _ = self.local_search(node, cluster, later_nodes)
+                for other in later_nodes:
+                    if other in distances:
+                        edges[node].append((other, distances[other]))
+                        edges[other].append((node, distances[other] - costs[other] + costs[node]))
+
+        self.cluster_edges[cluster] = edges
+        self.build_time += perf_counter() - started
+        return edges
+
+    def node_edges(self, index):
+        """
+        Returns the (neighbour node, cost) edges of a node, or an empty list
+        if the cell is not a node.
+        """
+        return self.cluster_nodes(self.cluster_of(index)).get(index, [])
+
+    def local_search(self, source, cluster, targets=(), reverse=False):
+        """
+        Dijkstra that never leaves the given cluster.
+
+        Args:
+            source (int): Flat index of the cell the search starts from.
+            cluster (int): The cluster to stay in.
+            targets (Collection[int], optional): Stop once all of these are settled.
+                Defaults to (), which searches the whole cluster.
+            reverse (bool, optional): Measure the cost of reaching the source from
+                every cell instead of the other way round. Defaults to False.
+
+        Returns:
+            tuple[dict, dict]: The costs and parents of the settled cells.
+        """
+        grid = self.grid
+        cells = grid.cells
+        num_columns = grid.cols
+        moves = self.movement.moves(grid.costs)
+        allows = self.movement.allows
+        first_row, last_row, first_col, last_col = self._bounds(cluster)
+        targets = set(targets)
+        remaining = len(targets)
+
+        distances = {}
+        parents = {}
+        queue = [(0, source, None)]
+        while queue and (remaining or not targets):
+            cost, index, parent = heapq.heappop(queue)
+            if index in distances:
+                continue
+            distances[index] = cost
+            parents[index] = parent
+            if index in targets:
+                remaining -= 1
+
+            x, y = divmod(index, num_columns)
+            for direction_x, direction_y, step_costs in moves:
+                neighbour_x = x + direction_x
+                neighbour_y = y + direction_y
+                if not (first_row <= neighbour_x < last_row and first_col <= neighbour_y < last_col):
+                    continue
+                neighbour_index = neighbour_x * num_columns + neighbour_y
+                if neighbour_index in distances or cells[neighbour_index] == WALL:
+                    continue
+                # the cells beside a diagonal step lie in the cluster too
+                if direction_x and direction_y and not allows(cells, x, y, direction_x, direction_y, num_columns):
+                    continue
+                new_cost = cost + step_costs[index if reverse else neighbour_index]
+                heapq.heappush(queue, (new_cost, neighbour_index, index))
+
+        return distances, parents
+
+    def local_path(self, source, target):
+        """
+        Returns the cheapest path from source to target that stays inside
+        their cluster, as a list of flat indices.
+        """
+        _, parents = self.local_search(source, self.cluster_of(source), (target,))
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def invalidate_cells(self, changed_cells):
+        """
+        Drops the clusters whose cells changed. A changed cell on a cluster
+        border also changes the entrances there, so the border and the
+        cluster on its other side are dropped as well.
+
+        Args:
+            changed_cells (Iterable[tuple[int, int]]): The edited cells.
+        """
+        size = self.cluster_size
+        for row, col in changed_cells:
+            cluster = self.cluster_of(row * self.grid.cols + col)
+            self.cluster_edges.pop(cluster, None)
+
+            neighbours = []
+            if row % size == 0:
+                neighbours.append(cluster - self.cluster_cols)
+            if row % size == size - 1:
+                neighbours.append(cluster + self.cluster_cols)
+            if col % size == 0:
+                neighbours.append(cluster - 1)
+            if col % size == size - 1:
+                neighbours.append(cluster + 1)
+            for neighbour in neighbours:
+                if neighbour in self._neighbour_clusters(cluster):
+                    self.border_transitions.pop((min(cluster, neighbour), max(cluster, neighbour)), None)
+                    self.cluster_edges.pop(neighbour, None)
+
+
+def iter_hpa_star_steps(maze, start, end, snapshot_interval=1, stats=None, abstract_graph=None):
+    """
+    Hierarchical A* (HPA*) over the clusters of an AbstractGraph.
+
+    The start and end are joined to the nodes of their clusters by local
+    searches, A* finds the cheapest route through the abstract graph, and
+    each abstract edge is then refined into cells with a search inside its
+    cluster. The abstract search only touches the entrances of the
+    clusters, so it expands far fewer cells than A* on the grid. The path
+    can be slightly longer than the shortest one, because routes between
+    clusters must pass through the chosen entrance cells.
+
+    Args:
+        maze (MazeGrid): The maze grid.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        snapshot_interval (int, optional): Number of expanded nodes per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the counters of the abstract
+            search and the "build", "search" and "path" phase times. Defaults to None.
+        abstract_graph (AbstractGraph | None, optional): The cached abstraction of the maze.
+            Defaults to None, which builds a new one for this solve.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time. The
+        visited cells are the expanded abstract nodes.
+
+    Returns:
+        list: The found path (empty if none), as the StopIteration value.
+    """
+    graph               = abstract_graph if abstract_graph is not None else AbstractGraph(maze, movement=current_movement())
+    cells               = maze.cells
+    num_columns         = maze.cols
+    start_index         = start[0] * num_columns + start[1]
+    end_index           = end[0] * num_columns + end[1]
+    end_x, end_y        = end
+    heuristic           = graph.movement.heuristic()
+    build_time          = graph.build_time
+    resumed             = perf_counter()
+
+    # join the start and the end to the nodes of their clusters
+    start_cluster = graph.cluster_of(start_index)
+    end_cluster = graph.cluster_of(end_index)
+    start_targets = set(graph.cluster_nodes(start_cluster))
+    if start_cluster == end_cluster:
+        start_targets.add(end_index)
+    start_costs, _ = graph.local_search(start_index, start_cluster, start_targets)
+    start_edges = list(start_costs.items())
+    end_costs, _ = graph.local_search(end_index, end_cluster, set(graph.cluster_nodes(end_cluster)), reverse=True)
+
+    g_costs             = {start_index: 0}
+    parent_nodes        = {start_index: None}
+    closed              = set()
+    # ties go to the node furthest along, which keeps open maps from expanding every cluster
+    open_heap           = [(heuristic(abs(start[0] - end_x), abs(start[1] - end_y)), 0, start_index)]
+    pending_snapshot    = []
+    found_path          = False
+    step_count          = 0
+    pushes              = 1
+    pops                = 0
+    peak_frontier       = 1
+    search_time         = 0.0
+
+    try:
+        while open_heap:
+            _, cost, index = heapq.heappop(open_heap)
+            cost = -cost
+            pops += 1
+            if index in closed:
+                continue
+            closed.add(index)
+
+            if cells[index] not in END_POINTS:
+                pending_snapshot.append((index // num_columns, index % num_columns, VISITED))
+            step_count += 1
+
+            if step_count % snapshot_interval == 0 and pending_snapshot:
+                search_time += perf_counter() - resumed
+                yield pending_snapshot
+                resumed = perf_counter()
+                pending_snapshot = []
+
+            if index == end_index:
+                found_path = True
+                break
+
+            edges = graph.node_edges(index)
+            if index == start_index:
+                edges = edges + start_edges
+            if index in end_costs:
+                edges = edges + [(end_index, end_costs[index])]
+
+            for neighbour_index, edge_cost in edges:
+                new_cost = cost + edge_cost
+                if neighbour_index in closed or new_cost >= g_costs.get(neighbour_index, INFINITY):
+                    continue
+                g_costs[neighbour_index] = new_cost
+                parent_nodes[neighbour_index] = index
+                neighbour_x, neighbour_y = divmod(neighbour_index, num_columns)
+                h_cost = heuristic(abs(neighbour_x - end_x), abs(neighbour_y - end_y))
+                heapq.heappush(open_heap, (new_cost + h_cost, -new_cost, neighbour_index))
+                pushes += 1
+
+            if pushes - pops > peak_frontier:
+                peak_frontier = pushes - pops
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            build_time = graph.build_time - build_time
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = pops - step_count
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = len(closed)
+            stats.add_phase_time("build", build_time)
+            stats.add_phase_time("search", search_time - build_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    if not found_path:
+        return []
+
+    # refine every abstract edge into cells
+    resumed = perf_counter()
+    abstract_path = [end_index]
+    while parent_nodes[abstract_path[-1]] is not None:
+        abstract_path.append(parent_nodes[abstract_path[-1]])
+    abstract_path.reverse()
+
+    final_path = [start_index]
+    for source, target in zip(abstract_path, abstract_path[1:]):
+        if graph.cluster_of(source) != graph.cluster_of(target):
+            final_path.append(target)
+        else:
+            final_path.extend(graph.local_path(source, target)[1:])
+
+    path_snapshot = final_path_snapshot(cells, final_path, num_columns)
+    if stats is not None:
+        stats.add_phase_time("path", perf_counter() - resumed)
+    if path_snapshot:
+        yield path_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def hpa_star_steps(maze, start, end, snapshot_interval=1, stats=None, abstract_graph=None):
+    return collect_steps(iter_hpa_star_steps(maze, start, end, snapshot_interval, stats, abstract_graph))
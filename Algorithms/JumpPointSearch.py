@@ -0,0 +1,298 @@
+# Algorithms/JumpPointSearch.py
+from time import perf_counter
+from Maze.MazeGrid import END_POINTS, WALL, VISITED
+from .Frontiers import HeapFrontier
+from .Movement import DIRECTIONS, current_movement
+from .SearchCore import reconstruct_path, final_path_snapshot, collect_steps
+
+
+def iter_jps_steps(maze, start, end, snapshot_interval=1, stats=None):
+    """
+    Jump Point Search for grids with uniform cost.
+
+    Instead of pushing every neighbour, the search jumps in a straight line
+    until it reaches a cell where the optimal path may have to turn (a jump
+    point): the end cell, a cell with a forced neighbour, or, when moving
+    vertically, a cell from which a horizontal jump finds a jump point.
+    Only jump points go through the heap, which removes the symmetric
+    expansions A* does on open maps. The heuristic is the unweighted
+    Manhattan distance, so the found paths are optimal. Jumping relies on
+    every step costing the same, so terrain costs are ignored.
+
+    With 8-connectivity the search jumps diagonally as well (Harabor and
+    Grastien): a diagonal jump stops where a straight jump branching off
+    it finds a jump point, and the forced neighbours follow the corner
+    cutting policy of the Movement. Straight steps cost STRAIGHT_COST and
+    diagonal steps DIAGONAL_COST, and the heuristic is the octile distance.
+
+    Args:
+        maze (MazeGrid): The maze grid.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        snapshot_interval (int, optional): Number of expanded jump points per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the search counters and the
+            "search" and "path" phase times. Jump points count as expanded cells. Defaults to None.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time.
+        Snapshots mark the expanded jump points; the final path snapshot has
+        the cells between the jump points filled in.
+
+    Returns:
+        list: The found path (empty if none), as the StopIteration value.
+    """
+    original            = maze.cells[:]
+    frontier            = HeapFrontier()
+    parent_cells        = {}
+    best_costs          = {}
+    pending_snapshot    = []
+    step_count          = 0
+    found_path          = False
+    num_rows            = maze.rows
+    num_columns         = maze.cols
+    end_x, end_y        = end
+    start_index         = start[0] * num_columns + start[1]
+    end_index           = end_x * num_columns + end_y
+    movement            = current_movement()
+    open_sides          = movement.open_sides
+    cut_corners         = movement.cut_corners
+    # the cost of a straight or diagonal segment is the heuristic of its ends
+    heuristic           = movement.heuristic()
+    pushes              = 1
+    pops                = 0
+    peak_frontier       = 1
+    search_time         = 0.0
+    resumed             = perf_counter()
+
+    def walkable(x, y):
+        return (
+            0 <= x < num_rows and 0 <= y < num_columns
+            and original[x * num_columns + y] != WALL
+        )
+
+    def jump(x, y, direction_x, direction_y):
+        """
+        Moves from (x, y) in the given direction until a jump point is found.
+        Returns the jump point, or None when a wall or the border is hit.
+        """
+        while True:
+            x += direction_x
+            y += direction_y
+            if not walkable(x, y):
+                return None
+            if x == end_x and y == end_y:
+                return x, y
+
+            if direction_y != 0:
+                # moving horizontally: forced neighbour above or below
+                if (walkable(x - 1, y) and not walkable(x - 1, y - direction_y)) or \
+                   (walkable(x + 1, y) and not walkable(x + 1, y - direction_y)):
+                    return x, y
+            else:
+                # moving vertically: forced neighbour left or right
+                if (walkable(x, y - 1) and not walkable(x - direction_x, y - 1)) or \
+                   (walkable(x, y + 1) and not walkable(x - direction_x, y + 1)):
+                    return x, y
+                # a horizontal jump from here reaches a jump point
+                if jump(x, y, 0, 1) is not None or jump(x, y, 0, -1) is not None:
+                    return x, y
+
+    def can_step(x, y, direction_x, direction_y):
+        """
+        Whether one step from (x, y) in the given direction enters an open
+        cell past enough open cells beside it.
+        """
+        if not walkable(x + direction_x, y + direction_y):
+            return False
+        if direction_x and direction_y:
+            return walkable(x, y + direction_y) + walkable(x + direction_x, y) >= open_sides
+        return True
+
+    def diagonal_jump(x, y, direction_x, direction_y):
+        """
+        Moves from (x, y) in one of the 8 directions until a jump point is
+        found. The first step must be possible. Returns the jump point, or
+        None when a wall, a closed corner or the border is hit.
+        """
+        while True:
+            x += direction_x
+            y += direction_y
+            if x == end_x and y == end_y:
+                return x, y
+
+            if direction_x and direction_y:
+                # a wall beside the step just cut past hides a forced neighbour behind it
+                if cut_corners and (
+                        (walkable(x - direction_x, y + direction_y) and not walkable(x - direction_x, y)) or
+                        (walkable(x + direction_x, y - direction_y) and not walkable(x, y - direction_y))):
+                    return x, y
+                # a straight jump from here reaches a jump point
+                if (can_step(x, y, direction_x, 0) and diagonal_jump(x, y, direction_x, 0) is not None) or \
+                   (can_step(x, y, 0, direction_y) and diagonal_jump(x, y, 0, direction_y) is not None):
+                    return x, y
+            else:
+                for side_x, side_y in ((direction_y, direction_x), (-direction_y, -direction_x)):
+                    if cut_corners:
+                        # a wall beside the cell opens up ahead: forced diagonal neighbour
+                        if walkable(x + direction_x + side_x, y + direction_y + side_y) and \
+                           not walkable(x + side_x, y + side_y):
+                            return x, y
+                    # a wall behind the side cell: it can only be reached through this cell
+                    elif walkable(x + side_x, y + side_y) and \
+                         not walkable(x - direction_x + side_x, y - direction_y + side_y):
+                        return x, y
+
+            if not can_step(x, y, direction_x, direction_y):
+                return None
+
+    def diagonal_pruned_directions(x, y, parent):
+        """
+        Directions worth jumping in from (x, y) with 8-connectivity, given
+        the cell it was reached from.
+        """
+        if parent is None:
+            return movement.directions
+        parent_x, parent_y = divmod(parent, num_columns)
+        direction_x = (x > parent_x) - (x < parent_x)
+        direction_y = (y > parent_y) - (y < parent_y)
+        if direction_x and direction_y:
+            directions = [(direction_x, 0), (0, direction_y), (direction_x, direction_y)]
+            if cut_corners:
+                if not walkable(x - direction_x, y):
+                    directions.append((-direction_x, direction_y))
+                if not walkable(x, y - direction_y):
+                    directions.append((direction_x, -direction_y))
+            return directions
+
+        directions = [(direction_x, direction_y)]
+        for side_x, side_y in ((direction_y, direction_x), (-direction_y, -direction_x)):
+            if cut_corners:
+                if not walkable(x + side_x, y + side_y):
+                    directions.append((direction_x + side_x, direction_y + side_y))
+            elif walkable(x + side_x, y + side_y) and \
+                 not walkable(x - direction_x + side_x, y - direction_y + side_y):
+                directions.append((side_x, side_y))
+                directions.append((direction_x + side_x, direction_y + side_y))
+        return directions
+
+    def pruned_directions(x, y, parent):
+        """
+        Directions worth jumping in from (x, y) given the cell it was reached from.
+        """
+        if parent is None:
+            return DIRECTIONS
+        parent_x, parent_y = divmod(parent, num_columns)
+        if parent_y != y:
+            direction_y = 1 if y > parent_y else -1
+            return [(-1, 0), (1, 0), (0, direction_y)]
+        direction_x = 1 if x > parent_x else -1
+        return [(0, -1), (0, 1), (direction_x, 0)]
+
+    if movement.diagonal:
+        jump_from = diagonal_jump
+        directions_from = diagonal_pruned_directions
+    else:
+        jump_from = jump
+        directions_from = pruned_directions
+
+    # enqueue (f_cost, index, g_cost, parent)
+    frontier.push((heuristic(abs(start[0] - end_x), abs(start[1] - end_y)), start_index, 0, None))
+    best_costs[start_index] = 0
+
+    try:
+        while True:
+            try:
+                _, index, g_cost, parent = frontier.pop()
+            except IndexError:
+                break
+            pops += 1
+
+            if index in parent_cells:
+                continue
+            parent_cells[index] = parent
+            x, y = divmod(index, num_columns)
+
+            # mark the jump point as visited
+            if original[index] not in END_POINTS:
+                original[index] = VISITED
+                pending_snapshot.append((x, y, VISITED))
+            step_count += 1
+
+            # take snapshot at intervals
+            if step_count % snapshot_interval == 0 and pending_snapshot:
+                search_time += perf_counter() - resumed
+                yield pending_snapshot
+                resumed = perf_counter()
+                pending_snapshot = []
+
+            # reached the end
+            if index == end_index:
+                found_path = True
+                break
+
+            # jump towards the successors
+            for direction_x, direction_y in directions_from(x, y, parent):
+                if not can_step(x, y, direction_x, direction_y):
+                    continue
+                jump_point = jump_from(x, y, direction_x, direction_y)
+                if jump_point is None:
+                    continue
+
+                jump_x, jump_y = jump_point
+                jump_index = jump_x * num_columns + jump_y
+                if jump_index in parent_cells:
+                    continue
+
+                new_cost = g_cost + heuristic(abs(jump_x - x), abs(jump_y - y))
+                if best_costs.get(jump_index, new_cost + 1) <= new_cost:
+                    continue
+                best_costs[jump_index] = new_cost
+
+                h_cost = heuristic(abs(jump_x - end_x), abs(jump_y - end_y))
+                frontier.push((new_cost + h_cost, jump_index, new_cost, index))
+                pushes += 1
+
+            if pushes - pops > peak_frontier:
+                peak_frontier = pushes - pops
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = pops - step_count
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = len(parent_cells)
+            stats.add_phase_time("search", search_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    if not found_path:
+        return []
+
+    # fill in the straight and diagonal segments between consecutive jump points
+    resumed = perf_counter()
+    jump_points = reconstruct_path(parent_cells, start_index, end_index)
+    final_path = [start_index]
+    for previous, current in zip(jump_points, jump_points[1:]):
+        previous_x, previous_y = divmod(previous, num_columns)
+        current_x, current_y = divmod(current, num_columns)
+        step = (
+            ((current_x > previous_x) - (current_x < previous_x)) * num_columns
+            + (current_y > previous_y) - (current_y < previous_y)
+        )
+        final_path.extend(range(previous + step, current + step, step))
+
+    path_snapshot = final_path_snapshot(original, final_path, num_columns)
+    if stats is not None:
+        stats.add_phase_time("path", perf_counter() - resumed)
+    if path_snapshot:
+        yield path_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def jps_steps(maze, start, end, snapshot_interval=1, stats=None):
+    return collect_steps(iter_jps_steps(maze, start, end, snapshot_interval, stats))
@@ -0,0 +1,405 @@
+# Algorithms/JunctionGraph.py
+import heapq
+from array import array
+from time import perf_counter
+import numpy as np
+from Maze.MazeGrid import END_POINTS, WALL, VISITED
+from .Movement import Movement, current_movement
+from .SearchCore import collect_steps, final_path_snapshot
+
+INFINITY            = float("inf")
+
+
+class JunctionGraph:
+    """
+    The maze with every corridor contracted into a single weighted edge.
+
+    Nodes are the open cells that do not have exactly two open neighbours:
+    junctions and dead ends. Every other open cell lies on a corridor
+    between two nodes, and the corridor becomes one edge that costs the
+    terrain costs of its cells. A perfect maze from generate_random has a
+    node every few cells, so a search over the graph does a fraction of the
+    heap operations of a search over the cells. A ring of corridor cells
+    without a junction gets one of its cells promoted to a node.
+
+    The corridors are stored flat, like the snapshots in StepHistory: the
+    cells of all corridors in one array('I') and the offset each corridor
+    starts at in another. For every corridor cell two NumPy arrays hold its
+    corridor and its position along it.
+
+    With 8-connectivity the diagonal neighbours that the Movement allows
+    count as well, and every step costs the scaled terrain cost of the cell
+    it enters. Open areas then consist almost entirely of nodes.
+
+    The graph is built on first use and rebuilt after invalidate().
+    """
+    def __init__(self, grid, movement=None):
+        """
+        Args:
+            grid (MazeGrid): The maze grid. Edits to it must be followed by invalidate().
+            movement (Movement | None, optional): The steps paths may take. Defaults to
+                None, which moves in 4 directions.
+        """
+        self.grid = grid
+        self.movement = movement or Movement()
+        self.built = False
+        self.build_time = 0.0
+
+    def invalidate(self):
+        self.built = False
+
+    def build(self):
+        """
+        Finds the nodes and walks every corridor once. Does nothing if the
+        graph is already built.
+        """
+        if self.built:
+            return
+
+        started = perf_counter()
+        grid = self.grid
+        num_rows = grid.rows
+        num_columns = grid.cols
+
+        # for every cell its open neighbours, the first two of them in index arrays
+        open_cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(num_rows, num_columns) != WALL
+        indices = np.arange(len(grid), dtype=np.int32).reshape(num_rows, num_columns)
+        degree = np.zeros(open_cells.shape, dtype=np.int8)
+        first_neighbour = np.full(open_cells.shape, -1, dtype=np.int32)
+        second_neighbour = np.full(open_cells.shape, -1, dtype=np.int32)
+        for direction_x, direction_y in self.movement.directions:
+            rows = slice(max(0, -direction_x), num_rows - max(0, direction_x))
+            columns = slice(max(0, -direction_y), num_columns - max(0, direction_y))
+            neighbour_rows = slice(max(0, direction_x), num_rows - max(0, -direction_x))
+            neighbour_columns = slice(max(0, direction_y), num_columns - max(0, -direction_y))
+            reachable = open_cells[neighbour_rows, neighbour_columns]
+            if direction_x and direction_y:
+                # the cells beside a diagonal step share the row of one end and the column of the other
+                open_sides = (
+                    open_cells[rows, neighbour_columns].astype(np.int8)
+                    + open_cells[neighbour_rows, columns]
+                )
+                reachable = reachable & (open_sides >= self.movement.open_sides)
+            neighbour = np.full(open_cells.shape, -1, dtype=np.int32)
+            neighbour[rows, columns] = np.where(
+                reachable, indices[neighbour_rows, neighbour_columns], -1
+            )
+            found = neighbour >= 0
+            degree += found
+            second_neighbour[found & (first_neighbour >= 0)] = neighbour[found & (first_neighbour >= 0)]
+            first_neighbour[found & (first_neighbour < 0)] = neighbour[found & (first_neighbour < 0)]
+
+        # plain arrays index faster than NumPy ones in the corridor walk
+        self.is_node = bytearray((open_cells & (degree != 2)).tobytes())
+        self.first_neighbour = array("i", first_neighbour.tobytes())
+        self.second_neighbour = array("i", second_neighbour.tobytes())
+        self.corridor_cells = array("I")
+        self.corridor_offsets = array("I", [0])
+        self.corridor_ends = []
+        self.corridor_of = np.full(len(grid), -1, dtype=np.int32)
+        self.position_of = np.zeros(len(grid), dtype=np.int32)
+        # the two end cells of every walked corridor, so it is not walked again from its other end
+        self.walked_ends = bytearray(len(grid))
+        is_node = np.frombuffer(self.is_node, dtype=bool)
+        self.edges = {int(node): [] for node in np.flatnonzero(is_node)}
+
+        for node in list(self.edges):
+            self._walk_corridors(node)
+        self._index_corridors(0)
+
+        # rings of corridor cells without a junction: promote one cell and walk the ring
+        for node in np.flatnonzero(open_cells.ravel() & ~is_node & (self.corridor_of < 0)):
+            node = int(node)
+            if self.corridor_of[node] >= 0:
+                continue
+            first_corridor = len(self.corridor_ends)
+            self.is_node[node] = 1
+            self.edges[node] = []
+            self._walk_corridors(node)
+            self._index_corridors(first_corridor)
+
+        self.built = True
+        self.build_time += perf_counter() - started
+
+    def _open_neighbours(self, index):
+        cells = self.grid.cells
+        num_rows = self.grid.rows
+        num_columns = self.grid.cols
+        x, y = divmod(index, num_columns)
+        for direction_x, direction_y in self.movement.directions:
+            neighbour_x = x + direction_x
+            neighbour_y = y + direction_y
+            if not (0 <= neighbour_x < num_rows and 0 <= neighbour_y < num_columns):
+                continue
+            neighbour_index = neighbour_x * num_columns + neighbour_y
+            if cells[neighbour_index] == WALL:
+                continue
+            if direction_x and direction_y and not self.movement.allows(cells, x, y, direction_x, direction_y, num_columns):
+                continue
+            yield neighbour_index
+
+    def _walk_corridors(self, node):
+        """
+        Walks every corridor leaving the node that was not walked yet and
+        adds it as an edge in both directions.
+        """
+        is_node = self.is_node
+        first_neighbour = self.first_neighbour
+        second_neighbour = self.second_neighbour
+        for first in self._open_neighbours(node):
+            if is_node[first]:
+                # two adjacent nodes: an edge without corridor cells, added from the lower one
+                if first > node:
+                    self._add_corridor(node, first, [])
+                continue
+            if self.walked_ends[first]:
+                continue
+
+            # a corridor cell has two open neighbours: go on to the one it was not entered from
+            corridor = []
+            previous, current = node, first
+            while not is_node[current]:
+                corridor.append(current)
+                following = first_neighbour[current]
+                if following == previous:
+                    following = second_neighbour[current]
+                previous, current = current, following
+
+            self._add_corridor(node, current, corridor)
+
+    def _add_corridor(self, first_node, last_node, corridor):
+        corridor_id = len(self.corridor_ends)
+        costs = self.grid.costs
+        if self.movement.diagonal:
+            walked = [first_node] + corridor + [last_node]
+            forward_cost = self.movement.path_cost(self.grid, walked)
+            backward_cost = self.movement.path_cost(self.grid, walked[::-1])
+        else:
+            corridor_cost = sum(costs[index] for index in corridor)
+            forward_cost = corridor_cost + costs[last_node]
+            backward_cost = corridor_cost + costs[first_node]
+
+        if corridor:
+            self.walked_ends[corridor[0]] = self.walked_ends[corridor[-1]] = 1
+        self.corridor_cells.extend(corridor)
+        self.corridor_offsets.append(len(self.corridor_cells))
+        self.corridor_ends.append((first_node, last_node))
+
+        # entering the corridor costs its cells, arriving costs the far node
+        self.edges[first_node].append((last_node, forward_cost, corridor_id, True))
+        if last_node != first_node:
+            self.edges[last_node].append((first_node, backward_cost, corridor_id, False))
+
+    def _index_corridors(self, first_corridor):
+        """
+        Fills in the corridor and position of every cell of the corridors
+        from first_corridor on.
+        """
+        offsets = np.array(self.corridor_offsets[first_corridor:], dtype=np.int64)
+        lengths = np.diff(offsets)
+        corridor_cells = np.array(self.corridor_cells[offsets[0]:offsets[-1]], dtype=np.int64)
+        self.corridor_of[corridor_cells] = np.repeat(
+            np.arange(first_corridor, first_corridor + len(lengths), dtype=np.int32), lengths
+        )
+        self.position_of[corridor_cells] = np.arange(offsets[0], offsets[-1]) - np.repeat(offsets[:-1], lengths)
+
+    def corridor(self, corridor_id, forward=True):
+        """
+        Returns the cells of a corridor, from its first node to its last
+        node or the other way round, without the nodes.
+        """
+        cells = self.corridor_cells[self.corridor_offsets[corridor_id]:self.corridor_offsets[corridor_id + 1]]
+        return list(cells) if forward else list(reversed(cells))
+
+    def attachments(self, index):
+        """
+        Returns how a cell joins the graph: as (node, cells walked, cost) for
+        each way out of its corridor toward a node. A node joins itself.
+
+        The cells walked run from the cell (exclusive) to the node (inclusive),
+        and the cost is that of entering them.
+        """
+        if self.is_node[index]:
+            return [(index, [], 0)]
+
+        corridor_id = int(self.corridor_of[index])
+        position = int(self.position_of[index])
+        first_node, last_node = self.corridor_ends[corridor_id]
+        corridor = self.corridor(corridor_id)
+
+        backward = corridor[:position][::-1] + [first_node]
+        forward = corridor[position + 1:] + [last_node]
+        return [
+            (first_node, backward, self.movement.path_cost(self.grid, [index] + backward)),
+            (last_node, forward, self.movement.path_cost(self.grid, [index] + forward)),
+        ]
+
+
+def iter_junction_a_star_steps(maze, start, end, snapshot_interval=1, stats=None, junction_graph=None):
+    """
+    A* over a JunctionGraph, so the heap only ever holds junctions and dead
+    ends. The path is expanded back into cells at the end.
+
+    Snapshots still show cells: expanding a node marks it and every
+    corridor cell it relaxes as visited, in the order the search walks them.
+
+    Args:
+        maze (MazeGrid): The maze grid.
+        start (tuple[int, int]): The start cell.
+        end (tuple[int, int]): The end cell.
+        snapshot_interval (int, optional): Number of expanded nodes per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the counters of the node search
+            and the "build", "search" and "path" phase times. Defaults to None.
+        junction_graph (JunctionGraph | None, optional): The cached graph of the maze.
+            Defaults to None, which builds a new one for this solve.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time.
+
+    Returns:
+        list: The found path (empty if none), as the StopIteration value.
+    """
+    graph               = junction_graph if junction_graph is not None else JunctionGraph(maze, current_movement())
+    cells               = maze.cells
+    num_columns         = maze.cols
+    start_index         = start[0] * num_columns + start[1]
+    end_index           = end[0] * num_columns + end[1]
+    end_x, end_y        = end
+    movement            = graph.movement
+    heuristic           = movement.heuristic()
+    build_time          = graph.build_time
+    resumed             = perf_counter()
+    graph.build()
+
+    # a start or end inside a corridor joins the graph at the nodes on either side of it;
+    # these extra edges carry their cells in place of a corridor id
+    extra_edges = {}
+    if not graph.is_node[start_index]:
+        extra_edges[start_index] = [
+            (node, cost, None, cells_walked)
+            for node, cells_walked, cost in graph.attachments(start_index)
+        ]
+    if not graph.is_node[end_index]:
+        for node, cells_walked, _ in graph.attachments(end_index):
+            # walking from the node to the end enters the same cells the other way round
+            cells_walked = cells_walked[-2::-1] + [end_index]
+            cost = movement.path_cost(maze, [node] + cells_walked)
+            extra_edges.setdefault(node, []).append((end_index, cost, None, cells_walked))
+        if (start_index in extra_edges
+                and graph.corridor_of[start_index] == graph.corridor_of[end_index]):
+            # both on one corridor: walk straight along it
+            corridor = graph.corridor(int(graph.corridor_of[start_index]))
+            start_position = int(graph.position_of[start_index])
+            end_position = int(graph.position_of[end_index])
+            if start_position < end_position:
+                cells_walked = corridor[start_position + 1:end_position + 1]
+            else:
+                cells_walked = corridor[end_position:start_position][::-1]
+            cost = movement.path_cost(maze, [start_index] + cells_walked)
+            extra_edges[start_index].append((end_index, cost, None, cells_walked))
+
+    g_costs             = {start_index: 0}
+    links               = {start_index: None}
+    closed              = set()
+    reported            = bytearray(len(maze))
+    open_heap           = [(heuristic(abs(start[0] - end_x), abs(start[1] - end_y)), 0, start_index)]
+    pending_snapshot    = []
+    found_path          = False
+    step_count          = 0
+    pushes              = 1
+    pops                = 0
+    peak_frontier       = 1
+    search_time         = 0.0
+
+    def report(index):
+        if not reported[index]:
+            reported[index] = 1
+            if cells[index] not in END_POINTS:
+                pending_snapshot.append((index // num_columns, index % num_columns, VISITED))
+
+    try:
+        while open_heap:
+            _, cost, index = heapq.heappop(open_heap)
+            cost = -cost
+            pops += 1
+            if index in closed:
+                continue
+            closed.add(index)
+            report(index)
+            step_count += 1
+
+            if index == end_index:
+                found_path = True
+                break
+
+            edges = graph.edges.get(index, [])
+            if index in extra_edges:
+                edges = edges + extra_edges[index]
+
+            for neighbour, edge_cost, corridor_id, forward in edges:
+                new_cost = cost + edge_cost
+                if neighbour in closed or new_cost >= g_costs.get(neighbour, INFINITY):
+                    continue
+                g_costs[neighbour] = new_cost
+                links[neighbour] = (index, corridor_id, forward)
+                walked = forward if corridor_id is None else graph.corridor(corridor_id, forward)
+                for corridor_cell in walked:
+                    if corridor_cell != neighbour:
+                        report(corridor_cell)
+                neighbour_x, neighbour_y = divmod(neighbour, num_columns)
+                h_cost = heuristic(abs(neighbour_x - end_x), abs(neighbour_y - end_y))
+                heapq.heappush(open_heap, (new_cost + h_cost, -new_cost, neighbour))
+                pushes += 1
+
+            if pushes - pops > peak_frontier:
+                peak_frontier = pushes - pops
+
+            if step_count % snapshot_interval == 0 and pending_snapshot:
+                search_time += perf_counter() - resumed
+                yield pending_snapshot
+                resumed = perf_counter()
+                pending_snapshot = []
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            build_time = graph.build_time - build_time
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = pops - step_count
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = len(closed)
+            stats.add_phase_time("build", build_time)
+            stats.add_phase_time("search", search_time - build_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    if not found_path:
+        return []
+
+    # expand the node path back into cells
+    resumed = perf_counter()
+    segments = []
+    index = end_index
+    while links[index] is not None:
+        parent, corridor_id, forward = links[index]
+        walked = forward if corridor_id is None else graph.corridor(corridor_id, forward) + [index]
+        segments.append(walked)
+        index = parent
+    final_path = [start_index]
+    for walked in reversed(segments):
+        final_path.extend(walked)
+
+    path_snapshot = final_path_snapshot(cells, final_path, num_columns)
+    if stats is not None:
+        stats.add_phase_time("path", perf_counter() - resumed)
+    if path_snapshot:
+        yield path_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def junction_a_star_steps(maze, start, end, snapshot_interval=1, stats=None, junction_graph=None):
+    return collect_steps(iter_junction_a_star_steps(maze, start, end, snapshot_interval, stats, junction_graph))
@@ -0,0 +1,177 @@
+# Algorithms/LifelongPlanning.py
+import heapq
+from Maze.MazeGrid import WALL
+from .Movement import Movement
+
+INFINITY            = float("inf")
+
+
+class LifelongAStar:
+    """
+    Lifelong Planning A* (LPA*, Koenig & Likhachev) between a fixed start and end.
+
+    Every cell keeps its cost from the start (g) and a one-step lookahead of
+    that cost (rhs). A cell is consistent when the two agree; only
+    inconsistent cells are on the queue. After walls or terrain change, only
+    the changed cells and their neighbours are re-evaluated, and the search
+    repairs the part of the shortest-path tree that the change affects
+    instead of solving the maze from scratch.
+
+    The planner reads the grid it is given directly, so the caller edits the
+    grid and then reports the edited cells with update_cells(). Entering a
+    cell costs its terrain cost, scaled by the Movement like Dijkstra and
+    A*. Moving the start or the end needs a new planner.
+    """
+    def __init__(self, grid, start, end, movement=None):
+        """
+        Args:
+            grid (MazeGrid): The maze grid. Edits to it must be reported with update_cells().
+            start (tuple[int, int]): The start cell.
+            end (tuple[int, int]): The end cell.
+            movement (Movement | None, optional): The steps paths may take. Defaults to
+                None, which moves in 4 directions.
+        """
+        self.grid = grid
+        self.movement = movement or Movement()
+        self.heuristic = self.movement.heuristic()
+        self.start_index = grid.index(*start)
+        self.end_index = grid.index(*end)
+        self.end_x, self.end_y = end
+        self.g_costs = {}
+        self.rhs_costs = {self.start_index: 0}
+        self.queue = []
+        # the key each queued cell was pushed with; stale heap entries are skipped
+        self.queued_keys = {}
+        self.expanded = 0
+        self._push(self.start_index)
+
+    def _key(self, index):
+        x, y = divmod(index, self.grid.cols)
+        cost = min(self.g_costs.get(index, INFINITY), self.rhs_costs.get(index, INFINITY))
+        return cost + self.heuristic(abs(x - self.end_x), abs(y - self.end_y)), cost
+
+    def _push(self, index):
+        key = self._key(index)
+        self.queued_keys[index] = key
+        heapq.heappush(self.queue, (key, index))
+
+    def _neighbours(self, index):
+        """
+        Yields (neighbour, step scale) for the open cells one step away from
+        the given cell.
+        """
+        return self.movement.neighbours(self.grid, index)
+
+    def _update_vertex(self, index):
+        """
+        Recomputes the lookahead cost of a cell and queues it if it became inconsistent.
+        """
+        if index != self.start_index:
+            if self.grid.cells[index] == WALL:
+                rhs = INFINITY
+            else:
+                step_cost = self.grid.costs[index]
+                rhs = min(
+                    (self.g_costs.get(neighbour, INFINITY) + step_cost * step_scale
+                     for neighbour, step_scale in self._neighbours(index)),
+                    default=INFINITY
+                )
+            if rhs == INFINITY:
+                self.rhs_costs.pop(index, None)
+            else:
+                self.rhs_costs[index] = rhs
+
+        self.queued_keys.pop(index, None)
+        if self.g_costs.get(index, INFINITY) != self.rhs_costs.get(index, INFINITY):
+            self._push(index)
+
+    def _pop(self):
+        """
+        Removes stale entries from the top of the queue and returns the top
+        (key, index), or None when the queue is empty.
+        """
+        queue = self.queue
+        while queue:
+            key, index = queue[0]
+            if self.queued_keys.get(index) == key:
+                return key, index
+            heapq.heappop(queue)
+        return None
+
+    def compute_path(self):
+        """
+        Expands inconsistent cells until the end cell is consistent and no
+        queued cell can still improve it.
+
+        Returns:
+            list[tuple[int, int]]: The shortest path from start to end (inclusive),
+            or an empty list if the end cannot be reached.
+        """
+        g_costs = self.g_costs
+        end_index = self.end_index
+        while True:
+            top = self._pop()
+            if top is None:
+                break
+            key, index = top
+            end_rhs = self.rhs_costs.get(end_index, INFINITY)
+            if key >= self._key(end_index) and g_costs.get(end_index, INFINITY) == end_rhs:
+                break
+
+            heapq.heappop(self.queue)
+            del self.queued_keys[index]
+            self.expanded += 1
+
+            rhs = self.rhs_costs.get(index, INFINITY)
+            if g_costs.get(index, INFINITY) > rhs:
+                # overconsistent: the cell got cheaper, settle it
+                g_costs[index] = rhs
+            else:
+                # underconsistent: the cell got more expensive, reopen it
+                g_costs.pop(index, None)
+                self._update_vertex(index)
+            for neighbour, _ in self._neighbours(index):
+                self._update_vertex(neighbour)
+
+        return self.path()
+
+    def update_cells(self, changed_cells):
+        """
+        Reports cells whose wall state or terrain cost changed since the last
+        compute_path() call and repairs the path.
+
+        Args:
+            changed_cells (Iterable[tuple[int, int]]): The edited cells.
+
+        Returns:
+            list[tuple[int, int]]: The new shortest path, as from compute_path().
+        """
+        grid = self.grid
+        for row, col in changed_cells:
+            index = grid.index(row, col)
+            self._update_vertex(index)
+            for neighbour, _ in self._neighbours(index):
+                self._update_vertex(neighbour)
+        return self.compute_path()
+
+    def path(self):
+        """
+        Follows the cheapest predecessors from the end back to the start.
+        """
+        g_costs = self.g_costs
+        index = self.end_index
+        if g_costs.get(index, INFINITY) == INFINITY:
+            return []
+
+        costs = self.grid.costs
+        final_path = [index]
+        while index != self.start_index:
+            step_cost = costs[index]
+            index, _ = min(
+                self._neighbours(index),
+                key=lambda neighbour: g_costs.get(neighbour[0], INFINITY) + step_cost * neighbour[1]
+            )
+            final_path.append(index)
+
+        final_path.reverse()
+        return [self.grid.position(index) for index in final_path]
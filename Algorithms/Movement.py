@@ -0,0 +1,189 @@
+# Algorithms/Movement.py
+from array import array
+import numpy as np
+from Maze.MazeGrid import WALL, MAX_TERRAIN_COST
+
+DIRECTIONS          = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONAL_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+# With diagonal moves every step cost is scaled by one of these. 14 / 10 is
+# close to the square root of 2, and the costs and priorities stay integers.
+STRAIGHT_COST       = 10
+DIAGONAL_COST       = 14
+
+
+class Settings:
+    connectivity = 4
+    cut_corners = False
+
+def set_connectivity(connectivity: int):
+    if connectivity not in (4, 8):
+        raise ValueError(f"Connectivity must be 4 or 8, not {connectivity}")
+    Settings.connectivity = connectivity
+
+def set_corner_cutting(cut_corners: bool):
+    Settings.cut_corners = cut_corners
+
+def current_movement():
+    """
+    Returns the Movement of the current settings.
+    """
+    return Movement(Settings.connectivity, Settings.cut_corners)
+
+
+def manhattan(delta_x, delta_y):
+    return delta_x + delta_y
+
+def octile(delta_x, delta_y):
+    # the shorter side is walked diagonally, the rest straight
+    return STRAIGHT_COST * (delta_x + delta_y) + (DIAGONAL_COST - 2 * STRAIGHT_COST) * min(delta_x, delta_y)
+
+def chebyshev(delta_x, delta_y):
+    return max(delta_x, delta_y)
+
+
+class Movement:
+    """
+    The steps a search may take from a cell.
+
+    With 4-connectivity a step goes to one of the four cells that share a
+    side, and entering a cell costs its terrain cost. With 8-connectivity the
+    four diagonal cells can be entered too. A diagonal step passes between
+    the two cells beside it: without corner cutting both of them must be
+    open, with corner cutting one is enough. Squeezing between two walls
+    that touch at a corner is never allowed. Diagonal movement scales the
+    terrain cost of a straight step by STRAIGHT_COST and of a diagonal step
+    by DIAGONAL_COST, so the costs stay integers and bucket queues keep
+    working. Searches that count steps instead of costs count both kinds as one.
+
+    The moves are the same in both directions, so a search from the end
+    finds the same cells reachable as a search from the start.
+    """
+    def __init__(self, connectivity=4, cut_corners=False):
+        """
+        Args:
+            connectivity (int, optional): 4 or 8. Defaults to 4.
+            cut_corners (bool, optional): Whether a diagonal step may pass one wall. Defaults to False.
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"Connectivity must be 4 or 8, not {connectivity}")
+        self.connectivity = connectivity
+        self.diagonal = connectivity == 8
+        self.cut_corners = cut_corners and self.diagonal
+        self.diagonal_directions = DIAGONAL_DIRECTIONS if self.diagonal else []
+        self.directions = DIRECTIONS + self.diagonal_directions
+        # open cells needed of the two beside a diagonal step
+        self.open_sides = 1 if self.cut_corners else 2
+        self.straight_cost = STRAIGHT_COST if self.diagonal else 1
+        self.diagonal_cost = DIAGONAL_COST
+        # the cost of the most expensive single step, which sizes bucket queues
+        self.max_step_cost = MAX_TERRAIN_COST * (DIAGONAL_COST if self.diagonal else 1)
+
+    def key(self) -> tuple:
+        return (self.connectivity, self.cut_corners)
+
+    def __eq__(self, other):
+        return isinstance(other, Movement) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"Movement(connectivity={self.connectivity}, cut_corners={self.cut_corners})"
+
+    def heuristic(self, weighted=True):
+        """
+        Returns the admissible distance estimate for these moves as a
+        function of the row and column distances: Manhattan with 4 moves,
+        octile with 8 moves and terrain costs, and Chebyshev with 8 moves
+        when every step counts as one.
+        """
+        if not self.diagonal:
+            return manhattan
+        return octile if weighted else chebyshev
+
+    def step_scale(self, direction_x, direction_y):
+        return self.diagonal_cost if direction_x and direction_y else self.straight_cost
+
+    def moves(self, costs=None):
+        """
+        Returns the moves a search loops over, as (direction_x, direction_y,
+        step_costs) tuples, straight moves first. step_costs holds the scaled
+        cost of entering every cell with that move.
+
+        Args:
+            costs (bytearray | None, optional): The terrain costs of the grid. Defaults to
+                None, which gives None step costs for searches that count steps.
+        """
+        if costs is None:
+            return [(direction_x, direction_y, None) for direction_x, direction_y in self.directions]
+        if not self.diagonal:
+            return [(direction_x, direction_y, costs) for direction_x, direction_y in DIRECTIONS]
+
+        terrain = np.frombuffer(costs, dtype=np.uint8).astype(np.uint16)
+        straight_costs = array("H", (terrain * STRAIGHT_COST).tobytes())
+        diagonal_costs = array("H", (terrain * DIAGONAL_COST).tobytes())
+        return (
+            [(direction_x, direction_y, straight_costs) for direction_x, direction_y in DIRECTIONS] +
+            [(direction_x, direction_y, diagonal_costs) for direction_x, direction_y in DIAGONAL_DIRECTIONS]
+        )
+
+    def allows(self, cells, x, y, direction_x, direction_y, num_columns):
+        """
+        Returns whether the corners beside a step let it through. Straight
+        steps always pass; the bounds and the entered cell are not checked.
+        The solvers that walk the grid cell by cell all check diagonal steps
+        here, so the corner rule lives in one place.
+        """
+        if not (direction_x and direction_y):
+            return True
+        open_sides = (
+            (cells[x * num_columns + y + direction_y] != WALL)
+            + (cells[(x + direction_x) * num_columns + y] != WALL)
+        )
+        return open_sides >= self.open_sides
+
+    def neighbours(self, grid, index, cells=None):
+        """
+        Yields (neighbour index, step scale) for every open cell one step
+        away from the given cell.
+
+        Args:
+            grid (MazeGrid): The maze grid.
+            index (int): Flat index of the cell.
+            cells (bytearray | None, optional): Cell codes to read instead of grid.cells.
+                Defaults to None.
+        """
+        if cells is None:
+            cells = grid.cells
+        num_rows = grid.rows
+        num_columns = grid.cols
+        x, y = divmod(index, num_columns)
+        for direction_x, direction_y in self.directions:
+            neighbour_x = x + direction_x
+            neighbour_y = y + direction_y
+            if not (0 <= neighbour_x < num_rows and 0 <= neighbour_y < num_columns):
+                continue
+            neighbour_index = neighbour_x * num_columns + neighbour_y
+            if cells[neighbour_index] == WALL:
+                continue
+            if not self.allows(cells, x, y, direction_x, direction_y, num_columns):
+                continue
+            yield neighbour_index, self.step_scale(direction_x, direction_y)
+
+    def path_cost(self, grid, path):
+        """
+        Returns the cost of walking a path of flat indices: every entered
+        cell costs its terrain cost times the scale of the step into it.
+        """
+        costs = grid.costs
+        if not self.diagonal:
+            return sum(costs[index] for index in path[1:])
+        num_columns = grid.cols
+        return sum(
+            costs[index] * (
+                self.straight_cost
+                if index // num_columns == previous // num_columns or index % num_columns == previous % num_columns
+                else self.diagonal_cost
+            )
+            for previous, index in zip(path, path[1:])
+        )
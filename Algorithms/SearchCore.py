@@ -0,0 +1,302 @@
+# Algorithms/SearchCore.py
+from time import perf_counter
+from Maze.MazeGrid import END_POINTS, WALL, VISITED, PATH
+from .Movement import Movement
+
+
+class SearchPolicy:
+    """
+    Decides the order in which the engine expands cells by giving every
+    frontier entry a key. The base policy keys cells by their path cost,
+    which gives Dijkstra's algorithm on a heap or bucket frontier.
+
+    When `weighted` is set, the cost of a step is the terrain cost of the
+    entered cell, scaled for diagonal movement (see Movement); otherwise
+    every step costs 1.
+    """
+    weighted = True
+
+    def priority(self, cost, x, y):
+        return cost
+
+
+class UnorderedPolicy(SearchPolicy):
+    """
+    Policy for frontiers that ignore the key (FIFO and LIFO). Counts steps
+    and ignores terrain.
+    """
+    weighted = False
+
+    def priority(self, cost, x, y):
+        return 0
+
+
+class HeuristicPolicy(SearchPolicy):
+    """
+    A* policy: path cost plus the weighted distance to the end cell, Manhattan
+    with 4-connectivity and octile with 8 (see Movement.heuristic). Every
+    step costs at least its unscaled cost, so the distance stays admissible
+    on terrain.
+    """
+    def __init__(self, end, weight=1.0, movement=None):
+        self.end_x, self.end_y = end
+        self.weight = weight
+        self.heuristic = (movement or Movement()).heuristic(self.weighted)
+
+    def priority(self, cost, x, y):
+        h_cost = self.heuristic(abs(x - self.end_x), abs(y - self.end_y))
+        return cost + h_cost * self.weight
+
+
+class NearestGoalHeuristicPolicy(SearchPolicy):
+    """
+    A* policy for several end cells: path cost plus the weighted distance to
+    the closest of them, which stays admissible for reaching whichever end
+    is nearest. Costs O(ends) per key.
+    """
+    def __init__(self, goals, weight=1.0, movement=None):
+        self.goals = list(goals)
+        self.weight = weight
+        self.heuristic = (movement or Movement()).heuristic(self.weighted)
+
+    def priority(self, cost, x, y):
+        heuristic = self.heuristic
+        h_cost = min(heuristic(abs(x - goal_x), abs(y - goal_y)) for goal_x, goal_y in self.goals)
+        return cost + h_cost * self.weight
+
+
+def reconstruct_path(parent_cells, start, end):
+    """
+    Walk the parent table back from end to start.
+
+    Args:
+        parent_cells (dict): Maps each reached cell index to the index it was reached from.
+        start (int): Flat index of the start cell.
+        end (int): Flat index of the end cell.
+
+    Returns:
+        list[int]: The cell indices from start to end (inclusive).
+    """
+    final_path = []
+    node = end
+    while node != start:
+        final_path.append(node)
+        node = parent_cells[node]
+
+    final_path.append(start)
+    final_path.reverse()
+    return final_path
+
+
+def final_path_snapshot(cells, final_path, num_columns):
+    """
+    Build the snapshot that marks the found path, skipping start and end cells.
+    """
+    return [
+        (index // num_columns, index % num_columns, PATH)
+        for index in final_path
+        if cells[index] not in END_POINTS
+    ]
+
+
+def collect_steps(step_generator):
+    """
+    Pulls every snapshot from a step generator.
+
+    Args:
+        step_generator (Generator): Yields snapshot batches and returns the found path.
+
+    Returns:
+        tuple[list, list]: The found path and the list of snapshots.
+    """
+    snapshots = []
+    while True:
+        try:
+            snapshots.append(next(step_generator))
+        except StopIteration as stop:
+            return stop.value, snapshots
+
+
+def iter_search_steps(grid, start, end, frontier, policy, snapshot_interval=1, stats=None, movement=None):
+    """
+    Shared search engine used by the frontier based algorithms: one start
+    and one end cell. See iter_multi_search_steps.
+    """
+    return iter_multi_search_steps(grid, [start], [end], frontier, policy, snapshot_interval, stats, movement)
+
+
+def iter_multi_search_steps(grid, sources, goals, frontier, policy, snapshot_interval=1, stats=None, movement=None):
+    """
+    Shared search engine used by the frontier based algorithms.
+
+    The loop (bounds check, wall check, visited check, snapshot batching and
+    the final path snapshot) is the same for every algorithm; only the
+    frontier strategy and the policy that keys the entries change. Instead of
+    carrying the whole path with every frontier entry, each entry only
+    remembers the cell it was reached from. The parent table is filled when a
+    cell is settled, so it doubles as the visited set and the final path is
+    rebuilt once when the end is reached.
+
+    Every source starts on the frontier at cost 0 and the search stops at
+    the first goal it settles, so with several of each it finds the path
+    from the nearest source to the nearest goal in a single sweep.
+
+    Args:
+        grid (MazeGrid): The maze grid.
+        sources (list[tuple[int, int]]): The start cells.
+        goals (list[tuple[int, int]]): The end cells.
+        frontier: A frontier from Algorithms.Frontiers (FIFO, stack or heap).
+        policy (SearchPolicy): Gives the frontier key of a cell from its path cost
+            and decides whether terrain costs apply.
+        snapshot_interval (int, optional): Number of visited cells per snapshot. Defaults to 1.
+        stats (SearchStats | None, optional): Receives the search counters and the
+            "search" and "path" phase times. Defaults to None.
+        movement (Movement | None, optional): The steps the search may take and
+            how their costs scale. Defaults to None, which moves in 4 directions.
+
+    Yields:
+        list[tuple[int, int, int]]: The snapshots, one batch at a time. The
+        search only runs as far as the caller pulls.
+
+    Returns:
+        list: The found path (empty if none), as the StopIteration value.
+    """
+    original            = grid.cells[:]
+    parent_cells        = {}
+    pending_snapshot    = []
+    step_count          = 0
+    found_path          = False
+    num_rows            = grid.rows
+    num_columns         = grid.cols
+    goal_indices        = {x * num_columns + y for x, y in goals}
+    end_index           = None
+    movement            = movement or Movement()
+    moves               = movement.moves(grid.costs if policy.weighted else None)
+    allows              = movement.allows
+    push                = frontier.push
+    pop                 = frontier.pop
+    priority            = policy.priority
+    pushes              = len(sources)
+    pops                = 0
+    peak_frontier       = len(sources)
+    search_time         = 0.0
+    resumed             = perf_counter()
+
+    # enqueue (priority, index, cost, parent)
+    for start in sources:
+        push((priority(0, start[0], start[1]), start[0] * num_columns + start[1], 0, None))
+
+    try:
+        while True:
+            try:
+                _, index, cost, parent = pop()
+            except IndexError:
+                break
+            pops += 1
+
+            if index in parent_cells:
+                continue
+            parent_cells[index] = parent
+            x, y = divmod(index, num_columns)
+
+            # mark as visited
+            if original[index] not in END_POINTS:
+                original[index] = VISITED
+                pending_snapshot.append((x, y, VISITED))
+            step_count += 1
+
+            # take snapshot at intervals
+            if step_count % snapshot_interval == 0 and pending_snapshot:
+                search_time += perf_counter() - resumed
+                yield pending_snapshot
+                resumed = perf_counter()
+                pending_snapshot = []
+
+            # reached the end
+            if index in goal_indices:
+                end_index = index
+                found_path = True
+                break
+
+            # explore neighbours
+            for direction_x, direction_y, step_costs in moves:
+                neighbour_x = x + direction_x
+                neighbour_y = y + direction_y
+
+                out_of_bounds = (
+                    neighbour_x < 0 or neighbour_x >= num_rows or
+                    neighbour_y < 0 or neighbour_y >= num_columns
+                )
+                if out_of_bounds:
+                    continue
+                neighbour_index = neighbour_x * num_columns + neighbour_y
+                if original[neighbour_index] == WALL:
+                    continue
+                if neighbour_index in parent_cells:
+                    continue
+                if direction_x and direction_y and not allows(original, x, y, direction_x, direction_y, num_columns):
+                    continue
+
+                new_cost = cost + (step_costs[neighbour_index] if step_costs else 1)
+                push((
+                    priority(new_cost, neighbour_x, neighbour_y),
+                    neighbour_index, new_cost, index
+                ))
+                pushes += 1
+
+            # every push adds an entry and every pop removes one
+            if pushes - pops > peak_frontier:
+                peak_frontier = pushes - pops
+        search_time += perf_counter() - resumed
+    finally:
+        if stats is not None:
+            stats.expanded = step_count
+            stats.pushes = pushes
+            stats.pops = pops
+            stats.duplicate_pops = pops - step_count
+            stats.peak_frontier = peak_frontier
+            stats.peak_visited = len(parent_cells)
+            stats.add_phase_time("search", search_time)
+
+    # yield remaining snapshots
+    if pending_snapshot:
+        yield pending_snapshot
+
+    if not found_path:
+        return []
+
+    # record the final path
+    resumed = perf_counter()
+    final_path = []
+    node = end_index
+    while node is not None:
+        final_path.append(node)
+        node = parent_cells[node]
+    final_path.reverse()
+    path_snapshot = final_path_snapshot(original, final_path, num_columns)
+    if stats is not None:
+        stats.add_phase_time("path", perf_counter() - resumed)
+    if path_snapshot:
+        yield path_snapshot
+
+    return [divmod(index, num_columns) for index in final_path]
+
+
+def multi_search_steps(grid, sources, goals, frontier, policy, snapshot_interval=1, stats=None, movement=None):
+    """
+    Runs iter_multi_search_steps to the end.
+
+    Returns:
+        tuple[list, list]: The found path (empty if none) and the snapshots.
+    """
+    return collect_steps(iter_multi_search_steps(grid, sources, goals, frontier, policy, snapshot_interval, stats, movement))
+
+
+def search_steps(grid, start, end, frontier, policy, snapshot_interval=1, stats=None, movement=None):
+    """
+    Runs iter_search_steps to the end.
+
+    Returns:
+        tuple[list, list]: The found path (empty if none) and the snapshots.
+    """
+    return collect_steps(iter_search_steps(grid, start, end, frontier, policy, snapshot_interval, stats, movement))
@@ -0,0 +1,48 @@
+# Algorithms/SearchStats.py
+
+
+class SearchStats:
+    """
+    Counters a solver collects during one solve.
+
+    The solvers count in local variables and write the totals here when the
+    search ends or is abandoned, so collecting them costs next to nothing.
+    Phase times only include the time the solver itself ran, not the time it
+    spent suspended between two pulled snapshot batches.
+
+    Attributes:
+        expanded (int): Cells taken off the frontier and expanded.
+        pushes (int): Entries pushed onto the frontier.
+        pops (int): Entries popped from the frontier, including duplicates.
+        duplicate_pops (int): Popped entries skipped because their cell was
+            already settled (the cost of lazy deletion).
+        peak_frontier (int): Largest number of entries on the frontier at once.
+        peak_visited (int): Largest number of cells in the visited set.
+        phase_times (dict[str, float]): Seconds spent in each phase of the solve.
+    """
+    def __init__(self):
+        self.expanded = 0
+        self.pushes = 0
+        self.pops = 0
+        self.duplicate_pops = 0
+        self.peak_frontier = 0
+        self.peak_visited = 0
+        self.phase_times = {}
+
+    def add_phase_time(self, phase: str, seconds: float):
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + seconds
+
+    @property
+    def wall_time(self) -> float:
+        return sum(self.phase_times.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "expanded": self.expanded,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "duplicate_pops": self.duplicate_pops,
+            "peak_frontier": self.peak_frontier,
+            "peak_visited": self.peak_visited,
+            **{f"{phase}_time_s": seconds for phase, seconds in self.phase_times.items()},
+        }
@@ -0,0 +1,153 @@
+import csv
+import json
+import time
+import tracemalloc
+from multiprocessing import Pool
+from .MazeGenerator import MazeGenerator
+from .MazeGrid import START, END, VISITED
+from .MazeSolver import MazeSolver
+
+MAZE_KINDS          = ("random", "empty")
+RESULT_FIELDS       = [
+    "algorithm", "maze", "size", "seed", "found", "path_length",
+    "expanded", "wall_time_s", "peak_memory_bytes",
+    "pushes", "pops", "duplicate_pops", "peak_frontier", "peak_visited",
+]
+
+
+def generate_maze(kind, size, seed):
+    """
+    Generates the maze of one batch run. Random mazes are seeded, so the same
+    (kind, size, seed) always gives the same maze in any worker process.
+    """
+    generator = MazeGenerator()
+    if kind == "empty":
+        return generator.generate_empty_maze(size, size)
+    return generator.generate_random(size, size, seed)
+
+
+def solve_run(task):
+    """
+    Generates a maze, solves it and measures the solve.
+
+    The solve is timed on its own. When memory is measured, it is repeated
+    under tracemalloc, because tracing slows the solve down too much to time
+    both at once.
+
+    Args:
+        task (tuple): (algorithm, maze kind, size, seed, measure memory).
+
+    Returns:
+        dict: One result row with the fields in RESULT_FIELDS.
+    """
+    algorithm, kind, size, seed, measure_memory = task
+    maze = generate_maze(kind, size, seed)
+    start, end = maze.find(START), maze.find(END)
+    solver = MazeSolver(algorithm)
+
+    started = time.perf_counter()
+    final_path, snapshots, stats = solver.solve_with_stats(maze, start, end)
+    wall_time = time.perf_counter() - started
+
+    peak_memory = None
+    if measure_memory:
+        del snapshots
+        tracemalloc.start()
+        final_path, snapshots = solver.solve(maze, start, end)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "algorithm": algorithm,
+        "maze": kind,
+        "size": maze.rows,
+        "seed": seed,
+        "found": bool(final_path),
+        "path_length": len(final_path),
+        # anytime solvers mark cells visited again when a better path replaces theirs
+        "expanded": len({(x, y) for batch in snapshots for x, y, code in batch if code == VISITED}),
+        "wall_time_s": round(wall_time, 6),
+        "peak_memory_bytes": peak_memory,
+        "pushes": stats.pushes,
+        "pops": stats.pops,
+        "duplicate_pops": stats.duplicate_pops,
+        "peak_frontier": stats.peak_frontier,
+        "peak_visited": stats.peak_visited,
+    }
+
+
+class CsvResultWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=RESULT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, result):
+        self.writer.writerow(result)
+        self.stream.flush()
+
+
+class JsonLinesResultWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
+
+
+RESULT_WRITERS      = {
+    "csv": CsvResultWriter,
+    "jsonl": JsonLinesResultWriter,
+}
+
+
+def batch_tasks(algorithms, kinds, sizes, seeds, measure_memory=True):
+    """
+    Yields one task per combination. Empty mazes do not depend on the seed,
+    so they are solved once per size.
+    """
+    for kind in kinds:
+        for size in sizes:
+            for seed in (seeds if kind == "random" else seeds[:1]):
+                for algorithm in algorithms:
+                    yield algorithm, kind, size, seed, measure_memory
+
+
+def configure_worker(heuristic_weight=None, movement=None, time_budget=None):
+    """
+    Applies the solver settings of a batch in a worker process.
+    """
+    if heuristic_weight is not None:
+        MazeSolver.set_heuristic_weight(heuristic_weight)
+    if movement is not None:
+        MazeSolver.set_movement(*movement)
+    if time_budget is not None:
+        MazeSolver.set_time_budget(time_budget)
+
+
+def run_batch(tasks, writer, workers=None, heuristic_weight=None, movement=None):
+    """
+    Solves the tasks across a process pool and writes every result as soon
+    as it is ready. Each worker generates its own mazes, so only the small
+    task tuples and result rows cross process boundaries and the batch scales
+    with the number of cores.
+
+    Args:
+        tasks (Iterable[tuple]): Tasks from batch_tasks.
+        writer (CsvResultWriter | JsonLinesResultWriter): Receives the result rows.
+        workers (int | None, optional): Number of worker processes. Defaults to the CPU count.
+        heuristic_weight (float | None, optional): Heuristic weight for the A* variants.
+            Defaults to None, which keeps the solver default.
+        movement (tuple[int, bool] | None, optional): Connectivity and corner cutting of
+            every algorithm. Defaults to None, which moves in 4 directions.
+
+    Returns:
+        int: The number of solved tasks.
+    """
+    solved = 0
+    with Pool(workers, initializer=configure_worker, initargs=(heuristic_weight, movement)) as pool:
+        for result in pool.imap_unordered(solve_run, tasks):
+            writer.write(result)
+            solved += 1
+    return solved
@@ -3,14 +3,25 @@ import sys
 from pygame.locals import QUIT
 from .MazeGenerator import MazeGenerator
 from .MazeModel import MazeModel
+from .MazeGrid import EMPTY, VISITED
 from .MazeSolver import MazeSolver
+from .StepStream import StepStream
+from .SolveCache import SolveCache
 from .MazeRenderer import MazeRenderer
 from .MazeDrawing import MazeDrawing
+from .MazeRace import MazeRace
 from UserInterface.UserInterface import UserInterface
 from UserInterface.Cursor import Cursor
 
 COLOR_WINDOW_BG = (224, 224, 224)
 SIZE_OF_MAZE = 100
+HEURISTIC_ALGORITHMS = ("A*", "Bidirectional A*", "Anytime A*")
+ANYTIME_ALGORITHMS = ("Anytime A*",)
+# Connectivity and corner cutting of every movement option
+MOVEMENTS = {"4-way": (4, False), "8-way": (8, False), "8-way cut": (8, True)}
+# Memory for solves kept to replay, and a directory to also keep them between runs (None: memory only).
+SOLVE_CACHE_BYTES = 256 * 1024 * 1024
+SOLVE_CACHE_DIRECTORY = None
 
 class FPSCounter:
     def __init__(self, clock, update_rate_fps=10):
@@ -27,7 +38,7 @@ class FPSCounter:
 
 
 class MazeApp:
-    def __init__(self, screen_width=950, screen_height=650):
+    def __init__(self, screen_width=1150, screen_height=650):
         pygame.init()
         self.screen = pygame.display.set_mode(
             (screen_width, screen_height),
@@ -39,6 +50,7 @@ class MazeApp:
         self.canvas_width = 650
         self.canvas_height = 650
         self.control_panel_width = 250
+        self.stats_panel_width = 200
         self.last_scrubbed_step = 0
         self.target_fps = 1000
 
@@ -46,23 +58,32 @@ class MazeApp:
         self.max_speed = 20
         self.step_counter = 0
         self.final_step_count = 0
+        self.solve_progress = 0
 
         self.heuristic_weight = 2
         self.heuristic_weight_min = 1
         self.heuristic_weight_max = 4
         MazeSolver.set_heuristic_weight(self.heuristic_weight)
 
+        self.time_budget = 1.0
+        self.time_budget_min = 0.1
+        self.time_budget_max = 5.0
+        MazeSolver.set_time_budget(self.time_budget)
+
         self.cursor = Cursor()
         self.maze_generator = MazeGenerator()
-        self.maze_model = MazeModel(self.maze_generator, SIZE_OF_MAZE, SIZE_OF_MAZE)
+        self.solve_cache = SolveCache(SOLVE_CACHE_BYTES, SOLVE_CACHE_DIRECTORY)
+        self.maze_model = MazeModel(self.maze_generator, SIZE_OF_MAZE, SIZE_OF_MAZE, solve_cache=self.solve_cache)
         self.maze_renderer = MazeRenderer(self.maze_model, self.canvas_width, self.canvas_height)
         self.maze_drawing = MazeDrawing(self.maze_renderer, self.cursor)
-        self.UserInterface = UserInterface(self,self.canvas_width, self.control_panel_width, screen_height)
+        self.UserInterface = UserInterface(self,self.canvas_width, self.control_panel_width, screen_height, self.stats_panel_width)
 
 
         self.is_playing = False
         self.drawing_state = "disabled"
         self.accumulated_time = 0
+        # the race shown instead of the single solve, if any
+        self.race = None
 
     def solver_factory(self, algorithm_name):
         return MazeSolver(algorithm=algorithm_name)
@@ -74,7 +95,21 @@ class MazeApp:
         self.heuristic_weight = value
         MazeSolver.set_heuristic_weight(self.heuristic_weight)
         return
+
+    def time_budget_changed(self, value):
+        if self.maze_model.steps:
+            self.stop()
+
+        self.time_budget = value
+        MazeSolver.set_time_budget(self.time_budget)
     
+    def movement_changed(self, value: str):
+        self.stop()
+        MazeSolver.set_movement(*MOVEMENTS[value])
+        self.maze_model.movement_changed()
+        # the previewed path may no longer be the shortest one
+        self.maze_renderer.show_path_preview([])
+
     def run(self):
         self.stop()
         self.accumulated_time = 0
@@ -95,14 +130,19 @@ class MazeApp:
             for event in pygame.event.get():
                 if event.type == QUIT:
                     self.quit()
-                self.maze_drawing.handle_event(event)
+                if self.race is None:
+                    self.maze_drawing.handle_event(event)
                 self.UserInterface.handle_event(event)
 
             # --- Play Simulation ---
-            if self.is_playing and self.maze_model.steps:
+            if self.race is not None:
+                self.play_race(delta_time, time_per_cell_at_1x)
+            elif self.is_playing and self.maze_model.steps:
                 self.accumulated_time += delta_time
                 time_per_step = time_per_cell_at_1x / self.speed
-                
+
+                # pull only the batches this frame can show
+                self.maze_model.steps.fetch(self.maze_model.current_step + 101)
                 steps_to_apply = min(
                     int(self.accumulated_time / time_per_step),
                     len(self.maze_model.steps) - self.maze_model.current_step - 1,
@@ -120,15 +160,24 @@ class MazeApp:
                         next_step = self.maze_model.steps[self.maze_model.current_step]
                         for (x, y, value) in next_step:
                             self.maze_renderer.update_maze_surface_cell(x, y, value)
-                else:
+                elif self.maze_model.steps.finished:
                     self.final_step_count = self.maze_model.get_final_path_length()
 
             # --- Draw Frame ---
             self.screen.fill(COLOR_WINDOW_BG)
-            self.maze_renderer.draw(self.screen)
+            if self.race is not None:
+                self.race.draw(self.screen)
+            else:
+                self.maze_renderer.draw(self.screen)
             self.UserInterface.draw(self.screen)
 
-            if self.maze_model.steps:
+            if self.race is not None and not self.race.solving:
+                self.UserInterface.set_timeline(
+                    min=0,
+                    max=self.race.step_count - 1,
+                    value=self.race.current_step
+                )
+            elif self.maze_model.steps:
                 self.UserInterface.set_timeline(
                     min=0,
                     max=len(self.maze_model.steps) - 1,
@@ -139,7 +188,53 @@ class MazeApp:
             self.clock.tick(self.target_fps)  
             fps_counter.update(current_time, loop_start_time)
 
+    def play_race(self, delta_time: int, time_per_cell_at_1x: int):
+        """
+        Takes the race solves that finished and, once all are in, advances
+        every lane by the steps this frame can show.
+        """
+        self.race.poll()
+        if not self.is_playing or self.race.solving:
+            return
+        self.accumulated_time += delta_time
+        time_per_step = time_per_cell_at_1x / self.speed
+        steps_to_apply = min(
+            int(self.accumulated_time / time_per_step),
+            self.race.step_count - self.race.current_step - 1,
+            100
+        )
+        if steps_to_apply > 0:
+            self.accumulated_time -= steps_to_apply * time_per_step
+            self.race.display_step(self.race.current_step + steps_to_apply)
+            self.step_counter = self.race.current_step + 1
+
+    def start_race(self):
+        """
+        Solves the maze with every algorithm at once in worker processes and
+        plays the solves side by side, each in a viewport of its own.
+        """
+        self.stop()
+        self.maze_drawing.initialize_surface()
+        self.maze_drawing.current_draw_action = self.maze_drawing.draw_actions["disabled"]
+        self.maze_renderer.show_path_preview([])
+
+        sources, goals = self.maze_model.get_sources_goals()
+        if not sources or not goals:
+            print("Start or end position not found!")
+            return
+        if not self.maze_model.get_connectivity().any_connected(sources, goals):
+            print("End is not reachable from the start!")
+            return
+
+        self.race = MazeRace(
+            self.maze_model, list(MazeSolver().algorithms), self.canvas_width, self.canvas_height
+        )
+        self.is_playing = True
+        self.accumulated_time = 0
+
     def quit(self):
+        if self.race is not None:
+            self.race.close()
         pygame.quit()
         sys.exit()
 
@@ -147,32 +242,49 @@ class MazeApp:
         self.maze_drawing.initialize_surface()
         self.maze_drawing.current_draw_action = self.maze_drawing.draw_actions["disabled"]
 
-        if not self.maze_model.steps:
+        if self.race is None and not self.maze_model.steps:
             algorithm_name = self.UserInterface.dropdown.options[
                 self.UserInterface.dropdown.selected
             ]
-            self.maze_model.run_algorithm(self.solver_factory, algorithm_name)
+            self.solve_progress = 0
+            self.maze_model.run_algorithm(
+                self.solver_factory, algorithm_name,
+                background=True, on_progress=self.on_solve_progress
+            )
         if not self.is_playing:
             self.is_playing = True
             self.accumulated_time = 0
 
+    def on_solve_progress(self, step_count: int):
+        # called from the solver thread, so only record the count here
+        self.solve_progress = step_count
+
     def pause(self):
         self.is_playing = False
 
     def stop(self):
+        if self.race is not None:
+            self.race.close()
+            self.race = None
         self.is_playing = False
         self.step_counter = 0
         self.final_step_count = 0
         self.maze_model.current_step = -1
-        self.maze_model.steps = []
+        self.maze_model.steps.clear()
+        self.maze_model.steps = StepStream()
         self.UserInterface.reset_timeline()
         self.maze_model.reset_maze_to_original()
-        self.maze_renderer.update_maze_surface()
+        self.maze_renderer.refresh_maze_surface()
         
 
     def next_step(self):
         self.pause()
-        if self.maze_model.current_step < len(self.maze_model.steps) - 1:
+        if self.race is not None:
+            if not self.race.solving:
+                self.race.display_step(self.race.current_step + 1)
+                self.step_counter = self.race.current_step + 1
+            return
+        if self.maze_model.current_step < self.maze_model.steps.fetch(self.maze_model.current_step + 2) - 1:
             self.step_counter += 1
             self.maze_model.display_step(self.maze_model.current_step + 1)
             next_step = self.maze_model.steps[self.maze_model.current_step]
@@ -181,15 +293,17 @@ class MazeApp:
 
     def prev_step(self):
         self.pause()
+        if self.race is not None:
+            if not self.race.solving:
+                self.race.display_step(self.race.current_step - 1)
+                self.step_counter = self.race.current_step + 1
+            return
         if self.maze_model.current_step >= 0:
             self.step_counter -= 1
             next_step = self.maze_model.steps[self.maze_model.current_step]
             self.maze_model.display_step(self.maze_model.current_step - 1)
-            for (x, y, value) in next_step:
-                if value == 'V':
-                    self.maze_renderer.update_maze_surface_cell(x, y, 0)
-                else:
-                    self.maze_renderer.update_maze_surface_cell(x, y, 'V')
+            for (x, y, _) in next_step:
+                self.maze_renderer.update_maze_surface_cell(x, y, self.maze_model.maze[x, y])
         else:
             self.step_counter = 0
 
@@ -197,12 +311,13 @@ class MazeApp:
         self.speed = value
 
     def on_algorithm_changed(self, value: str):
-        if value == "A*":
+        if value in HEURISTIC_ALGORITHMS:
             self.UserInterface.heuristic_weight_header.enabled = True
             self.UserInterface.heuristic_weight_slider.enabled = True
         else:
             self.UserInterface.heuristic_weight_header.enabled = False
             self.UserInterface.heuristic_weight_slider.enabled = False
+        self.UserInterface.show_time_budget(value in ANYTIME_ALGORITHMS)
 
         if value:
             self.stop()
@@ -211,21 +326,25 @@ class MazeApp:
         """
         Updates the maze to reflect the state at the selected step in the timeline.
         """
+        if self.race is not None:
+            if not self.race.solving:
+                self.race.jump_to_step(int(round(slider_value)))
+                self.step_counter = self.race.current_step + 1
+                self.pause()
+            return
         if not self.maze_model.steps:
             self.play()
-            self.final_step_count = self.maze_model.get_final_path_length()
 
-        new_step = max(0, min(int(round(slider_value)), len(self.maze_model.steps) - 1))
-        previous_step = self.maze_model.last_step
+        # only solve as far as the slider reaches
+        available_steps = self.maze_model.steps.fetch(int(round(slider_value)) + 1)
+        new_step = max(0, min(int(round(slider_value)), available_steps - 1))
 
-        if new_step > previous_step:
-            for _ in range(previous_step, new_step):
-                self.next_step()
+        # one vectorised pass instead of stepping through every step in between
+        self.maze_model.jump_to_step(new_step)
+        self.maze_renderer.update_maze_surface()
+        self.step_counter = self.maze_model.current_step + 1
 
-        elif new_step < previous_step:
-            for _ in range(new_step, previous_step):
-                self.prev_step()
-        
+        self.final_step_count = self.maze_model.get_final_path_length()
         self.pause()
 
     def _apply_steps_in_range(self, start: int, end: int):
@@ -235,7 +354,7 @@ class MazeApp:
         for step_index in range(start, end + 1):
             updates = self.maze_model.steps[step_index]
             for x, y, value in updates:
-                self.maze_model.maze[x][y] = value
+                self.maze_model.maze[x, y] = value
             self.maze_renderer.incremental_update_overlay(updates)
 
 
@@ -247,7 +366,7 @@ class MazeApp:
         for i in range(start_step, end_step + 1):
             updates = self.maze_model.steps[i]
             for x, y, value in updates:
-                self.maze_model.maze[x][y] = value
+                self.maze_model.maze[x, y] = value
             
             self.maze_renderer.incremental_update_overlay(updates)
 
@@ -258,11 +377,11 @@ class MazeApp:
         self.maze_model.display_step(step_index)
         for i in range(step_index, self.last_scrubbed_step + 1):
             updates = self.maze_model.steps[i].copy()
-            if updates[0][2] == 'V':
-                updates[0] = (updates[0][0], updates[0][1], 0)
+            if updates[0][2] == VISITED:
+                updates[0] = (updates[0][0], updates[0][1], EMPTY)
             else:
                 for j in range(len(updates)):
-                    updates[j] = (updates[j][0], updates[j][1], 'V')
+                    updates[j] = (updates[j][0], updates[j][1], VISITED)
             self.maze_renderer.incremental_update_overlay(updates)
 
     def generate_random_maze(self):
@@ -283,12 +402,15 @@ class MazeApp:
         return
 
     def set_draw_state(self, draw_state):
-        VALID_DRAW_STATES = ["draw_walls", "remove_walls", "place_start", "place_end"]
+        VALID_DRAW_STATES = ["draw_walls", "remove_walls", "place_start", "place_end", "paint_terrain"]
 
-        needs_reset = self.maze_model.current_step != -1
+        # editing the maze also cancels a solve that is still running
+        needs_reset = self.maze_model.current_step != -1 or self.maze_model.is_solving() or self.race is not None
         if needs_reset:
             self.stop() 
 
+        self.maze_renderer.show_path_preview([])
+
         if draw_state in VALID_DRAW_STATES :
             self.drawing_state = draw_state
             self.maze_drawing.current_draw_state = self.drawing_state
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import pygame
 import copy
+from .MazeGrid import EMPTY, WALL, START, END, END_POINTS, MIN_TERRAIN_COST, MAX_TERRAIN_COST
 if TYPE_CHECKING:
     from MazeRenderer import MazeRenderer
     from UserInterface.Cursor import Cursor
@@ -24,6 +25,7 @@ class MazeDrawing:
             "remove_walls": self.remove_wall,
             "place_start": self.place_start,
             "place_end": self.place_end,
+            "paint_terrain": self.paint_terrain,
         }
         self.current_draw_state = "disabled"
         self.current_draw_action = self.draw_actions["disabled"]
@@ -31,6 +33,12 @@ class MazeDrawing:
         # Last cell drawn during a drag, to make continuous lines
         self._prev_cell: tuple[int, int] | None = None
 
+        # Cells edited during the current brush stroke, replanned on mouse release
+        self._stroke_cells: list[tuple[int, int]] = []
+
+        # Cost painted by the terrain brush, changed with the mouse wheel
+        self.terrain_cost = 5
+
     
     def is_on_canvas(self, x, y) -> bool:
         if 0 <= x < self.maze_renderer.surface_width and 0 <= y < self.maze_renderer.surface_height:
@@ -45,30 +53,51 @@ class MazeDrawing:
 
 
     def handle_event(self, event: pygame.event):
+        if event.type == pygame.MOUSEWHEEL and self.current_draw_state == "paint_terrain":
+            self.terrain_cost = max(MIN_TERRAIN_COST + 1, min(MAX_TERRAIN_COST, self.terrain_cost + event.y))
+            return
+
         if event.type not in (pygame.MOUSEBUTTONDOWN,
                               pygame.MOUSEBUTTONUP,
                               pygame.MOUSEMOTION):
             return
 
+        if event.type == pygame.MOUSEBUTTONUP:
+            self._prev_cell = None
+            self.finish_stroke()
+
         mx, my = self.mouse_position(event)
         if not self.is_on_canvas(mx, my):
             self.cursor.set_default_cursor()
-            if event.type == pygame.MOUSEBUTTONUP:
-                self._prev_cell = None
             return
 
         col = mx // self.maze_renderer.cell_size
         row = my // self.maze_renderer.cell_size
 
+        if (self.current_draw_state in ("place_start", "place_end")
+                and event.type == pygame.MOUSEBUTTONDOWN
+                and pygame.key.get_mods() & pygame.KMOD_SHIFT):
+            # shift-click adds another start or end, or removes an extra one
+            code = START if self.current_draw_state == "place_start" else END
+            new_val = self.toggle_marker(row, col, code)
+            if new_val is not None:
+                self.needs_initialization = True
+                self.maze_renderer.incremental_update_overlay([(row, col, new_val)])
+
+        elif self.current_draw_state == "place_start" and (
+                event.type == pygame.MOUSEBUTTONDOWN or
+                event.type == pygame.MOUSEMOTION and event.buttons[0]):
+            # the start can be dragged around while the shortest path follows it
+            cleared_cell = (self.maze_model.start[0], self.maze_model.start[1], EMPTY)
+            if self.place_start(row, col) is not None:
+                self.needs_initialization = True
+                self.maze_renderer.show_path_preview([])
+                self.maze_renderer.incremental_update_overlay([cleared_cell, (row, col, START)])
+                self.maze_renderer.show_path_preview(self.maze_model.path_from((row, col)))
 
-        if event.type == pygame.MOUSEBUTTONUP:
-            self._prev_cell = None
-     
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if self.current_draw_state == "place_start":
-                cleared_cell = (self.maze_model.start[0], self.maze_model.start[1], 0) 
-            elif self.current_draw_state == "place_end":
-                cleared_cell = (self.maze_model.end[0], self.maze_model.end[1], 0)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if self.current_draw_state == "place_end":
+                cleared_cell = (self.maze_model.end[0], self.maze_model.end[1], EMPTY)
             else:
                 cleared_cell = None
 
@@ -77,14 +106,15 @@ class MazeDrawing:
                 self.needs_initialization = True
                 drawn_cell =  (row, col, new_val)
 
-                if self.current_draw_state == "place_end" or self.current_draw_state == "place_start":
+                if self.current_draw_state == "place_end":
                     self.maze_renderer.incremental_update_overlay([cleared_cell,  drawn_cell])
                 else:
                     self.maze_renderer.incremental_update_overlay([drawn_cell])
+                    self._stroke_cells.append((row, col))
                         
                         
         elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
-            if self.current_draw_state not in ("draw_walls", "remove_walls"):
+            if self.current_draw_state not in ("draw_walls", "remove_walls", "paint_terrain"):
                 return
             current = (row, col)
             if self._prev_cell is None:
@@ -100,16 +130,28 @@ class MazeDrawing:
                     
             if changes:
                 self.maze_renderer.incremental_update_overlay(changes)
+                self._stroke_cells.extend((r, c) for r, c, _ in changes)
             self._prev_cell = current
 
         if self.current_draw_state != "disabled":
             self.cursor.set_cross_cursor()
 
+    def finish_stroke(self):
+        """
+        Repairs the shortest path for the cells edited during the last brush
+        stroke and shows it as a preview.
+        """
+        if not self._stroke_cells:
+            return
+        path = self.maze_model.replan(self._stroke_cells)
+        self._stroke_cells = []
+        self.maze_renderer.show_path_preview(path)
+
     def initialize_surface(self):
         if self.needs_initialization:
             self._prev_cell = None
             self.reset_steps()
-            self.maze_renderer.update_maze_surface()
+            self.maze_renderer.refresh_maze_surface()
             self.needs_initialization = False
      
     def draw_line(self, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
@@ -143,42 +185,94 @@ class MazeDrawing:
         return cells
 
     def draw_wall(self, row: int, col: int) -> int | None:
-        if self.maze_model.maze[row][col] in ('S', 'E'):
+        if self.maze_model.maze[row, col] in END_POINTS:
             return None
-        self.maze_model.maze[row][col] = 1
-        return 1
+        self.maze_model.edit_cell(row, col, WALL)
+        self.maze_model.invalidate_goal_distance()
+        self.reset_steps()
+        self.maze_model.invalidate_cells([(row, col)])
+        return WALL
 
     def remove_wall(self, row: int, col: int) -> int | None:
-        if self.maze_model.maze[row][col] in ('S', 'E'):
+        if self.maze_model.maze[row, col] in END_POINTS:
+            return None
+        self.maze_model.edit_cell(row, col, EMPTY, MIN_TERRAIN_COST)
+        self.maze_model.invalidate_goal_distance()
+        self.reset_steps()
+        self.maze_model.invalidate_cells([(row, col)])
+        return EMPTY
+
+    def paint_terrain(self, row: int, col: int) -> int | None:
+        if self.maze_model.maze[row, col] in END_POINTS:
             return None
-        self.maze_model.maze[row][col] = 0
+        self.maze_model.edit_cell(row, col, EMPTY, self.terrain_cost)
+        self.maze_model.invalidate_goal_distance()
         self.reset_steps()
-        return 0
+        self.maze_model.invalidate_cells([(row, col)])
+        return EMPTY
 
     def place_start(self, row: int, col: int) -> int | None:
-        old_r, old_c = self.maze_model.start
-        if (row, col) == (old_r, old_c):
+        # the start itself, the end or an extra start or end is left as it is
+        if self.maze_model.maze[row, col] in END_POINTS:
             return None
+        old_r, old_c = self.maze_model.start
         # clear old start cell
-        self.maze_model.maze[old_r][old_c] = 0
+        self.maze_model.edit_cell(old_r, old_c, EMPTY)
+
+        # a start placed on a wall opens it up
+        opens_wall = self.maze_model.maze[row, col] == WALL
+        if opens_wall:
+            self.maze_model.invalidate_goal_distance()
 
         # set new start
-        self.maze_model.maze[row][col] = 'S'
+        self.maze_model.edit_cell(row, col, START)
         self.maze_model.start = (row, col)
+        self.maze_model.planner = None
         self.reset_steps()
+        if opens_wall:
+            self.maze_model.invalidate_cells([(row, col)])
         
-        return 'S'
+        return START
 
     def place_end(self, row: int, col: int) -> int | None:
-        old_r, old_c = self.maze_model.end
-        if (row, col) == (old_r, old_c):
+        if self.maze_model.maze[row, col] in END_POINTS:
             return None
-        self.maze_model.maze[old_r][old_c] = 0
+        old_r, old_c = self.maze_model.end
+        self.maze_model.edit_cell(old_r, old_c, EMPTY)
 
-        self.maze_model.maze[row][col] = 'E'
+        opens_wall = self.maze_model.maze[row, col] == WALL
+        self.maze_model.edit_cell(row, col, END)
         self.maze_model.end = (row, col)
+        self.maze_model.planner = None
+        self.maze_model.invalidate_goal_distance()
+        self.reset_steps()
+        if opens_wall:
+            self.maze_model.invalidate_cells([(row, col)])
+        return END
+
+    def toggle_marker(self, row: int, col: int, code: int) -> int | None:
+        """
+        Adds an extra start or end cell, or turns an extra one back into an
+        empty cell. The primary start and end are only moved, never removed.
+        """
+        if (row, col) in (self.maze_model.start, self.maze_model.end):
+            return None
+        cell_code = self.maze_model.maze[row, col]
+        if cell_code == code:
+            new_code = EMPTY
+        elif cell_code in END_POINTS:
+            return None
+        else:
+            new_code = code
+
+        opens_wall = cell_code == WALL
+        self.maze_model.edit_cell(row, col, new_code)
         self.reset_steps()
-        return 'E'
+        if opens_wall:
+            self.maze_model.invalidate_goal_distance()
+            self.maze_model.planner = None
+            self.maze_model.invalidate_cells([(row, col)])
+        return new_code
 
     def reset_steps(self):
         if self.maze_model.steps:
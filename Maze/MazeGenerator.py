@@ -1,12 +1,13 @@
 import random
+from .MazeGrid import MazeGrid, EMPTY, WALL, START, END
 
 class MazeGenerator:
     """
-    This class cointains methods for generating mazes that are matrices where 
-        walls are represented as 1,
-        empty spaces by 0,
-        start cell by 'S',
-        and end cell by 'E'.
+    This class cointains methods for generating mazes that are MazeGrids where 
+        walls are represented as WALL,
+        empty spaces by EMPTY,
+        start cell by START,
+        and end cell by END.
     """
     def __init__(self):
         self.rows = 0
@@ -39,7 +40,7 @@ class MazeGenerator:
             seed (int | float | str | bytes | bytearray | None): Variable to initialize seed. Defaults to None.
 
         Returns:
-            maze: generated matrix
+            maze: generated MazeGrid
         """
         # Seed the random number generator for reproducibility.
         if seed is not None:
@@ -51,8 +52,9 @@ class MazeGenerator:
         start_col, end_col = 0, num_cols - 1
         start_row, end_row = 0, num_rows - 1
 
-        maze = [[1] * num_cols for _ in range(num_rows)]
-        maze[start_col + 1][start_row + 1] = 0  
+        maze = MazeGrid(num_rows, num_cols, fill=WALL)
+        cells = maze.cells
+        cells[(start_col + 1) * num_cols + start_row + 1] = EMPTY
 
         cell_stack = [(1, 1)]
         DIRECTIONS = [(0, -2), (2, 0), (0, 2), (-2, 0)]
@@ -66,7 +68,7 @@ class MazeGenerator:
                 neighbour_y = y + direction_y
 
                 in_bounds = (0 < neighbour_x < num_cols and 0 < neighbour_y < num_rows)
-                if in_bounds and maze[neighbour_y][neighbour_x] == 1:
+                if in_bounds and cells[neighbour_y * num_cols + neighbour_x] == WALL:
                     neighbour_cells.append((neighbour_x, neighbour_y))
 
             if neighbour_cells:
@@ -76,29 +78,29 @@ class MazeGenerator:
                 wall_x = x + (neighbour_x - x) // 2
                 wall_y = y + (neighbour_y - y) // 2
 
-                maze[wall_y][wall_x] = 0
-                maze[neighbour_y][neighbour_x] = 0
+                cells[wall_y * num_cols + wall_x] = EMPTY
+                cells[neighbour_y * num_cols + neighbour_x] = EMPTY
                 cell_stack.append((neighbour_x, neighbour_y))
             else:
                 cell_stack.pop()
         
         # open the two corner cells
-        maze[start_row][end_row] = 0
-        maze[start_row][start_col] = 0
+        maze[start_row, end_row] = EMPTY
+        maze[start_row, start_col] = EMPTY
  
         # Top-left corner connection.
-        top_left_neighbors_are_walls = (maze[0][1] == 1 and maze[1][0] == 1)
+        top_left_neighbors_are_walls = (maze[0, 1] == WALL and maze[1, 0] == WALL)
         if (top_left_neighbors_are_walls):
-            maze[start_row][start_col + 1] = 0  # Carve a passage to the right
+            maze[start_row, start_col + 1] = EMPTY  # Carve a passage to the right
         
         # Bottom-right corner connection.
-        bottom_right_neighbors_are_walls = (maze[num_rows-2][num_cols-1] == 1 and maze[num_rows-1][num_cols-2] == 1)
+        bottom_right_neighbors_are_walls = (maze[num_rows-2, num_cols-1] == WALL and maze[num_rows-1, num_cols-2] == WALL)
         if bottom_right_neighbors_are_walls:
-            maze[end_row - 1][end_col] = 0 
+            maze[end_row - 1, end_col] = EMPTY 
         
         # Mark start and end positions.
-        maze[start_row][start_col] = 'S'
-        maze[end_row][end_col] = 'E'
+        maze[start_row, start_col] = START
+        maze[end_row, end_col] = END
         
         return maze
         
@@ -112,24 +114,20 @@ class MazeGenerator:
             height (int): height of the generated maze
 
         Returns:
-            maze: generated matrix
+            maze: generated MazeGrid
         """
-        maze: list[list[int]] = []
+        maze = MazeGrid(width, height, fill=EMPTY)
+        cells = maze.cells
 
-        for i in range(width):
-            maze.append([])
-            for _ in range(height):
-                maze[i].append(0)
+        # top and bottom rows
+        cells[0:height] = bytes([WALL]) * height
+        cells[(width - 1) * height:width * height] = bytes([WALL]) * height
 
-        for i in range(height):
-            maze[0][i] = 1
-            maze[width-1][i] = 1
-
-        for i in range(width):
-            maze[i][0] = 1
-            maze[i][height-1] = 1
+        # left and right columns
+        cells[0::height] = bytes([WALL]) * width
+        cells[height - 1::height] = bytes([WALL]) * width
         
-        maze[1][1] = "S"
-        maze[width-2][height-2] = "E"
+        maze[1, 1] = START
+        maze[width - 2, height - 2] = END
 
         return maze
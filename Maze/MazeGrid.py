@@ -0,0 +1,109 @@
+# Cell codes stored in the grid. Each cell takes a single byte.
+EMPTY               = 0
+WALL                = 1
+START               = 2
+END                 = 3
+VISITED             = 4
+PATH                = 5
+
+END_POINTS          = (START, END)
+
+# Terrain costs of entering a cell. Plain cells cost MIN_TERRAIN_COST.
+MIN_TERRAIN_COST    = 1
+MAX_TERRAIN_COST    = 9
+
+# Translation table that turns visualization marks back into empty cells.
+_CLEAR_MARKS_TABLE  = bytes(
+    EMPTY if code in (VISITED, PATH) else code
+    for code in range(256)
+)
+
+
+class MazeGrid:
+    """
+    Compact maze storage backed by a flat bytearray.
+
+    Cells are stored in row-major order, so the cell at (row, col) lives at
+    index row * cols + col and uses one byte holding one of the cell codes
+    (EMPTY, WALL, START, END, VISITED, PATH). Copying a grid is a single
+    buffer copy, and a 4000x4000 maze takes 16 MB.
+
+    A second buffer of the same layout, `costs`, holds the terrain cost of
+    entering each cell (MIN_TERRAIN_COST to MAX_TERRAIN_COST). Terrain is
+    kept apart from the cell codes so that visualization marks never erase it.
+
+    Cells can be read and written either through the flat `cells` buffer or
+    with (row, col) subscripts:
+
+        grid[row, col] = WALL
+    """
+    def __init__(self, rows: int, cols: int, cells: bytearray | None = None, fill: int = EMPTY,
+                 costs: bytearray | None = None):
+        """
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns in the grid.
+            cells (bytearray | None, optional): Existing row-major cell buffer to wrap. Defaults to None.
+            fill (int, optional): Cell code used when a new buffer is created. Defaults to EMPTY.
+            costs (bytearray | None, optional): Existing row-major terrain cost buffer to wrap.
+                Defaults to None, which gives every cell MIN_TERRAIN_COST.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells if cells is not None else bytearray([fill]) * (rows * cols)
+        self.costs = costs if costs is not None else bytearray([MIN_TERRAIN_COST]) * (rows * cols)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, cell: tuple[int, int]) -> int:
+        row, col = cell
+        return self.cells[row * self.cols + col]
+
+    def __setitem__(self, cell: tuple[int, int], code: int):
+        row, col = cell
+        self.cells[row * self.cols + col] = code
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def position(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def row(self, row: int) -> bytearray:
+        return self.cells[row * self.cols:(row + 1) * self.cols]
+
+    def copy(self) -> "MazeGrid":
+        return MazeGrid(self.rows, self.cols, self.cells[:], costs=self.costs[:])
+
+    def find(self, code: int) -> tuple[int, int] | None:
+        """
+        Returns the position of the first cell holding the given code, or None.
+        """
+        index = self.cells.find(code)
+        if index == -1:
+            return None
+        return self.position(index)
+
+    def find_all(self, code: int) -> list[tuple[int, int]]:
+        """
+        Returns the positions of every cell holding the given code, in row-major order.
+        """
+        positions = []
+        index = self.cells.find(code)
+        while index != -1:
+            positions.append(self.position(index))
+            index = self.cells.find(code, index + 1)
+        return positions
+
+    def cost(self, row: int, col: int) -> int:
+        return self.costs[row * self.cols + col]
+
+    def set_cost(self, row: int, col: int, cost: int):
+        self.costs[row * self.cols + col] = cost
+
+    def clear_marks(self):
+        """
+        Turns all visited and path cells back into empty cells in one pass.
+        """
+        self.cells[:] = self.cells.translate(_CLEAR_MARKS_TABLE)
@@ -0,0 +1,72 @@
+import numpy as np
+from .MazeGrid import WALL, VISITED, PATH, EMPTY
+
+# Every 64-bit value is kept below this mask, matching NumPy uint64 wraparound.
+MASK_64             = (1 << 64) - 1
+# Cells hashed per NumPy pass, which bounds the temporary arrays of a large maze.
+HASH_CHUNK_CELLS    = 1 << 20
+
+
+def _splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def _cell_state(code: int, cost: int) -> int:
+    # visualization marks do not change the maze, and the cost of a wall is never used
+    if code in (VISITED, PATH):
+        code = EMPTY
+    return code * 16 + (0 if code == WALL else cost)
+
+
+def cell_key(index: int, code: int, cost: int) -> int:
+    """
+    Returns the Zobrist key of one cell in one state: a 64-bit value that
+    looks random but is derived from the cell index, its code and its cost,
+    so no key table has to be stored.
+    """
+    return _splitmix64(index * 256 + _cell_state(code, cost))
+
+
+def maze_hash(maze) -> int:
+    """
+    Returns the Zobrist hash of a maze: the XOR of the keys of all of its
+    cells and of its size, computed with NumPy in one pass over the grid.
+
+    The hash changes with walls, terrain costs and where the start and end
+    are, but not with visited or path marks. After an edit it is updated in
+    O(1) with update_hash() instead of being computed again.
+
+    Args:
+        maze (MazeGrid): The maze grid.
+
+    Returns:
+        int: The 64-bit hash.
+    """
+    cells = np.frombuffer(maze.cells, dtype=np.uint8)
+    costs = np.frombuffer(maze.costs, dtype=np.uint8)
+    value = _splitmix64((maze.rows << 32) | maze.cols)
+    for chunk_start in range(0, len(cells), HASH_CHUNK_CELLS):
+        codes = cells[chunk_start:chunk_start + HASH_CHUNK_CELLS].astype(np.uint64)
+        chunk_costs = costs[chunk_start:chunk_start + HASH_CHUNK_CELLS].astype(np.uint64)
+        codes[(codes == VISITED) | (codes == PATH)] = EMPTY
+        chunk_costs[codes == WALL] = 0
+
+        keys = np.arange(chunk_start, chunk_start + len(codes), dtype=np.uint64) * np.uint64(256)
+        keys += codes * np.uint64(16) + chunk_costs
+        # splitmix64 on the whole chunk; uint64 arithmetic wraps like the masked version
+        keys += np.uint64(0x9E3779B97F4A7C15)
+        keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        keys ^= keys >> np.uint64(31)
+        value ^= int(np.bitwise_xor.reduce(keys))
+    return value
+
+
+def update_hash(value: int, index: int, old_code: int, old_cost: int, new_code: int, new_cost: int) -> int:
+    """
+    Returns the hash after one cell changed from its old state to its new one.
+    """
+    return value ^ cell_key(index, old_code, old_cost) ^ cell_key(index, new_code, new_cost)
@@ -1,5 +1,17 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
+import numpy as np
+from .MazeGrid import EMPTY, START, END, VISITED, PATH
+from .StepStream import StepStream
+from .SolveJob import SolveJob
+from .SolveCache import SolveCache, CachedSolve, solve_key
+from .MazeHash import maze_hash, update_hash
+from Algorithms.DistanceField import goal_distance_field, path_to_goal
+from Algorithms.LifelongPlanning import LifelongAStar
+from Algorithms.HierarchicalPathfinding import AbstractGraph
+from Algorithms.JunctionGraph import JunctionGraph
+from Algorithms.Connectivity import ConnectivityIndex
+from Algorithms.Movement import current_movement
 
 if TYPE_CHECKING:
     from MazeGenerator import MazeGenerator
@@ -11,22 +23,35 @@ class MazeModel:
     It contains the original maze, the current maze, and the steps taken by the algorithm.
     It also provides methods to generate new mazes, run algorithms, and display steps.
 
-    Mazes are matrices where 
-    walls are represented as 1,
-    empty spaces by 0,
-    start cell by 'S',
-    and end cell by 'E'.
+    Mazes are MazeGrids (flat row-major byte buffers) where 
+    walls are represented as WALL,
+    empty spaces by EMPTY,
+    start cell by START,
+    and end cell by END.
     """
-    def __init__(self, maze_generator: MazeGenerator, maze_width=200, maze_height=200, seed=0):
-        # Use the provided MazeGenerator instance to generate the maze.
+    def __init__(self, maze_generator: MazeGenerator, maze_width=200, maze_height=200, seed=0, solve_cache=None, maze=None):
+        # Use the provided MazeGenerator instance to generate the maze, unless a maze is given.
         self.maze_generator = maze_generator
-        self.maze = self.maze_generator.generate(maze_width, maze_height, seed)
-        self.rows = len(self.maze)
-        self.cols = len(self.maze[0])
+        self.maze = maze if maze is not None else self.maze_generator.generate(maze_width, maze_height, seed)
+        self.rows = self.maze.rows
+        self.cols = self.maze.cols
         self.start, self.end = self.get_start_end()
-        self.steps = []
+        # updated cell by cell by edit_cell()
+        self.maze_hash = maze_hash(self.maze)
+        self.steps = StepStream()
         self.current_step = -1
         self.last_step = -1
+        self.goal_distance = None
+        self.planner = None
+        self.abstract_graph = None
+        self.junction_graph = None
+        self.connectivity = None
+        # (maze hash, whether an end can be reached), see is_end_reachable()
+        self.end_reachable = None
+        self.stats = None
+        # keyed by maze content, so it is kept across new mazes
+        self.solve_cache = solve_cache if solve_cache is not None else SolveCache()
+        self.solve_cached = False
 
     def generate_new_maze(self, maze_width, maze_height, seed=0):
         """
@@ -38,60 +63,267 @@ class MazeModel:
             seed (int, optional): The seed for random generation. Defaults to 0.
         """
         self.maze = self.maze_generator.generate(maze_width, maze_height, seed)
-        self.rows = len(self.maze)
-        self.cols = len(self.maze[0])
+        self.rows = self.maze.rows
+        self.cols = self.maze.cols
         self.start, self.end = self.get_start_end()
-        self.steps = []
+        # updated cell by cell by edit_cell()
+        self.maze_hash = maze_hash(self.maze)
+        self.steps = StepStream()
         self.current_step = -1
         self.last_step = -1
+        self.goal_distance = None
+        self.planner = None
+        self.abstract_graph = None
+        self.junction_graph = None
+        self.connectivity = None
+        # (maze hash, whether an end can be reached), see is_end_reachable()
+        self.end_reachable = None
+        self.stats = None
 
     def get_start_end(self):
-        start = end = None
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.maze[i][j] == 'S':
-                    start = (i, j)
-                elif self.maze[i][j] == 'E':
-                    end = (i, j)
-        return start, end
+        return self.maze.find(START), self.maze.find(END)
+
+    def get_sources_goals(self):
+        """
+        Returns every start cell and every end cell of the maze, the primary
+        start and end (the ones that are moved and previewed) first.
+        """
+        sources = self.maze.find_all(START)
+        goals = self.maze.find_all(END)
+        for cells, primary in ((sources, self.start), (goals, self.end)):
+            if primary in cells:
+                cells.remove(primary)
+                cells.insert(0, primary)
+        return sources, goals
+
+    def get_search_targets(self, solver, algorithm_name):
+        """
+        Returns the (sources, goals, nearest) a solve with the algorithm
+        searches between. With several starts or ends, the algorithms that
+        support it search from all starts to the nearest end; the others use
+        the first start and end. The maze must have a start and an end.
+        """
+        sources, goals = self.get_sources_goals()
+        nearest = len(sources) > 1 or len(goals) > 1
+        if nearest and algorithm_name not in solver.nearest_algorithms:
+            print(f"{algorithm_name} searches from one start to one end; using the first of each.")
+            nearest = False
+            sources, goals = sources[:1], goals[:1]
+        return sources, goals, nearest
+
+    def edit_cell(self, row, col, code, cost=None):
+        """
+        Writes a cell code, and optionally its terrain cost, and updates the
+        maze hash for the change in O(1).
+        """
+        maze = self.maze
+        index = maze.index(row, col)
+        old_code, old_cost = maze.cells[index], maze.costs[index]
+        maze[row, col] = code
+        if cost is not None:
+            maze.set_cost(row, col, cost)
+        self.maze_hash = update_hash(
+            self.maze_hash, index, old_code, old_cost, maze.cells[index], maze.costs[index]
+        )
     
+    def invalidate_goal_distance(self):
+        """
+        Drops the cached distance-to-end field. Must be called whenever walls,
+        terrain costs or the end cell change; moving the start keeps it valid.
+        """
+        self.goal_distance = None
+
+    def movement_changed(self):
+        """
+        Drops everything cached for the previous movement: the distance
+        field, the planner, both search graphs and the connected components.
+        Must be called after the solver movement changed, once no solve is
+        running on the worker thread. Cached solves are keyed by the movement.
+        """
+        self.goal_distance = None
+        self.planner = None
+        self.abstract_graph = None
+        self.junction_graph = None
+        self.connectivity = None
+        self.end_reachable = None
+
+    def get_abstract_graph(self):
+        """
+        Returns the cluster abstraction of the maze used by HPA*. It is kept
+        between solves and only the clusters edited since are rebuilt.
+        """
+        if self.abstract_graph is None:
+            self.abstract_graph = AbstractGraph(self.maze, movement=current_movement())
+        return self.abstract_graph
+
+    def get_junction_graph(self):
+        """
+        Returns the corridor-contracted graph of the maze used by Junction A*.
+        It is built by the first solve that needs it and kept until an edit.
+        """
+        if self.junction_graph is None:
+            self.junction_graph = JunctionGraph(self.maze, current_movement())
+        return self.junction_graph
+
+    def get_connectivity(self):
+        """
+        Returns the connected components of the open cells. They are labelled
+        on first use and then kept up to date by invalidate_cells().
+        """
+        if self.connectivity is None:
+            self.connectivity = ConnectivityIndex(self.maze, current_movement())
+        return self.connectivity
+
+    def is_end_reachable(self):
+        """
+        Returns whether any end can be reached from a start. The answer is
+        stored with the maze hash it was found for, and every edit, including
+        a moved start or end, changes the hash, so the control panel can ask
+        every frame without scanning the maze again.
+        """
+        if self.end_reachable is None or self.end_reachable[0] != self.maze_hash:
+            sources, goals = self.get_sources_goals()
+            self.end_reachable = (self.maze_hash, self.get_connectivity().any_connected(sources, goals))
+        return self.end_reachable[1]
+
+    def invalidate_cells(self, changed_cells):
+        """
+        Drops what the cached search graphs know about the given cells: the
+        clusters of the abstraction that contain them, and the whole junction
+        graph. The connected components are updated instead. Must be called
+        whenever walls or terrain costs change, after the solve that may be
+        building either graph on the worker thread was cancelled.
+        """
+        if self.abstract_graph is not None:
+            self.abstract_graph.invalidate_cells(changed_cells)
+        if self.junction_graph is not None:
+            self.junction_graph.invalidate()
+        if self.connectivity is not None:
+            self.connectivity.update_cells(changed_cells)
+        self.end_reachable = None
+
+    def path_from(self, start):
+        """
+        Returns the shortest path from the given cell to the end cell.
+
+        The distance from every cell to the end is computed once and cached,
+        so every further query only walks down the field in O(path length).
+        This makes it cheap enough to run on every mouse move.
+
+        Args:
+            start (tuple[int, int]): The cell the path starts from.
+
+        Returns:
+            list[tuple[int, int]]: The path from start to end (inclusive), or an
+            empty list if the end cannot be reached.
+        """
+        if not self.end:
+            return []
+        if self.goal_distance is None:
+            self.goal_distance = goal_distance_field(self.maze, self.end, current_movement())
+        return path_to_goal(self.goal_distance, self.maze, start, current_movement())
+
+    def replan(self, changed_cells):
+        """
+        Returns the shortest path from start to end after the given cells were edited.
+
+        An incremental planner (LPA*) is kept between calls, so only the part
+        of the search that the edit affects is repeated. The planner is
+        created on the first call and dropped when the start or end moves.
+
+        Args:
+            changed_cells (list[tuple[int, int]]): Cells whose wall state or terrain cost changed.
+
+        Returns:
+            list[tuple[int, int]]: The path from start to end (inclusive), or an
+            empty list if the end cannot be reached.
+        """
+        if not self.start or not self.end:
+            return []
+        if self.planner is None:
+            self.planner = LifelongAStar(self.maze, self.start, self.end, current_movement())
+            return self.planner.compute_path()
+        return self.planner.update_cells(changed_cells)
+
     def get_final_path_length(self):
-        return len(self.steps[-1])
+        # only known once the solver has produced every batch
+        if not self.steps.finished or not self.steps:
+            return 0
+        return len(self.steps.batches.path_cells(len(self.steps) - 1))
 
-    def run_algorithm(self, solver_factory, algorithm_name):
+    def run_algorithm(self, solver_factory, algorithm_name, background=False, on_progress=None):
         """
         Run the specified algorithm to solve the maze.
 
         Args:
             solver_factory (Callable): A factory function to create a solver instance.
             algorithm_name (str): The name of the algorithm to use for solving.
+            background (bool, optional): Solve on a worker thread instead of pulling the
+                steps lazily on demand. Defaults to False.
+            on_progress (Callable[[int], None] | None, optional): Called from the worker
+                with the number of steps solved so far. Defaults to None.
         """
         solver = solver_factory(algorithm_name)
-        start, end = self.get_start_end()
-        if not start or not end:
+        sources, goals = self.get_sources_goals()
+        if not sources or not goals:
             print("Start or end position not found!")
             return
+        start, end = sources[0], goals[0]
+        sources, goals, nearest = self.get_search_targets(solver, algorithm_name)
 
-        self.steps = []
         self.current_step = -1
         self.last_step = -1
 
-        _, raw_steps = solver.solve(self.maze, start, end)
+        # a walled-off end needs no search to be answered
+        if not self.get_connectivity().any_connected(sources, goals):
+            print("End is not reachable from the start!")
+            self.steps = StepStream()
+            self.stats = None
+            return
+
+        # the same maze solved the same way before is replayed instead of searched
+        key = solve_key(self.maze_hash, tuple(sources), tuple(goals), algorithm_name, solver.settings_key())
+        cached = self.solve_cache.get(key)
+        self.solve_cached = cached is not None
+        if cached is not None:
+            self.steps = StepStream.replay(cached.history, cached.final_path)
+            self.stats = cached.stats
+            self.display_step(-1)
+            return
+
+        def store_solve(step_stream):
+            self.solve_cache.put(key, CachedSolve(step_stream.batches, step_stream.final_path, solver.stats))
 
-        # Some algorithms might return a single long list. Standardize it.
-        if len(raw_steps) == 1 and len(raw_steps[0]) > 1:
-            subdivided = [[update] for update in raw_steps[0]]
-            self.steps = subdivided
+        if nearest:
+            step_generator = solver.iter_solve_nearest(self.maze, sources, goals)
         else:
-            self.steps = raw_steps
-        
+            step_generator = solver.iter_solve(
+                self.maze, start, end,
+                abstract_graph=self.get_abstract_graph(),
+                junction_graph=self.get_junction_graph()
+            )
+        # nothing is solved yet; batches are pulled as they are displayed
+        self.steps = StepStream(step_generator, self.cols, on_finished=store_solve)
+        # filled in by the solver once it has produced every batch
+        self.stats = solver.stats
+        if background:
+            SolveJob(self.steps, on_progress).start()
         self.display_step(-1)
 
+    def is_solving(self):
+        return self.steps.solve_job is not None and self.steps.solve_job.running
+
+    def get_search_stats(self):
+        """
+        Returns the SearchStats of the last solve, or None while it is still
+        running or when nothing has been solved.
+        """
+        if not self.steps.finished or not self.steps:
+            return None
+        return self.stats
+
     def reset_maze_to_original(self):
-        for i in range(self.rows):
-            for j in range(self.cols):
-                if self.maze[i][j] not in (1, 'S', 'E'):
-                    self.maze[i][j] = 0
+        self.maze.clear_marks()
         self.current_step = -1
         self.last_step = -1
         
@@ -104,16 +336,16 @@ class MazeModel:
             step_ix_end (int): The index of the last step to remove.
         """
 
-        # Check if the current step is the found path and mark it as visited.
-        if self.steps[self.current_step][0][2] == 'P':
-            for (x, y, _) in self.steps[self.current_step]:
-                self.maze[x][y] = 'V'
-            step_ix_end -= 1
-
-        # Iterate through the specified steps and erase them from the current maze.
-        for i in range(step_ix, step_ix_end):
-            for (x, y, _) in self.steps[i]:
-                self.maze[x][y] = 0
+        # a removed cell shows what jump_to_step shows at the step left on screen:
+        # visited if an earlier batch visited it, otherwise empty
+        last_shown = step_ix - 1
+        batches = self.steps.batches
+        visited_rank = batches.visited_ranks(len(self.maze))
+        removed = np.array(batches.cells[batches.offsets[step_ix]:batches.offsets[step_ix_end + 1]], dtype=np.int64)
+        cells = np.frombuffer(self.maze.cells, dtype=np.uint8)
+        cells[removed] = np.where(visited_rank[removed] <= last_shown, VISITED, EMPTY)
+        # an anytime solver's improved path replaced an earlier one, which shows again
+        cells[batches.path_cells(last_shown)] = PATH
 
     def display_step(self, step_idx):
         """
@@ -124,16 +356,42 @@ class MazeModel:
         Args:
             step_idx (int): The index of the step to display.
         """
-        if step_idx < -1 or step_idx >= len(self.steps):
+        if step_idx < -1 or step_idx >= self.steps.fetch(step_idx + 1):
             return
 
         if step_idx < self.last_step:
-            self.remove_previous_steps(step_idx, self.last_step)
+            self.remove_previous_steps(step_idx + 1, self.last_step)
         else:
             # Apply steps incrementally.
+            cells = self.maze.cells
+            cols = self.cols
             for i in range(self.last_step + 1, step_idx + 1):
                 for (x, y, val) in self.steps[i]:
-                    self.maze[x][y] = val
+                    cells[x * cols + y] = val
         # Update step states
         self.last_step = step_idx
         self.current_step = step_idx
+
+    def jump_to_step(self, step_idx):
+        """
+        Display the maze at any step index in a single vectorised pass.
+
+        Unlike display_step, the cost does not depend on how far the step is
+        from the current one: every cell whose visited (or path) rank is at
+        most step_idx is marked, and all others are cleared. The path is the
+        last one found by step_idx.
+
+        Args:
+            step_idx (int): The index of the step to display.
+        """
+        if step_idx < -1 or step_idx >= self.steps.fetch(step_idx + 1):
+            return
+
+        visited_rank = self.steps.batches.visited_ranks(len(self.maze))
+        self.maze.clear_marks()
+        cells = np.frombuffer(self.maze.cells, dtype=np.uint8)
+        cells[visited_rank <= step_idx] = VISITED
+        cells[self.steps.batches.path_cells(step_idx)] = PATH
+
+        self.last_step = step_idx
+        self.current_step = step_idx
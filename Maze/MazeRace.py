@@ -0,0 +1,274 @@
+import math
+import os
+from array import array
+from multiprocessing import get_context
+from time import perf_counter
+import numpy as np
+import pygame
+from .BatchSolve import configure_worker
+from .MazeModel import MazeModel
+from .MazeRenderer import MazeRenderer
+from .MazeSolver import MazeSolver
+from .SolveCache import CachedSolve, solve_key
+from .StepHistory import StepHistory, NEVER
+from .StepStream import StepStream
+
+# Height of the label above every viewport and the space around it.
+LABEL_HEIGHT        = 44
+LANE_MARGIN         = 4
+LABEL_FONT_SIZE     = 18
+LABEL_COLOR         = (32, 32, 32)
+FAILED_COLOR        = (200, 0, 0)
+
+
+def race_run(task):
+    """
+    Solves the maze of a race with one algorithm in a worker process.
+
+    Only the solver's own time is measured: the clock runs while the next
+    batch is pulled and stops while it is stored, so the times add up to
+    the solve time of the single solve.
+
+    Args:
+        task (tuple): (algorithm, maze, sources, goals, nearest, solver settings),
+            the settings as from MazeSolver.current_settings().
+
+    Returns:
+        tuple: (algorithm, StepHistory, found path, SearchStats, solve time
+        in seconds once every batch was produced as an array('d')).
+    """
+    algorithm, maze, sources, goals, nearest, settings = task
+    configure_worker(*settings)
+    solver = MazeSolver(algorithm)
+    if nearest:
+        step_generator = solver.iter_solve_nearest(maze, sources, goals)
+    else:
+        step_generator = solver.iter_solve(maze, sources[0], goals[0])
+
+    history = StepHistory(maze.cols)
+    batch_times = array("d")
+    solve_time = 0.0
+    while True:
+        resumed = perf_counter()
+        try:
+            batch = next(step_generator)
+        except StopIteration as stop:
+            final_path = stop.value or []
+            break
+        solve_time += perf_counter() - resumed
+        history.append(batch)
+        batch_times.append(solve_time)
+    return algorithm, history, final_path, solver.stats, batch_times
+
+
+class RaceLane:
+    """
+    One algorithm of a race: a copy of the maze, the renderer of its
+    viewport and, once its worker is done, the solve to play.
+    """
+    def __init__(self, algorithm, maze_model, canvas_size, origin, label_position):
+        self.algorithm = algorithm
+        # a model of its own, so the marks of every lane stay apart
+        self.model = MazeModel(
+            maze_model.maze_generator, solve_cache=maze_model.solve_cache, maze=maze_model.maze.copy()
+        )
+        self.model.maze.clear_marks()
+        self.renderer = MazeRenderer(self.model, canvas_size[0], canvas_size[1], origin=origin)
+        self.label_position = label_position
+        self.solved = False
+        self.error = None
+        self.batch_times = None
+        # the number of cells marked visited by every step
+        self.expanded_counts = None
+        self._label_key = None
+        self._label_surfaces = []
+
+    def finish(self, history, final_path, stats, batch_times):
+        self.model.steps = StepStream.replay(history, final_path)
+        self.model.stats = stats
+        self.batch_times = batch_times
+        visited_ranks = history.visited_ranks(len(self.model.maze))
+        self.expanded_counts = np.bincount(
+            visited_ranks[visited_ranks != NEVER], minlength=len(history)
+        ).cumsum()
+        self.solved = True
+
+    def fail(self, error):
+        self.error = error
+        self.solved = True
+
+    @property
+    def step_count(self):
+        return len(self.model.steps)
+
+    def display_step(self, step_idx):
+        """
+        Shows the lane at a step, or at its last step when it finished
+        sooner. Moving forward only redraws the cells of the applied steps.
+        """
+        model = self.model
+        step_idx = min(step_idx, self.step_count - 1)
+        if step_idx < model.current_step:
+            model.jump_to_step(step_idx)
+            self.renderer.update_maze_surface()
+            return
+        for next_step in range(model.current_step + 1, step_idx + 1):
+            model.display_step(next_step)
+            for (x, y, value) in model.steps[next_step]:
+                self.renderer.update_maze_surface_cell(x, y, value)
+
+    def jump_to_step(self, step_idx):
+        self.model.jump_to_step(min(step_idx, self.step_count - 1))
+        self.renderer.update_maze_surface()
+
+    def label(self, elapsed):
+        """
+        Returns the label lines: the algorithm, then the live counters of the
+        step on screen, with the path length once the lane shows its path.
+        """
+        if self.error is not None:
+            return self.algorithm, "failed", ""
+        if not self.solved:
+            return self.algorithm, "solving", f"{elapsed:.1f} s"
+
+        current_step = self.model.current_step
+        if current_step < 0:
+            return self.algorithm, "0 expanded", "0.0 ms"
+        solve_time = f"{self.batch_times[current_step] * 1000:.1f} ms"
+        if current_step == self.step_count - 1:
+            solve_time += f"  path {self.model.get_final_path_length()}"
+        return self.algorithm, f"{self.expanded_counts[current_step]} expanded", solve_time
+
+    def draw(self, surface, font, elapsed):
+        self.renderer.draw(surface)
+        lines = self.label(elapsed)
+        color = FAILED_COLOR if self.error is not None else LABEL_COLOR
+        # the label only changes with the step, so it is rendered again only then
+        if lines != self._label_key:
+            self._label_surfaces = [font.render(line, True, color) for line in lines]
+            self._label_key = lines
+        label_x, label_y = self.label_position
+        for surf in self._label_surfaces:
+            surface.blit(surf, (label_x, label_y))
+            label_y += font.get_linesize()
+
+
+class MazeRace:
+    """
+    Solves the maze with every algorithm at once and plays the solves side
+    by side.
+
+    Every algorithm is solved in its own task on a process pool, so the
+    solves run in parallel on separate cores and the pygame loop never waits
+    for them. The canvas is split into one viewport per algorithm, each with
+    a MazeRenderer over its own copy of the maze. Once every solve is in, all
+    lanes play the same step together, and the label of every lane counts
+    the cells expanded and the solve time spent up to the step on screen.
+    Finished solves are also stored in the SolveCache, so an algorithm picked
+    from the dropdown afterwards replays at once.
+    """
+    def __init__(self, maze_model, algorithms, canvas_width, canvas_height, workers=None):
+        """
+        Args:
+            maze_model (MazeModel): The model of the maze to race on. Must have a start and an end.
+            algorithms (list[str]): The algorithms to race.
+            canvas_width (int): The width of the canvas split between the lanes.
+            canvas_height (int): The height of the canvas split between the lanes.
+            workers (int | None, optional): Number of worker processes. Defaults to one
+                per algorithm, at most the CPU count.
+        """
+        columns = math.ceil(math.sqrt(len(algorithms)))
+        rows = math.ceil(len(algorithms) / columns)
+        lane_width = canvas_width // columns
+        lane_height = canvas_height // rows
+        canvas_size = (lane_width - 2 * LANE_MARGIN, lane_height - LABEL_HEIGHT - LANE_MARGIN)
+        self.lanes = []
+        for lane_index, algorithm in enumerate(algorithms):
+            left = (lane_index % columns) * lane_width
+            top = (lane_index // columns) * lane_height
+            self.lanes.append(RaceLane(
+                algorithm, maze_model, canvas_size,
+                (left + LANE_MARGIN, top + LABEL_HEIGHT), (left + LANE_MARGIN, top + LANE_MARGIN)
+            ))
+        self.current_step = -1
+        self.font = pygame.font.Font(None, LABEL_FONT_SIZE)
+
+        settings = MazeSolver.current_settings()
+        self.pending = {}
+        self.solve_time = None
+        # fresh interpreters: a forked worker would inherit the signal handlers pygame installed
+        self.pool = get_context("spawn").Pool(workers or min(len(algorithms), os.cpu_count() or 1))
+        self.started = perf_counter()
+        for lane in self.lanes:
+            solver = MazeSolver(lane.algorithm)
+            sources, goals, nearest = maze_model.get_search_targets(solver, lane.algorithm)
+            key = solve_key(maze_model.maze_hash, tuple(sources), tuple(goals), lane.algorithm, solver.settings_key())
+            task = (lane.algorithm, lane.model.maze, sources, goals, nearest, settings)
+            self.pending[lane.algorithm] = (lane, key, self.pool.apply_async(race_run, (task,)))
+        self.pool.close()
+
+    @property
+    def solving(self):
+        return bool(self.pending)
+
+    @property
+    def step_count(self):
+        """
+        The number of steps of the longest solve.
+        """
+        return max((lane.step_count for lane in self.lanes), default=0)
+
+    def poll(self):
+        """
+        Takes the solves that finished since the last call. Called every frame.
+        """
+        for algorithm, (lane, key, result) in list(self.pending.items()):
+            if not result.ready():
+                continue
+            del self.pending[algorithm]
+            try:
+                _, history, final_path, stats, batch_times = result.get()
+            except Exception as error:
+                print(f"{algorithm} failed in the race: {error}")
+                lane.fail(error)
+                continue
+            lane.finish(history, final_path, stats, batch_times)
+            lane.model.solve_cache.put(key, CachedSolve(history, final_path, stats))
+        if not self.pending and self.solve_time is None:
+            self.solve_time = perf_counter() - self.started
+            self.pool.join()
+
+    def display_step(self, step_idx):
+        step_idx = max(-1, min(step_idx, self.step_count - 1))
+        for lane in self.lanes:
+            if lane.error is None:
+                lane.display_step(step_idx)
+        self.current_step = step_idx
+
+    def jump_to_step(self, step_idx):
+        """
+        Shows every lane at a step in one vectorised pass per lane, for the timeline.
+        """
+        step_idx = max(-1, min(step_idx, self.step_count - 1))
+        for lane in self.lanes:
+            if lane.error is None:
+                lane.jump_to_step(step_idx)
+        self.current_step = step_idx
+
+    def status(self):
+        if self.solving:
+            return f"Racing... {len(self.lanes) - len(self.pending)} of {len(self.lanes)} solved"
+        return f"Race solved in {self.solve_time:.2f} s"
+
+    def draw(self, surface):
+        elapsed = perf_counter() - self.started
+        for lane in self.lanes:
+            lane.draw(surface, self.font, elapsed)
+
+    def close(self):
+        """
+        Stops the solves that are still running.
+        """
+        self.pool.terminate()
+        self.pool.join()
+        self.pending.clear()
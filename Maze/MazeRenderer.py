@@ -1,14 +1,27 @@
 import pygame
+import numpy as np
 from .MazeModel import MazeModel
+from .MazeGrid import EMPTY, WALL, START, END, VISITED, PATH, END_POINTS, MIN_TERRAIN_COST, MAX_TERRAIN_COST
 
 # Define a color scheme (used for both static and dynamic cells).
 MAZE_COLORS = {
-    'S': (0, 255, 0),    # Start: Green
-    'E': (255, 0, 0),    # End: Red
-    1: (0, 0, 0),        # Wall: Black
-    0: (255, 255, 255),  # Path: White
-    'V': (0, 0, 255),    # Visited: Blue
-    'P': (255, 0, 255)   # Final Path: Magenta
+    START: (0, 255, 0),        # Start: Green
+    END: (255, 0, 0),          # End: Red
+    WALL: (0, 0, 0),           # Wall: Black
+    EMPTY: (255, 255, 255),    # Path: White
+    VISITED: (0, 0, 255),      # Visited: Blue
+    PATH: (255, 0, 255)        # Final Path: Magenta
+}
+
+# Empty cells with a terrain cost are shaded from light sand (cheap) to dark brown (expensive).
+LIGHT_TERRAIN = (240, 220, 170)
+DARK_TERRAIN = (120, 75, 30)
+TERRAIN_COLORS = {
+    cost: tuple(
+        round(light + (dark - light) * (cost - MIN_TERRAIN_COST - 1) / (MAX_TERRAIN_COST - MIN_TERRAIN_COST - 1))
+        for light, dark in zip(LIGHT_TERRAIN, DARK_TERRAIN)
+    )
+    for cost in range(MIN_TERRAIN_COST + 1, MAX_TERRAIN_COST + 1)
 }
 
 class MazeRenderer:
@@ -21,7 +34,7 @@ class MazeRenderer:
     The class provides methods to initialize the background, update the overlay based on the current maze state,
     and draw the maze on a given surface.
     """
-    def __init__(self, maze_model: MazeModel, canvas_width: int = 650, canvas_height: int = 650, color_scheme: dict = MAZE_COLORS):
+    def __init__(self, maze_model: MazeModel, canvas_width: int = 650, canvas_height: int = 650, color_scheme: dict = MAZE_COLORS, origin: tuple[int, int] = (0, 0)):
         """Initializes the MazeRenderer with the given maze model and canvas dimensions.
 
         Args:
@@ -29,42 +42,84 @@ class MazeRenderer:
             canvas_width (int, optional): The width of the canvas. Defaults to 650.
             canvas_height (int, optional): The height of the canvas. Defaults to 650.
             color_scheme (dict, optional): A dictionary defining the colors for different cell types. Defaults to MAZE_COLORS.
+            origin (tuple[int, int], optional): Screen position of the top left corner of the canvas,
+                for a canvas that shares the screen with others. Defaults to (0, 0).
         """
         self.maze_model = maze_model
         self.canvas_width: int = canvas_width
         self.canvas_height: int = canvas_height
         self.color_scheme: dict = color_scheme
 
-        # Calculate the cell size so that the maze fills the canvas height.
-        self.cell_size = canvas_height // self.maze_model.rows
+        # Calculate the cell size so that the maze fills the canvas height, or its width if narrower.
+        self.cell_size = max(1, min(canvas_height // self.maze_model.rows, canvas_width // self.maze_model.cols))
 
         # Update the surface dimensions based on the new cell_size.
         self.surface_width = self.maze_model.cols * self.cell_size
         self.surface_height = self.maze_model.rows * self.cell_size
         
         # Center the maze horizontally (vertical centering will be exact now).
-        self.offset_x = (self.canvas_width - self.surface_width) // 2
-        self.offset_y = (self.canvas_height - self.surface_height) // 2
+        self.offset_x = origin[0] + (self.canvas_width - self.surface_width) // 2
+        self.offset_y = origin[1] + (self.canvas_height - self.surface_height) // 2
+
+        # Color lookup tables indexed by cell code and by terrain cost. Walls stay black.
+        self.palette = np.zeros((256, 3), dtype=np.uint8)
+        for code, color in self.color_scheme.items():
+            if code != WALL:
+                self.palette[code] = color
+        self.terrain_palette = np.zeros((256, 3), dtype=np.uint8)
+        for cost, color in TERRAIN_COLORS.items():
+            self.terrain_palette[cost] = color
 
         self.maze_surface = pygame.Surface((self.surface_width, self.surface_height))
+        # Cells currently painted with a path preview that is not stored in the model.
+        self.preview_cells = []
+        # Maze hash the surface shows when it shows the maze without any marks, else None.
+        self.rendered_hash = None
         self.update_maze_surface()
 
+    def cell_color(self, i: int, j: int, value):
+        """Returns the color of a cell, shading empty cells by their terrain cost."""
+        if value == EMPTY:
+            cost = self.maze_model.maze.cost(i, j)
+            if cost > MIN_TERRAIN_COST:
+                return TERRAIN_COLORS[cost]
+        return self.color_scheme.get(value, (255, 255, 255))
+
     def update_maze_surface(self):
-        self.maze_surface.fill((0, 0, 0))  # Clear the maze surface
-        for i in range(self.maze_model.rows):
-            for j in range(self.maze_model.cols):
-                cell = self.maze_model.maze[i][j]
-                if cell == 1:
-                    continue
-                rect = pygame.Rect(j * self.cell_size, i * self.cell_size,
-                                    self.cell_size, self.cell_size)
-                color = self.color_scheme.get(cell, (255, 255, 255))
-                pygame.draw.rect(self.maze_surface, color, rect)
+        """
+        Redraws the whole maze surface in one vectorised pass: the cell codes
+        and terrain costs are turned into colors with lookup tables, scaled up
+        to the cell size and blitted at once.
+        """
+        self.preview_cells = []
+        maze = self.maze_model.maze
+        cells = np.frombuffer(maze.cells, dtype=np.uint8).reshape(maze.rows, maze.cols)
+        costs = np.frombuffer(maze.costs, dtype=np.uint8).reshape(maze.rows, maze.cols)
+
+        colors = self.palette[cells]
+        terrain = (cells == EMPTY) & (costs > MIN_TERRAIN_COST)
+        colors[terrain] = self.terrain_palette[costs[terrain]]
+
+        pixels = colors.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        # surfarray indexes pixels as (x, y)
+        pygame.surfarray.blit_array(self.maze_surface, pixels.transpose(1, 0, 2))
+        # no step is displayed, so the maze holds no marks
+        self.rendered_hash = self.maze_model.maze_hash if self.maze_model.current_step == -1 else None
+
+    def refresh_maze_surface(self):
+        """
+        Redraws the whole maze surface, unless it already shows the maze
+        without marks and the maze hash has not changed since.
+        """
+        if self.maze_model.current_step == -1 and self.rendered_hash == self.maze_model.maze_hash:
+            return
+        self.update_maze_surface()
     
     def update_maze_surface_cell(self, i: int, j: int, value):
+        self.rendered_hash = None
         rect = pygame.Rect(j * self.cell_size, i * self.cell_size,
                             self.cell_size, self.cell_size)
-        color = self.color_scheme.get(value, (255, 255, 255))
+        color = self.cell_color(i, j, value)
         pygame.draw.rect(self.maze_surface, color, rect)
 
     def incremental_update_overlay(self, updates):
@@ -72,12 +127,26 @@ class MazeRenderer:
         Very fast: only draw the exact cells that just changed.
         `updates` is a list of (row, col, new_val) tuples.
         """
-        
+        self.rendered_hash = None
         for i, j, val in updates:
             rect = pygame.Rect(j * self.cell_size, i * self.cell_size,
                                self.cell_size, self.cell_size)
-            pygame.draw.rect(self.maze_surface, self.color_scheme[val], rect)
+            pygame.draw.rect(self.maze_surface, self.cell_color(i, j, val), rect)
             
+    def show_path_preview(self, path):
+        """
+        Paints a path on the surface without writing it into the maze, and
+        restores the cells of the previous preview. Pass an empty list to
+        remove the preview.
+        """
+        maze = self.maze_model.maze
+        for i, j in self.preview_cells:
+            self.update_maze_surface_cell(i, j, maze[i, j])
+
+        self.preview_cells = [(i, j) for i, j in path if maze[i, j] not in END_POINTS]
+        for i, j in self.preview_cells:
+            self.update_maze_surface_cell(i, j, PATH)
+
     def draw(self, surface: pygame.Surface):
         """Draws the maze on the given surface, including the background and overlay."""
         # Blit both the background and overlay surfaces using the computed offsets.
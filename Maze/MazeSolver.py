@@ -1,7 +1,18 @@
-from Algorithms.AStar import a_star_steps, set_heuristic_weight
-from Algorithms.BreadthFirstSearch import bfs_steps
-from Algorithms.DepthFirstSearch import dfs_steps
-from Algorithms.Dijkstra import dijkstra_steps
+from Algorithms import AStar, AnytimeAStar
+from Algorithms.AStar import iter_a_star_steps, iter_a_star_nearest_steps, set_heuristic_weight
+from Algorithms.AnytimeAStar import iter_ara_star_steps, set_initial_weight, set_time_budget
+from Algorithms.BreadthFirstSearch import iter_bfs_steps, iter_bfs_nearest_steps
+from Algorithms.DepthFirstSearch import iter_dfs_steps, iter_dfs_nearest_steps
+from Algorithms.Dijkstra import iter_dijkstra_steps, iter_dijkstra_nearest_steps
+from Algorithms.DistanceField import distance_table
+from Algorithms.JumpPointSearch import iter_jps_steps
+from Algorithms.WavefrontBFS import iter_wavefront_bfs_steps
+from Algorithms.Bidirectional import iter_bidirectional_bfs_steps, iter_bidirectional_a_star_steps
+from Algorithms.HierarchicalPathfinding import iter_hpa_star_steps
+from Algorithms.JunctionGraph import iter_junction_a_star_steps
+from Algorithms.Movement import current_movement, set_connectivity, set_corner_cutting
+from Algorithms.SearchCore import collect_steps
+from Algorithms.SearchStats import SearchStats
 
 class MazeSolver:
     """
@@ -14,21 +25,123 @@ class MazeSolver:
             algorithm (str, optional): The algorithm to use for solving the maze. Defaults to "BFS".
         """
         self.algorithm = algorithm
+        self.stats = SearchStats()
         self.algorithms = {
-            "BFS": bfs_steps,
-            "DFS": dfs_steps,
-            "Dijkstra": dijkstra_steps,
-            "A*": a_star_steps
+            "BFS": iter_bfs_steps,
+            "DFS": iter_dfs_steps,
+            "Dijkstra": iter_dijkstra_steps,
+            "A*": iter_a_star_steps,
+            "Jump Point Search": iter_jps_steps,
+            "Wavefront BFS": iter_wavefront_bfs_steps,
+            "Bidirectional BFS": iter_bidirectional_bfs_steps,
+            "Bidirectional A*": iter_bidirectional_a_star_steps,
+            "Anytime A*": iter_ara_star_steps,
+            "HPA*": iter_hpa_star_steps,
+            "Junction A*": iter_junction_a_star_steps
+        }
+        # algorithms that can search from several starts to the nearest of several ends
+        self.nearest_algorithms = {
+            "BFS": iter_bfs_nearest_steps,
+            "DFS": iter_dfs_nearest_steps,
+            "Dijkstra": iter_dijkstra_nearest_steps,
+            "A*": iter_a_star_nearest_steps
+        }
+        # algorithms that search a cached graph of the maze, and which one
+        self.graph_algorithms = {
+            "HPA*": "abstract_graph",
+            "Junction A*": "junction_graph"
         }
 
     def set_heuristic_weight(weight: float):
+        # Anytime A* starts from the same weight and lowers it from there
         set_heuristic_weight(weight)
+        set_initial_weight(weight)
 
-    def solve(self, maze, start, end):
+    def set_time_budget(seconds: float):
+        set_time_budget(seconds)
+
+    def set_movement(connectivity: int, cut_corners: bool = False):
+        # every algorithm reads the same movement, including the cached graphs of the model
+        set_connectivity(connectivity)
+        set_corner_cutting(cut_corners)
+
+    def current_settings() -> tuple:
+        # the arguments of BatchSolve.configure_worker that solve the same way in another process
+        return (AStar.Settings.heuristic_weight, current_movement().key(), AnytimeAStar.Settings.time_budget)
+
+    def settings_key(self) -> tuple:
+        """
+        Returns the solver settings that can change the result of a solve
+        with this algorithm, for keying cached results. The movement changes
+        the result of every algorithm.
+        """
+        movement_key = current_movement().key()
+        if self.algorithm == "Anytime A*":
+            return movement_key + (AnytimeAStar.Settings.initial_weight, AnytimeAStar.Settings.time_budget)
+        if self.algorithm in ("A*", "Bidirectional A*"):
+            return movement_key + (AStar.Settings.heuristic_weight,)
+        return movement_key
+
+    def iter_solve(self, maze, start, end, **search_graphs):
+        """
+        Returns a generator that yields the snapshot batches of the solve one
+        at a time and returns the found path. The search only runs as far as
+        the batches are pulled.
+
+        The counters of the solve are written to a fresh `self.stats` when the
+        generator finishes or is closed. `search_graphs` holds the cached
+        graphs of the maze by name: `abstract_graph` (AbstractGraph) for HPA*
+        and `junction_graph` (JunctionGraph) for Junction A*. Without them
+        those algorithms build their own.
+        """
         if self.algorithm not in self.algorithms:
             raise ValueError(f"Unknown algorithm: {self.algorithm}")
-        
-        if(self.algorithm == "A*"):
-            return self.algorithms[self.algorithm](maze, start, end, 1)
-        else:
-            return self.algorithms[self.algorithm](maze, start, end, 1)
+
+        self.stats = SearchStats()
+        if self.algorithm in self.graph_algorithms:
+            search_graph = search_graphs.get(self.graph_algorithms[self.algorithm])
+            return self.algorithms[self.algorithm](maze, start, end, 1, self.stats, search_graph)
+        return self.algorithms[self.algorithm](maze, start, end, 1, self.stats)
+
+    def iter_solve_nearest(self, maze, sources, goals):
+        """
+        Like iter_solve(), but searches from every start cell at once and
+        stops at the first end cell reached. For BFS, Dijkstra and A* that
+        is the shortest path between any start and any end, found in one
+        search instead of one per pair.
+
+        Args:
+            maze (MazeGrid): The maze grid.
+            sources (list[tuple[int, int]]): The start cells.
+            goals (list[tuple[int, int]]): The end cells.
+        """
+        if self.algorithm not in self.nearest_algorithms:
+            raise ValueError(f"{self.algorithm} does not support several starts or ends")
+
+        self.stats = SearchStats()
+        return self.nearest_algorithms[self.algorithm](maze, sources, goals, 1, self.stats)
+
+    def solve_nearest(self, maze, sources, goals):
+        return collect_steps(self.iter_solve_nearest(maze, sources, goals))
+
+    def distance_table(self, maze, sources, goals):
+        """
+        Returns the cost of the shortest path from every start to every end
+        as one row per start, None where an end cannot be reached. It takes
+        one distance sweep per start or per end, whichever there are fewer
+        of, whatever the algorithm.
+        """
+        return distance_table(maze, sources, goals, current_movement())
+
+    def solve(self, maze, start, end):
+        return collect_steps(self.iter_solve(maze, start, end))
+
+    def solve_with_stats(self, maze, start, end):
+        """
+        Like solve(), but also returns the SearchStats of the solve.
+
+        Returns:
+            tuple: (path, snapshots, stats)
+        """
+        final_path, snapshots = self.solve(maze, start, end)
+        return final_path, snapshots, self.stats
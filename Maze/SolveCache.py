@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+from array import array
+from collections import OrderedDict
+import numpy as np
+from Algorithms.SearchStats import SearchStats
+from .StepHistory import StepHistory
+
+# Memory the cached solves may take before the least recently used ones are dropped.
+DEFAULT_MAX_BYTES   = 256 * 1024 * 1024
+
+
+def solve_key(maze_hash: int, start, end, algorithm: str, settings: tuple) -> str:
+    """
+    Returns the cache key of a solve: the maze hash (see MazeHash), the start
+    and end cells, the algorithm and the solver settings that change its result.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((maze_hash, tuple(start), tuple(end), algorithm, settings)).encode())
+    return digest.hexdigest()
+
+
+class CachedSolve:
+    """
+    The finished result of one solve: its snapshot batches, its path and its
+    search counters.
+    """
+    def __init__(self, history: StepHistory, final_path: list, stats: SearchStats | None):
+        self.history = history
+        self.final_path = list(final_path)
+        self.stats = stats
+
+    def nbytes(self) -> int:
+        return self.history.nbytes() + len(self.final_path) * 8
+
+
+class SolveCache:
+    """
+    Finished solves by their solve_key(), so solving the same maze again with
+    the same settings replays the stored batches instead of searching.
+
+    Solves are kept in memory up to max_bytes of snapshot batches, dropping
+    the least recently used first. With a directory the cache also has a disk
+    tier: every stored solve is written there as one .npz file, and a solve
+    that is not in memory is looked up on disk, so results survive restarts.
+    The disk tier is not capped.
+
+    Solves finish on the SolveJob worker thread, so the cache takes a lock.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: str | None = None):
+        """
+        Args:
+            max_bytes (int, optional): Memory cap of the cached batches. Defaults to DEFAULT_MAX_BYTES.
+            directory (str | None, optional): Where the disk tier keeps its files.
+                Defaults to None, which keeps solves in memory only.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: str) -> CachedSolve | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+
+        if self.directory is None:
+            return None
+        entry = self._load(key)
+        if entry is not None:
+            with self.lock:
+                self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedSolve):
+        with self.lock:
+            self._remember(key, entry)
+        if self.directory is not None:
+            self._save(key, entry)
+
+    def clear(self):
+        """
+        Drops the solves kept in memory. Files of the disk tier are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def _remember(self, key, entry):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key).nbytes()
+        # a solve larger than the whole cache is only kept on disk
+        if entry.nbytes() > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.nbytes += entry.nbytes()
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _save(self, key, entry):
+        history = entry.history
+        stats = vars(entry.stats) if entry.stats is not None else None
+        temporary_path = self._path(key) + ".tmp"
+        with open(temporary_path, "wb") as file:
+            np.savez(
+                file,
+                num_columns=history.num_columns,
+                cells=np.frombuffer(history.cells, dtype=np.uint32),
+                codes=np.frombuffer(history.codes, dtype=np.uint8),
+                offsets=np.frombuffer(history.offsets, dtype=np.uint32),
+                path_batches=np.frombuffer(history.path_batches, dtype=np.uint32),
+                final_path=np.array(entry.final_path, dtype=np.int32).reshape(-1, 2),
+                stats=json.dumps(stats),
+            )
+        # replace in one step, so a reader never sees half a file
+        os.replace(temporary_path, self._path(key))
+
+    def _load(self, key):
+        try:
+            with np.load(self._path(key)) as data:
+                history = StepHistory(int(data["num_columns"]))
+                history.cells = array("I", data["cells"].astype(np.uint32).tobytes())
+                history.codes = array("B", data["codes"].tobytes())
+                history.offsets = array("I", data["offsets"].astype(np.uint32).tobytes())
+                history.path_batches = array("I", data["path_batches"].astype(np.uint32).tobytes())
+                final_path = [tuple(cell) for cell in data["final_path"].tolist()]
+                fields = json.loads(str(data["stats"]))
+        except (OSError, ValueError, KeyError):
+            # missing or unreadable files are cache misses
+            return None
+
+        stats = None
+        if fields is not None:
+            stats = SearchStats()
+            for name, value in fields.items():
+                setattr(stats, name, value)
+        return CachedSolve(history, final_path, stats)
@@ -0,0 +1,46 @@
+import threading
+
+
+class SolveJob:
+    """
+    Runs a solve on a worker thread and fills its StepStream in the background.
+
+    While the job runs, the stream no longer pulls batches itself: readers
+    only see the batches the worker has produced so far, so the pygame loop
+    never waits for the solver. The worker checks for cancellation between
+    batches, which bounds the wait in cancel() to a single batch.
+    """
+    def __init__(self, step_stream, on_progress=None):
+        """
+        Args:
+            step_stream (StepStream): The stream to fill. Its generator must not have been started.
+            on_progress (Callable[[int], None] | None, optional): Called from the worker
+                thread with the number of batches produced so far. Defaults to None.
+        """
+        self.step_stream = step_stream
+        self.on_progress = on_progress
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="SolveJob", daemon=True)
+
+    @property
+    def running(self):
+        return self.thread.is_alive()
+
+    def start(self):
+        self.step_stream.solve_job = self
+        self.thread.start()
+
+    def cancel(self):
+        """
+        Stops the worker after its current batch and waits for it to exit.
+        """
+        self.cancelled.set()
+        if self.thread is not threading.current_thread() and self.thread.ident is not None:
+            self.thread.join()
+
+    def _run(self):
+        step_stream = self.step_stream
+        while not step_stream.finished and not self.cancelled.is_set():
+            step_stream.pull()
+            if self.on_progress is not None:
+                self.on_progress(len(step_stream))
@@ -0,0 +1,141 @@
+from array import array
+from bisect import bisect_right
+import numpy as np
+from .MazeGrid import VISITED, PATH
+
+# Rank of cells that no batch has marked yet.
+NEVER               = np.iinfo(np.int32).max
+
+
+class StepHistory:
+    """
+    Compact storage for the snapshot batches of a solve.
+
+    Instead of a list of lists of (row, col, code) tuples, which costs over
+    100 bytes per entry, every entry is stored as a flat cell index in an
+    array('I') and a one-byte cell code in an array('B'). A third array
+    holds the offset at which each batch starts, so an entry costs 5 bytes
+    and a batch 4 more. A solve that visits 4 million cells fits in about
+    36 MB.
+
+    Indexing a batch decodes it back into a list of (row, col, code) tuples,
+    so the history can stand in for the plain list of batches.
+
+    For timeline scrubbing the history also keeps a rank grid: for every
+    cell the index of the first batch that marked it visited. The visited
+    cells at step k are then `rank <= k`, which is one vectorised comparison
+    no matter how far the timeline jumps. The path is kept apart as the list
+    of batches holding PATH entries, because anytime solvers emit several
+    paths and each one replaces the one before.
+    """
+    def __init__(self, num_columns: int = 1):
+        """
+        Args:
+            num_columns (int, optional): Number of columns in the solved grid,
+                used to turn (row, col) into flat indices. Defaults to 1.
+        """
+        self.num_columns = num_columns
+        self.cells = array("I")
+        self.codes = array("B")
+        self.offsets = array("I", [0])
+        self.path_batches = array("I")
+        self._visited_ranks = None
+        self._ranked_batches = 0
+
+    def append(self, batch):
+        num_columns = self.num_columns
+        codes = [code for _, _, code in batch]
+        self.cells.extend([x * num_columns + y for x, y, _ in batch])
+        self.codes.extend(codes)
+        if PATH in codes:
+            self.path_batches.append(len(self.offsets) - 1)
+        # the offset goes last, so a reader on another thread never sees a half-written batch
+        self.offsets.append(len(self.cells))
+
+    def clear(self):
+        del self.cells[:]
+        del self.codes[:]
+        del self.offsets[1:]
+        del self.path_batches[:]
+        self._visited_ranks = None
+        self._ranked_batches = 0
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> list[tuple[int, int, int]]:
+        batch_count = len(self.offsets) - 1
+        if index < 0:
+            index += batch_count
+        if not 0 <= index < batch_count:
+            raise IndexError("step index out of range")
+
+        start, end = self.offsets[index], self.offsets[index + 1]
+        num_columns = self.num_columns
+        return [
+            (cell // num_columns, cell % num_columns, code)
+            for cell, code in zip(self.cells[start:end], self.codes[start:end])
+        ]
+
+    def visited_ranks(self, size: int) -> np.ndarray:
+        """
+        Returns the visited rank grid, updated with the batches appended
+        since the last call.
+
+        Args:
+            size (int): Number of cells in the solved grid.
+
+        Returns:
+            np.ndarray: Flat int32 array holding, for every cell, the index of the
+            first batch that marked it VISITED, or NEVER.
+        """
+        if self._visited_ranks is None:
+            self._visited_ranks = np.full(size, NEVER, dtype=np.int32)
+
+        first_batch = self._ranked_batches
+        batch_count = len(self.offsets) - 1
+        if first_batch < batch_count:
+            # slicing copies, so the arrays can keep growing on the solver thread
+            offsets = np.array(self.offsets[first_batch:batch_count + 1], dtype=np.int64)
+            start, end = offsets[0], offsets[-1]
+            cells = np.array(self.cells[start:end], dtype=np.int64)
+            codes = np.array(self.codes[start:end], dtype=np.uint8)
+            batch_ranks = np.repeat(
+                np.arange(first_batch, batch_count, dtype=np.int32), np.diff(offsets)
+            )
+            # a path that gets replaced marks its cells visited again; keep the first mark,
+            # so write in reverse and only to unranked cells (the last write per cell wins)
+            marked = codes == VISITED
+            cells, batch_ranks = cells[marked][::-1], batch_ranks[marked][::-1]
+            unranked = self._visited_ranks[cells] == NEVER
+            self._visited_ranks[cells[unranked]] = batch_ranks[unranked]
+            self._ranked_batches = batch_count
+
+        return self._visited_ranks
+
+    def path_cells(self, step_idx: int) -> np.ndarray:
+        """
+        Returns the flat indices of the path shown at the given step: the
+        PATH entries of the last path batch at or before it.
+
+        Returns:
+            np.ndarray: The path cells, empty if no path was found by that step.
+        """
+        batch_index = bisect_right(self.path_batches, step_idx) - 1
+        if batch_index < 0:
+            return np.empty(0, dtype=np.int64)
+
+        batch = self.path_batches[batch_index]
+        start, end = self.offsets[batch], self.offsets[batch + 1]
+        cells = np.array(self.cells[start:end], dtype=np.int64)
+        codes = np.array(self.codes[start:end], dtype=np.uint8)
+        return cells[codes == PATH]
+
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes held by the three arrays.
+        """
+        return sum(
+            len(values) * values.itemsize
+            for values in (self.cells, self.codes, self.offsets)
+        )
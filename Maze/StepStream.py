@@ -0,0 +1,111 @@
+from .StepHistory import StepHistory
+
+
+class StepStream:
+    """
+    The snapshots of a solve, pulled lazily from the solver's step generator.
+
+    Batches are only computed when playback or the timeline asks for them and
+    are cached once pulled, so playback can start as soon as the first batch
+    exists and an abandoned run never computes the steps nobody looked at.
+
+    Indexing works like a list of the batches pulled so far; indexing past
+    them pulls more, and negative indices pull the whole solve. `len()` is the
+    number of batches pulled so far, and `finished` tells whether the solver
+    has produced all of them.
+
+    A SolveJob can take over the pulling and fill the stream from a worker
+    thread; while it runs, fetch() only reports what is already there.
+    """
+    def __init__(self, step_generator=None, num_columns=1, on_finished=None):
+        """
+        Args:
+            step_generator (Generator | None, optional): Yields snapshot batches and
+                returns the found path. Defaults to None, which gives an empty stream.
+            num_columns (int, optional): Number of columns in the solved grid. Defaults to 1.
+            on_finished (Callable[[StepStream], None] | None, optional): Called with the
+                stream once the solver has produced every batch, from the thread that
+                pulled the last one. Defaults to None.
+        """
+        self.batches = StepHistory(num_columns)
+        self.step_generator = step_generator
+        self.finished = step_generator is None
+        self.final_path = []
+        self.solve_job = None
+        self.on_finished = on_finished
+
+    @classmethod
+    def replay(cls, batches, final_path):
+        """
+        Returns a finished stream over the batches of an earlier solve, such
+        as one from the SolveCache. The batches are shared, not copied.
+
+        Args:
+            batches (StepHistory): The snapshot batches of the solve.
+            final_path (list): The path the solve found.
+        """
+        step_stream = cls(num_columns=batches.num_columns)
+        step_stream.batches = batches
+        step_stream.final_path = list(final_path)
+        return step_stream
+
+    def pull(self):
+        """
+        Pulls the next batch from the solver, or records the found path when
+        the solver is done.
+        """
+        try:
+            self.batches.append(next(self.step_generator))
+        except StopIteration as stop:
+            self.final_path = stop.value or []
+            self.finished = True
+            self.step_generator = None
+            if self.on_finished is not None:
+                self.on_finished(self)
+
+    def fetch(self, count):
+        """
+        Pulls batches until `count` of them are cached or the solver is done.
+
+        Returns:
+            int: The number of cached batches.
+        """
+        batches = self.batches
+        if self.solve_job is not None and self.solve_job.running:
+            return len(batches)
+        while len(batches) < count and not self.finished:
+            self.pull()
+        return len(batches)
+
+    def fetch_all(self):
+        return self.fetch(float("inf"))
+
+    def clear(self):
+        """
+        Drops the cached batches and abandons the rest of the solve,
+        cancelling the background job if one is filling the stream.
+        """
+        if self.solve_job is not None:
+            self.solve_job.cancel()
+            self.solve_job = None
+        # replaced rather than emptied, since a cached solve may share the batches
+        self.batches = StepHistory(self.batches.num_columns)
+        if self.step_generator is not None:
+            self.step_generator.close()
+        self.step_generator = None
+        self.finished = True
+        self.final_path = []
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __bool__(self):
+        # a solve that has not produced its first batch yet still counts
+        return bool(self.batches) or not self.finished
+
+    def __getitem__(self, index):
+        if index < 0:
+            self.fetch_all()
+        else:
+            self.fetch(index + 1)
+        return self.batches[index]
@@ -9,10 +9,11 @@ from .Core.StyleUtilities import apply_style_to_components
 
 
 class UserInterface:
-    def __init__(self, app, panel_x, panel_width, screen_height):
+    def __init__(self, app, panel_x, panel_width, screen_height, stats_panel_width=200):
         self.app = app
         self.control_panel_x = panel_x
         self.control_panel_width = panel_width
+        self.stats_panel_width = stats_panel_width
         self.screen_height = screen_height
         self._create_components()
         self._update_component_styles()
@@ -22,7 +23,8 @@ class UserInterface:
         self.draw_end_button.background_color = (244, 67, 54)
         self.draw_empty_button.background_color = (200, 220, 240)  # very light blue
         self.draw_wall_button.background_color = (60, 60, 66)
-        components = [self.draw_start_button, self.draw_end_button,  self.draw_empty_button, self.draw_wall_button]
+        self.draw_terrain_button.background_color = (189, 158, 110)
+        components = [self.draw_start_button, self.draw_end_button,  self.draw_empty_button, self.draw_wall_button, self.draw_terrain_button]
         hover_style = StyleSheet(
             filter = [brightness(0.75), saturation(2), hue_rotate(-10)]
         )
@@ -32,13 +34,14 @@ class UserInterface:
     def _create_components(self):
         self.root = UIRoot()
         self.control_panel = Panel((self.control_panel_x, 0), (self.control_panel_width, self.screen_height))
-        self.dropdown = Dropdown((20, 20), (200, 30), ["BFS", "DFS", "Dijkstra", "A*"], 0, self.app.on_algorithm_changed)
+        self.dropdown = Dropdown((20, 20), (200, 30), ["BFS", "DFS", "Dijkstra", "A*", "Jump Point Search", "Wavefront BFS", "Bidirectional BFS", "Bidirectional A*", "Anytime A*", "HPA*", "Junction A*"], 0, self.app.on_algorithm_changed)
 
         self.play_button = Button((20, 180), (100, 30), "Play", self.app.play)
         self.pause_button = Button((130, 180), (100, 30), "Pause", self.app.pause)
         self.stop_button = Button((20, 220), (100, 30), "Stop", self.app.stop)
         self.next_button = Button((130, 220), (100, 30), "Next", self.app.next_step)
         self.prev_button = Button((20, 260), (100, 30), "Prev", self.app.prev_step)
+        self.movement_dropdown = Dropdown((130, 260), (100, 30), ["4-way", "8-way", "8-way cut"], 0, self.app.movement_changed)
         self.generate_empty_button = Button((20, 520), (100, 30), "Empty", self.app.generate_empty_maze)
         self.generate_maze_button = Button((130, 520), (100, 30), "Random", self.app.generate_random_maze)
         self.timeline_slider = Slider((20, 335), (200, 15), (10, 20), 0, 0, 0, self.app.on_timeline_changed)
@@ -50,13 +53,22 @@ class UserInterface:
         self.heuristic_weight_slider.enabled = False
         self.heuristic_weight_header.enabled = False
 
+        # shares the heuristic weight row, only shown for the anytime algorithms
+        self.time_budget_slider = Slider((140, 145), (90, 15), (10, 20), self.app.time_budget_min, self.app.time_budget_max, self.app.time_budget, self.app.time_budget_changed)
+        self.time_budget_header = Header((140, 118), f"Time: {self.time_budget_slider.value:.1f}s")
+        self.time_budget_slider.enabled = False
+        self.time_budget_header.enabled = False
+
         self.timeline_header = Header((20, 310), "Timeline")
         self.steps_header = Header((20, 370), "Steps")
+        self.race_button = Button((130, 370), (100, 30), "Race", self.app.start_race)
 
         self.step_counter_header = Header((30, 400), f"Total: {self.app.step_counter}")
         self.step_counter_header.text_color = (0,0,255)
         self.final_step_count_header = Header((30, 430), f"Path: {self.app.final_step_count}")
         self.final_step_count_header.text_color = (255, 0, 255)
+        self.solve_status_header = Header((30, 460), "")
+        self.solve_status_header.text_color = (96, 96, 96)
         self.drawing_tools_header = Header((20, 560), "Drawing tools")
         self.drawing_tools_panel = Panel((20, 590), (210, 40))
 
@@ -64,29 +76,85 @@ class UserInterface:
         self.draw_end_button = Button((40, 5), (30, 30), "", self.app.set_draw_state, value="place_end")
         self.draw_wall_button = Button((75, 5), (30, 30), "", self.app.set_draw_state, value="draw_walls")
         self.draw_empty_button = Button((110, 5), (30, 30), "", self.app.set_draw_state, value="remove_walls")
+        self.draw_terrain_button = Button((145, 5), (30, 30), "", self.app.set_draw_state, value="paint_terrain")
 
         # The order you add the children is the draw order of them.
-        self.buttons = [self.play_button, self.pause_button, self.stop_button, self.next_button, self.prev_button, self.generate_empty_button, self.generate_maze_button, self.dropdown]
-        self.sliders = [self.speed_slider, self.timeline_slider, self.heuristic_weight_slider]
-        self.headers = [self.speed_header, self.timeline_header, self.drawing_tools_header, self.heuristic_weight_header]
+        self.buttons = [self.play_button, self.pause_button, self.stop_button, self.next_button, self.prev_button, self.generate_empty_button, self.generate_maze_button, self.race_button, self.movement_dropdown, self.dropdown]
+        self.sliders = [self.speed_slider, self.timeline_slider, self.heuristic_weight_slider, self.time_budget_slider]
+        self.headers = [self.speed_header, self.timeline_header, self.drawing_tools_header, self.heuristic_weight_header, self.time_budget_header]
         self.panels = [self.drawing_tools_panel]
-        self.draw_buttons = [self.draw_start_button, self.draw_end_button, self.draw_wall_button, self.draw_empty_button]
+        self.draw_buttons = [self.draw_start_button, self.draw_end_button, self.draw_wall_button, self.draw_empty_button, self.draw_terrain_button]
         
         self.drawing_tools_panel.add_children(self.draw_buttons)
         self.control_panel.add_children(self.sliders)
         self.control_panel.add_children(self.headers)
         self.control_panel.add_children(self.buttons)
         self.control_panel.add_children(self.panels)
-        self.control_panel.add_children([self.steps_header, self.step_counter_header, self.final_step_count_header])
+        self.control_panel.add_children([self.steps_header, self.step_counter_header, self.final_step_count_header, self.solve_status_header])
         self.root.add_component(self.control_panel)
 
+        # every counter of the last solve, right of the control panel
+        self.stats_panel = Panel((self.control_panel_x + self.control_panel_width, 0), (self.stats_panel_width, self.screen_height))
+        self.stats_title_header = Header((10, 20), "Search stats")
+        self.stats_header = Header((10, 50), "")
+        self.stats_panel.add_children([self.stats_title_header, self.stats_header])
+        self.root.add_component(self.stats_panel)
+
     def draw(self, surface):
         self.speed_header.text = f"Speed: {self.speed_slider.value:.1f}x"
         self.step_counter_header.text = f"Total: {self.app.step_counter}"
         self.final_step_count_header.text = f"Path: {self.app.final_step_count}"
-        self.heuristic_weight_header.text = f"Heuristic Weight: {self.heuristic_weight_slider.value:.1f}"
+        stats = self.app.maze_model.get_search_stats()
+        if self.app.race is not None:
+            self.solve_status_header.text = self.app.race.status()
+        elif self.app.maze_model.is_solving():
+            self.solve_status_header.text = f"Solving... {self.app.solve_progress} steps"
+        elif stats is not None:
+            self.solve_status_header.text = "Replayed from cache" if self.app.maze_model.solve_cached else "Solved"
+        elif not self.app.maze_model.is_end_reachable():
+            self.solve_status_header.text = "No path: the end is walled off"
+        else:
+            self.solve_status_header.text = ""
+        self.stats_header.text = self.format_stats(stats) if stats is not None and self.app.race is None else ""
+        if self.time_budget_slider.enabled:
+            self.heuristic_weight_header.text = f"Weight: {self.heuristic_weight_slider.value:.1f}"
+            self.time_budget_header.text = f"Time: {self.time_budget_slider.value:.1f}s"
+        else:
+            self.heuristic_weight_header.text = f"Heuristic Weight: {self.heuristic_weight_slider.value:.1f}"
+        if self.app.drawing_state == "paint_terrain":
+            self.drawing_tools_header.text = f"Drawing tools (terrain cost {self.app.maze_drawing.terrain_cost})"
+        else:
+            self.drawing_tools_header.text = "Drawing tools"
         self.root.draw(surface)
 
+    @staticmethod
+    def format_stats(stats):
+        """
+        Returns every counter of a SearchStats as the lines of the stats panel.
+        """
+        duplicate_share = stats.duplicate_pops / stats.pops * 100 if stats.pops else 0.0
+        lines = [
+            f"Expanded: {stats.expanded}",
+            f"Pushes: {stats.pushes}",
+            f"Pops: {stats.pops}",
+            f"Duplicate pops: {stats.duplicate_pops}",
+            f"  ({duplicate_share:.1f}% of pops)",
+            f"Peak frontier: {stats.peak_frontier}",
+            f"Peak visited: {stats.peak_visited}",
+            "",
+        ]
+        lines.extend(f"{phase.capitalize()}: {seconds * 1000:.1f} ms" for phase, seconds in stats.phase_times.items())
+        lines.append(f"Total: {stats.wall_time * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def show_time_budget(self, visible):
+        """
+        Shows or hides the time budget slider next to a narrowed heuristic weight slider.
+        """
+        self.time_budget_slider.enabled = visible
+        self.time_budget_header.enabled = visible
+        self.heuristic_weight_slider.set_size(90 if visible else 200, 15)
+
     def set_timeline(self, min, max, value):
         self.timeline_slider.min = min
         self.timeline_slider.max = max
@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+from Maze.BatchSolve import MAZE_KINDS, RESULT_WRITERS, batch_tasks, run_batch
+from Maze.MazeSolver import MazeSolver
+
+
+def parse_seeds(text):
+    """
+    Parses seeds given as a range ("0-99"), a list ("1,5,7") or both ("0-9,42").
+    """
+    seeds = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        if last:
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(first))
+    return seeds
+
+
+def parse_arguments():
+    algorithm_names = list(MazeSolver().algorithms)
+    parser = argparse.ArgumentParser(
+        description="Generate mazes and solve them without opening a window. "
+                    "Results are streamed as one row per solve."
+    )
+    parser.add_argument("--seeds", type=parse_seeds, default=[0],
+                        help='random maze seeds, e.g. "0-99" or "1,5,7" (default: 0)')
+    parser.add_argument("--sizes", type=int, nargs="+", default=[101],
+                        help="maze sizes in cells per side; even sizes are rounded up (default: 101)")
+    parser.add_argument("--mazes", nargs="+", choices=MAZE_KINDS, default=["random"],
+                        help="kinds of generated mazes (default: random)")
+    parser.add_argument("--algorithms", nargs="+", choices=algorithm_names, default=algorithm_names,
+                        metavar="ALGORITHM",
+                        help=f"algorithms to run (default: all of {', '.join(algorithm_names)})")
+    parser.add_argument("--heuristic-weight", type=float, default=None,
+                        help="heuristic weight of the A* variants (default: the solver default)")
+    parser.add_argument("--connectivity", type=int, choices=(4, 8), default=4,
+                        help="4 or 8 connected movement for every algorithm (default: 4)")
+    parser.add_argument("--cut-corners", action="store_true",
+                        help="with 8-connectivity, let diagonal steps pass a single wall")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the traced repeat of every solve that measures peak memory")
+    parser.add_argument("--format", choices=RESULT_WRITERS, default=None,
+                        help="output format (default: from the output file extension, else csv)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, or - for standard output (default: -)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    output_format = arguments.format
+    if output_format is None:
+        output_format = "jsonl" if arguments.output.endswith((".jsonl", ".json")) else "csv"
+
+    stream = sys.stdout if arguments.output == "-" else open(arguments.output, "w", newline="", encoding="utf-8")
+    try:
+        tasks = batch_tasks(
+            arguments.algorithms, arguments.mazes, arguments.sizes, arguments.seeds,
+            measure_memory=not arguments.no_memory
+        )
+        writer = RESULT_WRITERS[output_format](stream)
+        solved = run_batch(
+            tasks, writer, arguments.workers, arguments.heuristic_weight,
+            (arguments.connectivity, arguments.cut_corners)
+        )
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"Solved {solved} mazes", file=sys.stderr)
@@ -0,0 +1,144 @@
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from Algorithms.AStar import a_star_steps, set_heuristic_weight
+from Algorithms.BreadthFirstSearch import bfs_steps
+from Algorithms.DepthFirstSearch import dfs_steps
+from Algorithms.Dijkstra import dijkstra_steps
+from Maze.MazeGrid import START, END, VISITED
+from .corpus import CORPUS_KINDS, CORPUS_SIZES, corpus_maze
+
+SOLVERS             = {
+    "bfs": bfs_steps,
+    "dfs": dfs_steps,
+    "dijkstra": dijkstra_steps,
+    "a_star": a_star_steps,
+}
+DEFAULT_SIZES       = (101, 501, 1001)
+
+
+def percentile(sorted_values, fraction):
+    """
+    Linear interpolation between the closest ranks of an already sorted list.
+    """
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def benchmark(solver, maze, warmup, repeat, measure_allocations=True):
+    """
+    Times one solver on one maze.
+
+    The warmup runs are discarded. Each timed run starts from a collected
+    heap. Allocations are measured in one extra run under tracemalloc, which
+    would distort the timings if it was on during them.
+
+    Returns:
+        dict: The timings and counts of the runs.
+    """
+    start, end = maze.find(START), maze.find(END)
+
+    for _ in range(warmup):
+        solver(maze, start, end)
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        final_path, snapshots = solver(maze, start, end)
+        timings.append(time.perf_counter() - started)
+
+    expanded = sum(code == VISITED for batch in snapshots for _, _, code in batch)
+    del snapshots
+
+    peak_allocated = None
+    if measure_allocations:
+        gc.collect()
+        tracemalloc.start()
+        solver(maze, start, end)
+        peak_allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    timings.sort()
+    median = statistics.median(timings)
+    return {
+        "path_length": len(final_path),
+        "expanded": expanded,
+        "median_s": median,
+        "p10_s": percentile(timings, 0.10),
+        "p90_s": percentile(timings, 0.90),
+        "min_s": timings[0],
+        "max_s": timings[-1],
+        "expansions_per_s": expanded / median if median else None,
+        "peak_allocated_bytes": peak_allocated,
+    }
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the solvers on a fixed, seeded maze corpus."
+    )
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS),
+                        help="solvers to benchmark (default: all)")
+    parser.add_argument("--kinds", nargs="+", choices=CORPUS_KINDS, default=list(CORPUS_KINDS),
+                        help="corpus maze kinds (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help=f"maze sizes (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--full", action="store_true",
+                        help=f"use every corpus size: {' '.join(map(str, CORPUS_SIZES))}")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="untimed runs before timing (default: 1)")
+    parser.add_argument("--repeat", type=positive_int, default=5,
+                        help="timed runs per solver and maze (default: 5)")
+    parser.add_argument("--heuristic-weight", type=float, default=1.0,
+                        help="heuristic weight of A* (default: 1.0)")
+    parser.add_argument("--no-allocations", action="store_true",
+                        help="skip the traced run that measures allocations")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the results to a JSON file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    set_heuristic_weight(arguments.heuristic_weight)
+    sizes = CORPUS_SIZES if arguments.full else arguments.sizes
+
+    header = (f"{'solver':<10}{'maze':<11}{'size':>6}{'median ms':>12}{'p10 ms':>10}{'p90 ms':>10}"
+              f"{'expanded':>10}{'exp/s':>12}{'peak MB':>9}")
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    for kind in arguments.kinds:
+        for size in sizes:
+            maze = corpus_maze(kind, size)
+            for name in arguments.solvers:
+                result = benchmark(
+                    SOLVERS[name], maze, arguments.warmup, arguments.repeat,
+                    measure_allocations=not arguments.no_allocations
+                )
+                result.update(solver=name, maze=kind, size=maze.rows)
+                results.append(result)
+
+                peak = result["peak_allocated_bytes"]
+                print(f"{name:<10}{kind:<11}{maze.rows:>6}"
+                      f"{result['median_s'] * 1000:>12.2f}{result['p10_s'] * 1000:>10.2f}{result['p90_s'] * 1000:>10.2f}"
+                      f"{result['expanded']:>10}{result['expansions_per_s'] or 0:>12.0f}"
+                      f"{'-' if peak is None else f'{peak / 1e6:.1f}':>9}", flush=True)
+
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,64 @@
+import random
+from Maze.BatchSolve import generate_maze
+from Maze.MazeGrid import EMPTY, WALL, START, END
+
+# Maze sizes of the full corpus, in cells per side.
+CORPUS_SIZES        = (101, 501, 1001, 2001, 4001)
+CORPUS_KINDS        = ("random", "empty", "obstacles")
+CORPUS_SEED         = 2024
+
+_corpus_cache = {}
+
+
+def generate_obstacle_maze(size, seed):
+    """
+    An empty maze with seeded wall strokes drawn across it, like the ones a
+    user draws with the wall tool: straight horizontal and vertical lines of
+    random length. A random staircase corridor from start to end is erased
+    afterwards, so the end is always reachable.
+    """
+    maze = generate_maze("empty", size, seed)
+    cells = maze.cells
+    num_columns = maze.cols
+    rng = random.Random(seed)
+
+    for _ in range(size // 2):
+        row = rng.randrange(1, maze.rows - 1)
+        col = rng.randrange(1, num_columns - 1)
+        length = rng.randrange(size // 10, size // 3 + 1)
+        if rng.random() < 0.5:
+            last_col = min(col + length, num_columns - 1)
+            stroke = range(row * num_columns + col, row * num_columns + last_col)
+        else:
+            last_row = min(row + length, maze.rows - 1)
+            stroke = range(row * num_columns + col, last_row * num_columns + col, num_columns)
+        for index in stroke:
+            if cells[index] not in (START, END):
+                cells[index] = WALL
+
+    # carve a corridor that only ever moves down or right
+    (row, col), (end_row, end_col) = maze.find(START), maze.find(END)
+    while (row, col) != (end_row, end_col):
+        if col == end_col or (row != end_row and rng.random() < 0.5):
+            row += 1
+        else:
+            col += 1
+        if cells[row * num_columns + col] == WALL:
+            cells[row * num_columns + col] = EMPTY
+
+    return maze
+
+
+def corpus_maze(kind, size, seed=CORPUS_SEED):
+    """
+    Returns the corpus maze of the given kind and size. The same arguments
+    always give the same maze, and every maze is generated once per process.
+    The returned grid is shared, so callers must not modify it.
+    """
+    key = (kind, size, seed)
+    if key not in _corpus_cache:
+        if kind == "obstacles":
+            _corpus_cache[key] = generate_obstacle_maze(size, seed)
+        else:
+            _corpus_cache[key] = generate_maze(kind, size, seed)
+    return _corpus_cache[key]
@@ -0,0 +1,22 @@
+import unittest
+from Algorithms.DistanceField import goal_distance_field, path_to_goal
+from Maze.MazeGrid import MazeGrid, WALL
+
+
+class PathToGoalTest(unittest.TestCase):
+    def test_follows_field_to_goal(self):
+        maze = MazeGrid(3, 5)
+        distance = goal_distance_field(maze, (0, 4))
+        path = path_to_goal(distance, maze, (0, 0))
+        self.assertEqual(path, [(0, col) for col in range(5)])
+
+    def test_stale_field_gives_no_path(self):
+        maze = MazeGrid(1, 5)
+        distance = goal_distance_field(maze, (0, 4))
+        # walled in after the field was computed, so no neighbour is a step downhill
+        maze[0, 1] = WALL
+        self.assertEqual(path_to_goal(distance, maze, (0, 0)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from Algorithms.Dijkstra import dijkstra_steps
+from Algorithms.HierarchicalPathfinding import AbstractGraph, hpa_star_steps
+from Maze.MazeGrid import MazeGrid, WALL
+
+
+def single_column_maze():
+    """
+    A maze one cluster wide and three clusters tall. A wall closes every
+    border between clusters except one gap, away from both corners.
+    """
+    maze = MazeGrid(40, 9)
+    for col in range(maze.cols):
+        if col != 6:
+            maze[15, col] = WALL
+        if col != 2:
+            maze[31, col] = WALL
+    return maze
+
+
+class AbstractGraphTest(unittest.TestCase):
+    def test_single_column_borders_are_horizontal(self):
+        maze = single_column_maze()
+        graph = AbstractGraph(maze)
+        self.assertEqual(graph.cluster_cols, 1)
+        self.assertEqual(graph._transitions(0, 1), [(15 * 9 + 6, 16 * 9 + 6)])
+        self.assertEqual(graph._transitions(1, 2), [(31 * 9 + 2, 32 * 9 + 2)])
+
+    def test_single_column_path_is_found(self):
+        maze = single_column_maze()
+        start, end = (0, 0), (39, 8)
+        path, _ = hpa_star_steps(maze, start, end)
+        shortest, _ = dijkstra_steps(maze, start, end)
+        self.assertTrue(shortest)
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        self.assertGreaterEqual(len(path), len(shortest))
+
+
+if __name__ == "__main__":
+    unittest.main()
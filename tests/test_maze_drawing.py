@@ -0,0 +1,56 @@
+import unittest
+from Maze.MazeDrawing import MazeDrawing
+from Maze.MazeGenerator import MazeGenerator
+from Maze.MazeGrid import MazeGrid, EMPTY, START, END
+from Maze.MazeModel import MazeModel
+
+
+class StubRenderer:
+    def __init__(self, maze_model):
+        self.maze_model = maze_model
+
+    def update_maze_surface(self):
+        pass
+
+
+def open_maze():
+    """
+    An open 5x5 maze with the start and the end on the top row.
+    """
+    maze = MazeGrid(5, 5)
+    maze[0, 0] = START
+    maze[0, 2] = END
+    model = MazeModel(MazeGenerator(), maze=maze)
+    return model, MazeDrawing(StubRenderer(model), cursor=None)
+
+
+class PlaceMarkerTest(unittest.TestCase):
+    def test_dragging_start_across_end_keeps_end(self):
+        model, drawing = open_maze()
+        results = [drawing.place_start(0, col) for col in (1, 2, 3)]
+        self.assertEqual(results, [START, None, START])
+        self.assertEqual(model.maze[0, 2], END)
+        self.assertEqual(model.end, (0, 2))
+        self.assertEqual(model.start, (0, 3))
+        self.assertEqual(model.maze[0, 1], EMPTY)
+        self.assertEqual(model.maze[0, 3], START)
+
+    def test_dragging_end_across_start_keeps_start(self):
+        model, drawing = open_maze()
+        results = [drawing.place_end(0, col) for col in (1, 0)]
+        self.assertEqual(results, [END, None])
+        self.assertEqual(model.maze[0, 0], START)
+        self.assertEqual(model.start, (0, 0))
+        self.assertEqual(model.end, (0, 1))
+        self.assertEqual(model.maze[0, 2], EMPTY)
+
+    def test_start_does_not_replace_extra_start(self):
+        model, drawing = open_maze()
+        model.maze[4, 4] = START
+        self.assertIsNone(drawing.place_start(4, 4))
+        self.assertEqual(model.start, (0, 0))
+        self.assertEqual(model.maze[0, 0], START)
+
+
+if __name__ == "__main__":
+    unittest.main()
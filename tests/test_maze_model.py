@@ -0,0 +1,47 @@
+import unittest
+from Maze.MazeGenerator import MazeGenerator
+from Maze.MazeGrid import MazeGrid, START, END, WALL
+from Maze.MazeModel import MazeModel
+from Maze.MazeSolver import MazeSolver
+from Maze.SolveCache import SolveCache
+
+
+class StepBackTest(unittest.TestCase):
+    def step_back_over_path(self, algorithm):
+        model = MazeModel(MazeGenerator(), 61, 61, solve_cache=SolveCache())
+        model.run_algorithm(MazeSolver, algorithm)
+        step_count = model.steps.fetch(10 ** 9)
+        model.display_step(step_count - 1)
+        model.display_step(step_count - 2)
+        stepped_back = bytes(model.maze.cells)
+        model.jump_to_step(step_count - 2)
+        self.assertEqual(stepped_back, bytes(model.maze.cells))
+
+    def test_step_back_over_path_matches_jump(self):
+        for algorithm in MazeSolver().algorithms:
+            with self.subTest(algorithm=algorithm):
+                self.step_back_over_path(algorithm)
+
+
+class EndReachableTest(unittest.TestCase):
+    def test_answer_is_kept_until_an_edit(self):
+        maze = MazeGrid(1, 5)
+        maze[0, 0] = START
+        maze[0, 4] = END
+        model = MazeModel(MazeGenerator(), maze=maze, solve_cache=SolveCache())
+        lookups = []
+        get_connectivity = model.get_connectivity
+        model.get_connectivity = lambda: lookups.append(1) or get_connectivity()
+
+        self.assertTrue(model.is_end_reachable())
+        self.assertTrue(model.is_end_reachable())
+        self.assertEqual(len(lookups), 1)
+
+        model.edit_cell(0, 2, WALL)
+        model.invalidate_cells([(0, 2)])
+        self.assertFalse(model.is_end_reachable())
+        self.assertEqual(len(lookups), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()